@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+
+
+#  Benchmarks hot paths of 3DPrint Short-Cuts without starting Blender
+#  Copyright (C) 2017 S0AndS0
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2
+#  of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+
+# Example of recording a baseline, then failing later runs that are over 25% slower
+#   python benchmark_print_shortcuts.py --save-baseline baseline.json
+#   python benchmark_print_shortcuts.py --baseline baseline.json --threshold 0.25
+# Example of benchmarking only STL export & GCode analysis with larger meshes
+#   python benchmark_print_shortcuts.py --suites export gcode --sizes 10000 1000000 5000000
+# Example of slicing with a printer configuration & a locally built CuraEngine
+#   python benchmark_print_shortcuts.py --suites slice --slic3r-conf printer.ini --curaengine-exec ~/CuraEngine/build/CuraEngine
+# print_shortcuts.py is imported without bpy, see its Settings class, so Blender specific steps,
+#  such as evaluating modifiers of objects, are left out; exports time NumPy buffers to STL files.
+
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+
+import numpy as np
+
+this_script_directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, this_script_directory)
+
+from mock_print_server import Mock_print_server, load_print_shortcuts
+
+
+class Benchmark(object):
+    """
+    # This class times suites of print_shortcuts operations, keeping the best & median of 'repeat'
+    #  runs per result, and compares results against a baseline recorded by an earlier run.
+    # Example of running every suite & comparing to a baseline
+    BM = Benchmark(PS = load_print_shortcuts(path = 'print_shortcuts.py'), work_dir = '/tmp/benchmark')
+    BM.run(suites = ['export', 'slice', 'gcode', 'upload'])
+    regressions = BM.return_regressions(baseline = Benchmark.load_results(path = 'baseline.json'), threshold = 0.25)
+    """
+    # Default corpus for slicing, relative to the root of this repository
+    corpus_paths = [os.path.join('download', 'stl', 'Deltaprintr_Mods-Nut-Retainer_Top-Pully.stl')]
+
+    def __init__(self, PS = None, work_dir = None, repeat = 3, sizes = (10000, 100000, 1000000, 5000000),
+            corpus = None, slic3r_exec = 'slic3r', slic3r_conf = '', curaengine_exec = 'CuraEngine',
+            curaengine_conf = '', upload_sizes = (1, 16), upload_clients = 4):
+        if PS is None:
+            raise Exception('No print_shortcuts module supplied to Benchmark(PS = "?")')
+        self.PS = PS
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix = 'print_shortcuts_benchmark_')
+        self.repeat = max(1, repeat)
+        self.sizes = sizes
+        self.corpus = corpus
+        if self.corpus is None:
+            repository_root = os.path.abspath(os.path.join(this_script_directory, '..', '..', '..'))
+            self.corpus = [os.path.join(repository_root, path) for path in Benchmark.corpus_paths]
+        self.slic3r_exec = slic3r_exec
+        self.slic3r_conf = slic3r_conf
+        self.curaengine_exec = curaengine_exec
+        self.curaengine_conf = curaengine_conf
+        self.upload_sizes = upload_sizes
+        self.upload_clients = upload_clients
+        self.results = {}
+        self.skipped = []
+        # Exported STL & sliced GCode files, fed to later suites
+        self.stl_paths = []
+        self.gcode_paths = []
+        self.PS.Os.mkdir(path = self.work_dir)
+
+    # Returns result dictionary after timing 'function' 'repeat' times, 'amount' of 'unit' per run gives throughput
+    def measure(self, name = None, function = None, amount = None, unit = None, **attributes):
+        """
+        # Copy/paste-able block
+        result = self.measure(name = 'export_stl_10k', function = lambda: write(), amount = 10000, unit = 'triangles')
+        """
+        durations = []
+        for i in range(self.repeat):
+            start_time = time.perf_counter()
+            function()
+            durations.append(time.perf_counter() - start_time)
+        durations.sort()
+        result = dict(attributes)
+        result['seconds'] = durations[len(durations) // 2]
+        result['best_seconds'] = durations[0]
+        result['repeat'] = self.repeat
+        if amount and unit:
+            result['throughput'] = amount / max(result['best_seconds'], 1e-9)
+            result['unit'] = '{0}/s'.format(unit)
+        self.results[name] = result
+        print('# Benchmark {0}: {1}'.format(name, Benchmark.return_result_summary(result = result)))
+        return result
+
+    # Returns short human readable form of 'result'
+    @staticmethod
+    def return_result_summary(result = None):
+        summary = '{0:.4f}s median, {1:.4f}s best'.format(result['seconds'], result['best_seconds'])
+        if 'throughput' in result:
+            summary += ', {0:,.1f} {1}'.format(result['throughput'], result['unit'])
+        return summary
+
+    # Returns (N, 3, 3) array of a closed, wavy tube made of at least 'triangle_count' triangles
+    @staticmethod
+    def return_synthetic_triangles(triangle_count = 10000):
+        """
+        # Copy/paste-able block
+        triangles = Benchmark.return_synthetic_triangles(triangle_count = 100000)
+        # Shapes are the same from run to run, so results compare between runs
+        """
+        columns = max(3, int(np.sqrt(triangle_count / 2.0)))
+        rows = max(1, int(np.ceil(triangle_count / (2.0 * columns))))
+        angles = np.linspace(0, 2 * np.pi, columns, endpoint = False)
+        heights = np.linspace(0, 20.0, rows + 1)
+        radii = 10.0 + np.sin(heights[:, None] * 0.7 + angles[None, :] * 5.0)
+        grid = np.stack((radii * np.cos(angles)[None, :], radii * np.sin(angles)[None, :],
+            np.repeat(heights[:, None], columns, axis = 1)), axis = -1)
+        next_columns = np.roll(np.arange(columns), -1)
+        lower, upper = grid[:-1], grid[1:]
+        first = np.stack((lower, lower[:, next_columns], upper), axis = 2)
+        second = np.stack((upper, lower[:, next_columns], upper[:, next_columns]), axis = 2)
+        return np.concatenate((first.reshape(-1, 3, 3), second.reshape(-1, 3, 3)))
+
+    # Returns 'gcode_path' after writing GCode of 'layer_count' square perimeters & zig-zag infill
+    @staticmethod
+    def write_synthetic_gcode(gcode_path = None, layer_count = 200, moves_per_layer = 500):
+        lines = ['; generated by benchmark_print_shortcuts.py', '; filament_diameter = 1.75', 'G21', 'G90', 'M82', 'G92 E0']
+        extruded = 0.0
+        for layer in range(layer_count):
+            lines += ['G1 Z{0:.3f} F7800'.format(0.3 + layer * 0.2)]
+            for move in range(moves_per_layer):
+                x = 10.0 + (move % 50) * 1.5
+                y = 10.0 + (move // 50) * 1.5 + (layer % 2) * 0.5
+                extruded += 0.05
+                lines += ['G1 X{0:.3f} Y{1:.3f} E{2:.5f} F1800'.format(x, y, extruded)]
+            lines += ['G1 E{0:.5f} F2400'.format(extruded - 1.0), 'G92 E0']
+            extruded = 0.0
+        with open(gcode_path, 'w') as gcode_file:
+            gcode_file.write('\n'.join(lines) + '\n')
+        return gcode_path
+
+    # Returns Settings for print_shortcuts classes, without local caches so every run does the full work
+    def return_settings(self, **scene_values):
+        settings = dict(
+            gcode_cache_enabled = False,
+            gcode_analysis_enabled = False,
+            export_stl_directory = self.work_dir,
+            slic3r_gcode_directory = self.work_dir,
+            curaengine_gcode_directory = self.work_dir,
+            octoprint_temp_dir = self.work_dir,
+            log_level = 'QUITE')
+        settings.update(scene_values)
+        return self.PS.Settings(**settings)
+
+    # Times writing synthetic meshes to binary STL files & reading them back, as exports & repaired imports do
+    def bench_export(self):
+        MB = self.PS.Mesh_buffers
+        for triangle_count in self.sizes:
+            triangles = Benchmark.return_synthetic_triangles(triangle_count = triangle_count)
+            label = Benchmark.return_size_label(size = triangle_count)
+            stl_path = os.path.join(self.work_dir, 'synthetic_{0}.stl'.format(label))
+            matrix = np.diag([1.0, 1.0, 1.0, 1.0])
+            self.measure(name = 'export_transform_{0}'.format(label), amount = len(triangles), unit = 'triangles',
+                function = lambda: MB.return_transformed_triangles(triangles = triangles, matrix = matrix))
+            self.measure(name = 'export_stl_{0}'.format(label), amount = len(triangles), unit = 'triangles',
+                function = lambda: MB.write_stl(path = stl_path, triangles = triangles))
+            self.measure(name = 'import_stl_{0}'.format(label), amount = len(triangles), unit = 'triangles',
+                function = lambda: MB.read_stl(path = stl_path))
+            self.stl_paths += [stl_path]
+
+    # Times Slic3r & CuraEngine slicing the corpus plus the smallest synthetic mesh, skipping missing slicers
+    def bench_slice(self):
+        slice_inputs = [path for path in self.corpus if os.path.isfile(path)]
+        for path in self.corpus:
+            if not os.path.isfile(path):
+                self.skipped += ['slice corpus file {0} not found'.format(path)]
+        if self.stl_paths:
+            slice_inputs += [self.stl_paths[0]]
+        slicers = [
+            ('slic3r', self.slic3r_exec, lambda: self.PS.Slic3r(context = self.return_settings(
+                slic3r_exec_dir = '', slic3r_exec_name = self.slic3r_exec, slic3r_conf_path = self.slic3r_conf))),
+            ('curaengine', self.curaengine_exec, lambda: self.PS.CuraEngine(context = self.return_settings(
+                curaengine_exec_dir = '', curaengine_exec_name = self.curaengine_exec, curaengine_conf_path = self.curaengine_conf)))]
+        for slicer_name, exec_path, return_slicer in slicers:
+            if not shutil.which(exec_path):
+                self.skipped += ['{0} not found: {1}'.format(slicer_name, exec_path)]
+                continue
+            SLCR = return_slicer()
+            for stl_path in slice_inputs:
+                stl_name = os.path.splitext(os.path.basename(stl_path))[0]
+                gcode_path = os.path.join(self.work_dir, '{0}_{1}.gcode'.format(stl_name, slicer_name))
+                try:
+                    self.measure(name = 'slice_{0}_{1}'.format(slicer_name, stl_name), amount = os.path.getsize(stl_path) / 1048576.0,
+                        unit = 'STL MB', function = lambda: SLCR.slice_stl(stl_path = stl_path, gcode_path = gcode_path))
+                except Exception as error:
+                    self.skipped += ['{0} failed on {1}: {2}'.format(slicer_name, stl_path, error)]
+                    continue
+                self.gcode_paths += [gcode_path]
+
+    # Times Gcode_analyzer on synthetic GCode & any GCode sliced by bench_slice, with & without toolpaths
+    def bench_gcode(self):
+        synthetic_path = Benchmark.write_synthetic_gcode(gcode_path = os.path.join(self.work_dir, 'synthetic.gcode'))
+        for gcode_path in [synthetic_path] + self.gcode_paths:
+            gcode_name = os.path.splitext(os.path.basename(gcode_path))[0]
+            megabytes = os.path.getsize(gcode_path) / 1048576.0
+            GA = self.PS.Gcode_analyzer(filament_diameter = 1.75, acceleration = 1500)
+            self.measure(name = 'gcode_analysis_{0}'.format(gcode_name), amount = megabytes, unit = 'MB',
+                function = lambda: GA.analyze(gcode_path = gcode_path))
+            GA = self.PS.Gcode_analyzer(filament_diameter = 1.75, acceleration = 1500, toolpath_layers = (1, 0), toolpath_budget = 2000)
+            self.measure(name = 'gcode_toolpaths_{0}'.format(gcode_name), amount = megabytes, unit = 'MB',
+                function = lambda: GA.analyze(gcode_path = gcode_path))
+
+    # Times OctoPrint.upload_file against Mock_print_server, one file at a time & with concurrent uploads
+    def bench_upload(self):
+        server = Mock_print_server(port = 0, api_key = 'BENCHMARK')
+        server.start()
+        try:
+            settings = self.return_settings(octoprint_host = server.host_url, octoprint_port = str(server.port),
+                octoprint_x_api_key = 'BENCHMARK', octoprint_save_gcode_dir = 'benchmark', octoprint_skip_identical_uploads = False)
+            OP = self.PS.OctoPrint(context = settings)
+            for megabytes in self.upload_sizes:
+                gcode_path = os.path.join(self.work_dir, 'upload_{0}mb.gcode'.format(megabytes))
+                with open(gcode_path, 'wb') as gcode_file:
+                    gcode_file.write(os.urandom(megabytes * 1048576))
+                self.measure(name = 'upload_{0}mb'.format(megabytes), amount = megabytes, unit = 'MB',
+                    function = lambda: OP.upload_file(gcode_path = gcode_path))
+
+                def upload_concurrently():
+                    uploads = self.PS.Upload_dispatcher(max_uploads = self.upload_clients, max_uploads_per_host = self.upload_clients)
+                    for i in range(self.upload_clients):
+                        uploads.add(function = OP.upload_file, host = OP.host_url, name = gcode_path, gcode_path = gcode_path)
+                    errors = [upload['error'] for upload in uploads.wait() if upload['error'] is not None]
+                    if errors:
+                        raise Exception('Concurrent uploads failed: {0}'.format(errors))
+
+                self.measure(name = 'upload_{0}mb_x{1}'.format(megabytes, self.upload_clients), amount = megabytes * self.upload_clients,
+                    unit = 'MB', function = upload_concurrently)
+            OP.return_file_listing(target_search_dir = 'RECURSIVE')
+            self.measure(name = 'file_listing_cached', amount = 1, unit = 'listings',
+                function = lambda: OP.return_file_listing(target_search_dir = 'RECURSIVE'))
+        finally:
+            server.stop()
+            self.PS.Http_client.close_all()
+
+    # Returns 'results' after running each named suite in order
+    def run(self, suites = ('export', 'slice', 'gcode', 'upload')):
+        for suite in suites:
+            print('# Benchmark suite: {0}'.format(suite))
+            getattr(self, 'bench_' + suite)()
+        for skipped in self.skipped:
+            print('# Benchmark skipped: {0}'.format(skipped))
+        return self.results
+
+    # Returns dictionary of results plus details of where they were recorded, for saving as JSON
+    def return_record(self):
+        return {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': self.repeat,
+            'results': self.results,
+            'skipped': self.skipped}
+
+    # Returns list of (name, ratio) for results slower than 'baseline' by more than 'threshold', 0.25 is 25% slower
+    def return_regressions(self, baseline = None, threshold = 0.25):
+        regressions = []
+        for name, result in sorted(self.results.items()):
+            baseline_result = baseline.get('results', {}).get(name)
+            if baseline_result is None:
+                print('# Benchmark {0}: no baseline'.format(name))
+                continue
+            ratio = result['seconds'] / max(baseline_result['seconds'], 1e-9)
+            print('# Benchmark {0}: {1:.2f}x baseline of {2:.4f}s'.format(name, ratio, baseline_result['seconds']))
+            if ratio > 1.0 + threshold:
+                regressions += [(name, ratio)]
+        return regressions
+
+    # Returns path after writing 'record' as JSON
+    @staticmethod
+    def save_results(path = None, record = None):
+        with open(path, 'w') as results_file:
+            json.dump(record, results_file, indent = 2, sort_keys = True)
+        print('# Benchmark results written to: {0}'.format(path))
+        return path
+
+    # Returns parsed JSON of results saved by save_results
+    @staticmethod
+    def load_results(path = None):
+        with open(path, 'r') as results_file:
+            return json.load(results_file)
+
+    # Returns short label for a triangle count, such as 10k or 5M
+    @staticmethod
+    def return_size_label(size = None):
+        if size >= 1000000 and size % 1000000 == 0:
+            return '{0}M'.format(size // 1000000)
+        if size >= 1000 and size % 1000 == 0:
+            return '{0}k'.format(size // 1000)
+        return str(size)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Benchmarks export, slicing, GCode analysis & upload paths of print_shortcuts.py')
+    parser.add_argument('--suites', nargs = '+', default = ['export', 'slice', 'gcode', 'upload'],
+        choices = ['export', 'slice', 'gcode', 'upload'], help = 'Suites to run, in order, default: all')
+    parser.add_argument('--sizes', nargs = '+', type = int, default = [10000, 100000, 1000000, 5000000],
+        help = 'Triangle counts of synthetic meshes to export, default: 10000 100000 1000000 5000000')
+    parser.add_argument('--repeat', type = int, default = 3, help = 'Runs per result, the median is compared, default: 3')
+    parser.add_argument('--corpus', nargs = '+', default = None, help = 'STL files to slice, default: download/stl files of this repository')
+    parser.add_argument('--slic3r-exec', default = 'slic3r', help = 'Slic3r executable, default: slic3r')
+    parser.add_argument('--slic3r-conf', default = '', help = 'Slic3r configuration file, default: none')
+    parser.add_argument('--curaengine-exec', default = 'CuraEngine', help = 'CuraEngine executable, default: CuraEngine')
+    parser.add_argument('--curaengine-conf', default = '', help = 'CuraEngine configuration file, default: none')
+    parser.add_argument('--upload-sizes', nargs = '+', type = int, default = [1, 16], help = 'Mega-bytes per uploaded file, default: 1 16')
+    parser.add_argument('--upload-clients', type = int, default = 4, help = 'Concurrent uploads, default: 4')
+    parser.add_argument('--work-dir', default = None, help = 'Directory for generated files, default: a new temporary directory')
+    parser.add_argument('--output', default = None, help = 'Write results of this run as JSON to this file')
+    parser.add_argument('--save-baseline', default = None, help = 'Write results of this run as a baseline JSON file')
+    parser.add_argument('--baseline', default = None, help = 'Baseline JSON file to compare against, exits with 1 on regressions')
+    parser.add_argument('--threshold', type = float, default = 0.25, help = 'Allowed slow down before failing, default: 0.25 for 25 percent')
+    parser.add_argument('--print-shortcuts', default = os.path.join(this_script_directory, 'print_shortcuts.py'),
+        help = 'Path of print_shortcuts.py to benchmark, default: the one next to this script')
+    arguments = parser.parse_args()
+
+    BM = Benchmark(PS = load_print_shortcuts(path = arguments.print_shortcuts), work_dir = arguments.work_dir,
+        repeat = arguments.repeat, sizes = arguments.sizes, corpus = arguments.corpus,
+        slic3r_exec = arguments.slic3r_exec, slic3r_conf = arguments.slic3r_conf,
+        curaengine_exec = arguments.curaengine_exec, curaengine_conf = arguments.curaengine_conf,
+        upload_sizes = arguments.upload_sizes, upload_clients = arguments.upload_clients)
+    BM.run(suites = arguments.suites)
+    record = BM.return_record()
+    if arguments.output:
+        Benchmark.save_results(path = arguments.output, record = record)
+    if arguments.save_baseline:
+        Benchmark.save_results(path = arguments.save_baseline, record = record)
+    if arguments.baseline:
+        regressions = BM.return_regressions(baseline = Benchmark.load_results(path = arguments.baseline), threshold = arguments.threshold)
+        for name, ratio in regressions:
+            print('# Benchmark regression: {0} is {1:.2f}x its baseline'.format(name, ratio))
+        if regressions:
+            sys.exit(1)
+    if arguments.work_dir is None:
+        shutil.rmtree(BM.work_dir, ignore_errors = True)
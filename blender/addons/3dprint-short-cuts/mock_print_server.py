@@ -0,0 +1,928 @@
+#!/usr/bin/env python
+
+
+#  Local stand-in for OctoPrint, Repetier & webcam servers, for benchmarking & trying out 3DPrint Short-Cuts
+#  Copyright (C) 2017 S0AndS0
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2
+#  of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+
+# Example of running a server on OctoPrint's default port, then pointing the add-on's
+#  'OctoPrint Host' at http://localhost & 'Port' at 5000, webcam 'Port' at 5000 too
+#   python mock_print_server.py --port 5000
+# Example of a server about as slow as a Raspberry Pi, with one in twenty requests failing
+#   python mock_print_server.py --port 5000 --profile pi --error-rate 0.05
+# Example of eight simulated add-on users uploading 4MB files to an in-process server
+#   python mock_print_server.py load --clients 8 --requests 20 --scenario upload --file-size 4 --profile pi
+# Example of running a server within another script, such as benchmark_print_shortcuts.py
+#   server = Mock_print_server(port = 0)
+#   server.start()
+#   print(server.host_url, server.port)
+#   server.stop()
+
+
+import os
+import sys
+import json
+import math
+import time
+import queue
+import random
+import shutil
+import struct
+import hashlib
+import argparse
+import tempfile
+import threading
+import http.server
+import socketserver
+import urllib.parse
+import importlib.util
+
+
+# Returns print_shortcuts module loaded from 'path', registered within sys.modules so its objects pickle
+def load_print_shortcuts(path = None):
+    spec = importlib.util.spec_from_file_location('print_shortcuts', path)
+    print_shortcuts = importlib.util.module_from_spec(spec)
+    sys.modules['print_shortcuts'] = print_shortcuts
+    spec.loader.exec_module(print_shortcuts)
+    return print_shortcuts
+
+
+class Load_driver(object):
+    """
+    # This class simulates 'clients' users of print_shortcuts.py at once, each within a thread with its own
+    #  OctoPrint, Repetier or Webcam instance making 'requests' operations, then reports latencies,
+    #  errors & throughput per operation. Scenario 'mixed' cycles through every other scenario.
+    # Example of eight clients uploading to a server started elsewhere
+    LD = Load_driver(PS = load_print_shortcuts(path = 'print_shortcuts.py'), host_url = 'http://127.0.0.1', port = 5000,
+        clients = 8, requests = 20, scenario = 'upload', file_size = 1048576)
+    LD.run()
+    print('\n'.join(LD.return_report()))
+    """
+    scenarios = ('upload', 'listing', 'slice', 'repetier', 'snapshot', 'mixed')
+
+    def __init__(self, PS = None, host_url = 'http://127.0.0.1', port = 5000, api_key = '', clients = 4, requests = 10,
+            scenario = 'upload', file_size = 1048576, work_dir = None):
+        if PS is None:
+            raise Exception('No PS supplied to Load_driver(PS = "?")')
+        if scenario not in Load_driver.scenarios:
+            raise Exception('Unknown scenario supplied to Load_driver(scenario = "{0}")'.format(scenario))
+        self.PS = PS
+        self.host_url = host_url
+        self.port = port
+        self.api_key = api_key
+        self.clients = clients
+        self.requests = requests
+        self.scenario = scenario
+        self.file_size = file_size
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix = 'load_driver_')
+        # One dictionary per operation, {'client': ..., 'operation': ..., 'seconds': ..., 'bytes': ..., 'error': ...}
+        self.results = []
+        self.results_lock = threading.Lock()
+        self.seconds = 0.0
+
+    # Returns Settings for one client, files of each client are kept within their own directory
+    def return_settings(self, client = 0):
+        client_dir = os.path.join(self.work_dir, 'client_{0}'.format(client))
+        if not os.path.isdir(client_dir):
+            os.makedirs(client_dir)
+        port = str(self.port) if self.port else ''
+        return self.PS.Settings(
+            log_level = 'QUITE',
+            octoprint_host = self.host_url,
+            octoprint_port = port,
+            octoprint_x_api_key = self.api_key,
+            octoprint_save_gcode_dir = 'load/client_{0}'.format(client),
+            octoprint_save_stl_dir = 'load/client_{0}'.format(client),
+            octoprint_skip_identical_uploads = False,
+            octoprint_temp_dir = client_dir,
+            octoprint_camera_port = port,
+            octoprint_snapshot_name = 'snapshot',
+            octoprint_slice_uploaded_stl = True,
+            repetier_host = self.host_url,
+            repetier_port = port,
+            repetier_x_api_key = self.api_key,
+            repetier_save_gcode_dir = 'load',
+            repetier_temp_dir = client_dir,
+            timing_summary = False)
+
+    # Returns path to a file of 'self.file_size' bytes, binary STL files are padded with empty facets
+    def write_client_file(self, client = 0, extension = '.gcode'):
+        file_path = os.path.join(self.work_dir, 'client_{0}'.format(client), 'load_{0}{1}'.format(client, extension))
+        if os.path.isfile(file_path):
+            return file_path
+        with open(file_path, 'wb') as client_file:
+            if extension == '.stl':
+                triangle_count = max(1, (self.file_size - 84) // 50)
+                client_file.write(b'Load_driver'.ljust(80, b' ') + struct.pack('<I', triangle_count))
+                client_file.write(b'\x00' * (50 * triangle_count))
+            else:
+                line = b'G1 X10.000 Y10.000 E0.05000\n'
+                client_file.write(line * max(1, self.file_size // len(line)))
+        return file_path
+
+    # Returns list of (operation, function) pairs run in turn by one client
+    def return_operations(self, client = 0):
+        settings = self.return_settings(client = client)
+        OP = self.PS.OctoPrint(context = settings)
+        gcode_path = self.write_client_file(client = client, extension = '.gcode')
+        stl_path = self.write_client_file(client = client, extension = '.stl')
+
+        def upload():
+            OP.upload_file(gcode_path = gcode_path)
+            return os.path.getsize(gcode_path)
+
+        def listing():
+            OP.return_file_listing(target_search_dir = 'RECURSIVE')
+            return 0
+
+        def slice_stl():
+            OP.upload_file(stl_path = stl_path)
+            OP.slice_stl(stl_path = stl_path)
+            return os.path.getsize(stl_path)
+
+        def repetier():
+            self.PS.Repetier(context = settings).upload_gcode(gcode_path = gcode_path)
+            return os.path.getsize(gcode_path)
+
+        def snapshot():
+            return len(self.PS.Webcam(context = settings).return_snapshot_bytes())
+
+        operations = {'upload': upload, 'listing': listing, 'slice': slice_stl, 'repetier': repetier, 'snapshot': snapshot}
+        if self.scenario == 'mixed':
+            return [(name, operations[name]) for name in Load_driver.scenarios if name in operations]
+        return [(self.scenario, operations[self.scenario])]
+
+    # Runs 'self.requests' operations for one client, recording each with any error
+    def client_worker(self, client = 0):
+        try:
+            operations = self.return_operations(client = client)
+        except Exception as error:
+            with self.results_lock:
+                self.results += [{'client': client, 'operation': 'setup', 'seconds': 0.0, 'bytes': 0, 'error': str(error)}]
+            return
+        for request in range(self.requests):
+            operation, function = operations[request % len(operations)]
+            result = {'client': client, 'operation': operation, 'bytes': 0, 'error': None}
+            start_time = time.time()
+            try:
+                result['bytes'] = function()
+            except Exception as error:
+                result['error'] = '{0}: {1}'.format(type(error).__name__, error)
+            result['seconds'] = time.time() - start_time
+            with self.results_lock:
+                self.results += [result]
+
+    # Returns 'results' after every client thread has finished
+    def run(self):
+        print('# Load_driver starting {0} clients of {1} {2} requests each'.format(self.clients, self.requests, self.scenario))
+        threads = [threading.Thread(target = self.client_worker, kwargs = {'client': client}) for client in range(self.clients)]
+        start_time = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.seconds = time.time() - start_time
+        return self.results
+
+    # Returns list of report lines, one row per operation plus totals
+    def return_report(self):
+        row_format = '{0:<10} {1:>8} {2:>7} {3:>9} {4:>9} {5:>9} {6:>9} {7:>9}'
+        report = [row_format.format('Operation', 'Requests', 'Errors', 'p50 (s)', 'p95 (s)', 'Max (s)', 'Req/s', 'MB/s')]
+        operations = []
+        for result in self.results:
+            if result['operation'] not in operations:
+                operations += [result['operation']]
+        for operation in operations + ['total']:
+            results = [result for result in self.results if operation in ('total', result['operation'])]
+            seconds = sorted(result['seconds'] for result in results)
+            errors = len([result for result in results if result['error'] is not None])
+            transferred = sum(result['bytes'] for result in results if result['error'] is None)
+            elapsed = max(self.seconds, 1e-9)
+            report += [row_format.format(operation, len(results), errors,
+                '{0:.4f}'.format(Load_driver.return_percentile(values = seconds, percent = 50)),
+                '{0:.4f}'.format(Load_driver.return_percentile(values = seconds, percent = 95)),
+                '{0:.4f}'.format(seconds[-1] if seconds else 0.0),
+                '{0:.2f}'.format(len(results) / elapsed),
+                '{0:.2f}'.format(transferred / 1048576.0 / elapsed))]
+        report += ['Elapsed {0:.4f}s with {1} clients'.format(self.seconds, self.clients)]
+        # First few distinct errors, so failures are visible without flooding the terminal
+        errors = []
+        for result in self.results:
+            if result['error'] is not None and result['error'] not in errors:
+                errors += [result['error']]
+        report += ['Error: {0}'.format(error) for error in errors[:5]]
+        return report
+
+    # Returns nearest-rank 'percent' percentile of sorted 'values', 0.0 for no values
+    @staticmethod
+    def return_percentile(values = None, percent = 50):
+        if not values:
+            return 0.0
+        rank = max(1, int(math.ceil(percent / 100.0 * len(values))))
+        return values[rank - 1]
+
+
+class Mock_print_server(object):
+    """
+    # This class serves the parts of OctoPrint, Repetier & mjpg-streamer that print_shortcuts.py uses;
+    #  recursive OctoPrint listings with ETag support, multipart uploads, folder creation, server side
+    #  copies & slicing, Repetier model uploads & listings, plus webcam snapshots & MJPEG streams.
+    #  Files are kept in memory, only their name, size & SHA1 hash, so large uploads are cheap.
+    # Faults are set per server; 'latency' & 'latency_jitter' seconds before each response,
+    #  'megabytes_per_second' shared by all connections, 'error_rate' of requests answered with
+    #  'error_status', 'max_concurrent' requests handled at once, plus processing delays of a slow
+    #  host per uploaded megabyte, per listed entry & per slice. See 'profiles' for named sets.
+    # Example of counting requests made by an upload to a server about as slow as a Raspberry Pi
+    server = Mock_print_server(api_key = 'KEY', **Mock_print_server.profiles['pi'])
+    server.start()
+    ... upload to server.host_url on server.port ...
+    print(server.request_counts)
+    server.stop()
+    """
+    # Named fault settings, 'pi' is roughly a Raspberry Pi 3 on wired ethernet saving to its SD card,
+    #  'pi_zero' one on WiFi, 'flaky' a fast host on a poor network
+    profiles = {
+        'none': {},
+        'pi': {'latency': 0.005, 'latency_jitter': 0.01, 'megabytes_per_second': 11.0, 'max_concurrent': 2,
+            'seconds_per_megabyte': 0.1, 'seconds_per_listing_entry': 0.0005, 'slice_seconds': 20.0},
+        'pi_zero': {'latency': 0.02, 'latency_jitter': 0.03, 'megabytes_per_second': 2.0, 'max_concurrent': 1,
+            'seconds_per_megabyte': 0.3, 'seconds_per_listing_entry': 0.002, 'slice_seconds': 60.0},
+        'flaky': {'latency': 0.05, 'latency_jitter': 0.2, 'error_rate': 0.05},
+    }
+
+    def __init__(self, host = '127.0.0.1', port = 0, api_key = '', latency = 0.0, latency_jitter = 0.0,
+            megabytes_per_second = 0.0, error_rate = 0.0, error_status = 503, max_concurrent = 0,
+            seconds_per_megabyte = 0.0, seconds_per_listing_entry = 0.0, slice_seconds = 0.5,
+            snapshot_path = None, snapshot_size = (640, 480), snapshot_bytes = 0, stream_fps = 10,
+            stream_seconds = 10.0, print_seconds_left = 0, printer_connected = True, seed = None):
+        self.host = host
+        self.port = port
+        self.api_key = api_key
+        # Fault settings
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.megabytes_per_second = megabytes_per_second
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_concurrent = max_concurrent
+        self.seconds_per_megabyte = seconds_per_megabyte
+        self.seconds_per_listing_entry = seconds_per_listing_entry
+        self.slice_seconds = slice_seconds
+        # Webcam settings, a grey JPEG is generated unless 'snapshot_path' points at one
+        self.snapshot_path = snapshot_path
+        self.snapshot_size = snapshot_size
+        self.snapshot_bytes = snapshot_bytes
+        self.stream_fps = stream_fps
+        self.stream_seconds = stream_seconds
+        # Printer state for /api/printer, /api/job & Repetier's listPrinter, printing while 'print_seconds_left' is above 0
+        self.print_seconds_left = print_seconds_left
+        self.printer_connected = printer_connected
+        self.http_server = None
+        self.thread = None
+        self.slice_thread = None
+        self.slice_queue = queue.Queue()
+        # Entries per location keyed by path, such as {'local': {'gcode/Cube.gcode': {...}}}
+        self.locations = {'local': {}, 'sdcard': {}}
+        # Repetier models keyed by printer slug, such as {'Prusa_i3': [{'id': 1, 'name': 'Cube', ...}]}
+        self.repetier_models = {}
+        self.listing_version = 0
+        self.request_counts = {}
+        self.received_bytes = 0
+        self.sent_bytes = 0
+        self.snapshot_frame = 0
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+        self.request_semaphore = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        # Time the shared bandwidth cap is next free, see throttle
+        self.bandwidth_free_time = 0.0
+
+    # Returns 'host_url' after starting to serve requests within a daemon thread
+    def start(self):
+        self.http_server = Mock_print_server_http(server_address = (self.host, self.port), mock_server = self)
+        self.port = self.http_server.server_address[1]
+        self.thread = threading.Thread(target = self.http_server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.slice_thread = threading.Thread(target = self.slice_worker)
+        self.slice_thread.daemon = True
+        self.slice_thread.start()
+        print('# Mock_print_server listening on: {0}:{1}'.format(self.host_url, self.port))
+        return self.host_url
+
+    # Stops serving & closes the listening socket, queued slices are dropped
+    def stop(self):
+        if self.http_server is None:
+            return
+        self.slice_queue.put(None)
+        self.http_server.shutdown()
+        self.http_server.server_close()
+        self.http_server = None
+
+    @property
+    def host_url(self):
+        return 'http://{0}'.format(self.host)
+
+    # Records one request against 'name', such as 'upload' or 'listing'
+    def count_request(self, name = None):
+        with self.lock:
+            self.request_counts[name] = self.request_counts.get(name, 0) + 1
+
+    # Sleeps for 'latency' plus up to 'latency_jitter' seconds
+    def wait_latency(self):
+        if not self.latency and not self.latency_jitter:
+            return
+        with self.lock:
+            jitter = self.random.uniform(0, self.latency_jitter)
+        time.sleep(self.latency + jitter)
+
+    # Returns 'True' for about 'error_rate' of calls, counting each as an 'error' request
+    def return_fault(self):
+        if not self.error_rate:
+            return False
+        with self.lock:
+            fault = self.random.random() < self.error_rate
+        if fault:
+            self.count_request(name = 'error')
+        return fault
+
+    # Sleeps until 'byte_count' bytes fit within 'megabytes_per_second', shared by every connection as one link is
+    def throttle(self, byte_count = 0):
+        if not self.megabytes_per_second or not byte_count:
+            return
+        with self.lock:
+            now = time.time()
+            self.bandwidth_free_time = max(now, self.bandwidth_free_time) + byte_count / (self.megabytes_per_second * 1048576.0)
+            delay = self.bandwidth_free_time - now
+        if delay > 0:
+            time.sleep(delay)
+
+    # Returns entry dictionary after storing a file or folder at 'path' within 'location'
+    def add_entry(self, location = 'local', path = None, entry_type = 'machinecode', size = 0, file_hash = None, extra = None):
+        path = path.strip('/')
+        entry = {
+            'name': path.split('/')[-1],
+            'path': path,
+            'type': entry_type,
+            'origin': location}
+        if entry_type != 'folder':
+            entry['size'] = size
+            entry['hash'] = file_hash
+            entry['date'] = int(time.time())
+        if extra:
+            entry.update(extra)
+        with self.lock:
+            # Parent folders are made implicitly, as OctoPrint does when uploading with a 'path' field
+            parent_path = ''
+            for folder_name in path.split('/')[:-1]:
+                parent_path = '{0}/{1}'.format(parent_path, folder_name) if parent_path else folder_name
+                if parent_path not in self.locations[location]:
+                    self.locations[location][parent_path] = {'name': folder_name, 'path': parent_path, 'type': 'folder', 'origin': location}
+            self.locations[location][path] = entry
+            self.listing_version += 1
+        return entry
+
+    # Returns nested listing as OctoPrint sends it, children of folders included, below 'path' if given
+    def return_listing(self, location = 'local', path = ''):
+        path = path.strip('/')
+        with self.lock:
+            entries = dict(self.locations[location])
+        if self.seconds_per_listing_entry:
+            time.sleep(self.seconds_per_listing_entry * len(entries))
+        children = {}
+        for entry_path in sorted(entries):
+            parent_path = entry_path.rsplit('/', 1)[0] if '/' in entry_path else ''
+            children.setdefault(parent_path, []).append(entry_path)
+
+        def return_entry(entry_path):
+            entry = dict(entries[entry_path])
+            if entry['type'] == 'folder':
+                entry['children'] = [return_entry(child_path) for child_path in children.get(entry_path, [])]
+            return entry
+
+        if path:
+            if path not in entries:
+                return None
+            return return_entry(path)
+        return {'files': [return_entry(child_path) for child_path in children.get('', [])], 'free': 1 << 34}
+
+    # Returns dictionary for the 'gcodeAnalysis' of an entry sliced from 'size' bytes of STL, scaled so larger models take longer
+    @staticmethod
+    def return_gcode_analysis(size = 0):
+        filament_length = round(size / 20.0, 2)
+        return {
+            'estimatedPrintTime': round(size / 50.0, 2),
+            'filament': {'tool0': {'length': filament_length, 'volume': round(filament_length * math.pi * 0.875 ** 2 / 1000.0, 4)}}}
+
+    # Adds a sliced .gcode entry for each queued slice in order, one at a time as OctoPrint's slicing queue does
+    def slice_worker(self):
+        while True:
+            slice_job = self.slice_queue.get()
+            if slice_job is None:
+                return
+            time.sleep(self.slice_seconds)
+            stl_entry = slice_job['stl_entry']
+            self.add_entry(location = slice_job['location'], path = slice_job['gcode_path'], entry_type = 'machinecode',
+                size = stl_entry.get('size', 0) * 2, file_hash = hashlib.sha1('{0} {1}'.format(slice_job['gcode_path'], time.time()).encode('utf-8')).hexdigest(),
+                extra = {'gcodeAnalysis': Mock_print_server.return_gcode_analysis(size = stl_entry.get('size', 0))})
+            self.count_request(name = 'sliced')
+
+    # Returns dictionary of OctoPrint state flags & text for /api/printer
+    def return_printer_state(self):
+        printing = self.print_seconds_left > 0
+        return {
+            'text': 'Printing' if printing else 'Operational',
+            'flags': {'operational': True, 'printing': printing, 'paused': False, 'ready': not printing, 'error': False, 'closedOrError': False}}
+
+    # Returns list of Repetier model entries uploaded for printer 'slug'
+    def return_repetier_models(self, slug = ''):
+        with self.lock:
+            return list(self.repetier_models.get(slug, []))
+
+    # Returns bytes of the next webcam frame, the file at 'snapshot_path' if set
+    def return_snapshot(self):
+        with self.lock:
+            self.snapshot_frame += 1
+            frame = self.snapshot_frame
+        if self.snapshot_path:
+            with open(self.snapshot_path, 'rb') as snapshot_file:
+                return snapshot_file.read()
+        return Mock_print_server.return_jpeg(width = self.snapshot_size[0], height = self.snapshot_size[1],
+            comment = 'Mock_print_server frame {0}'.format(frame), size = self.snapshot_bytes)
+
+    # Returns bytes of a valid baseline JPEG of flat grey, padded with comment segments to about 'size' bytes
+    @staticmethod
+    def return_jpeg(width = 640, height = 480, comment = '', size = 0):
+        def segment(marker = b'', payload = b''):
+            return marker + struct.pack('>H', len(payload) + 2) + payload
+
+        # One Huffman code per table, category 0 for DC & end-of-block for AC, so each 8x8 block is two 0 bits
+        huffman_counts = b'\x01' + b'\x00' * 15
+        blocks = int(math.ceil(width / 8.0)) * int(math.ceil(height / 8.0))
+        scan_bits = 2 * blocks
+        scan = b'\x00' * (scan_bits // 8)
+        if scan_bits % 8:
+            scan += bytes([(1 << (8 - scan_bits % 8)) - 1])
+        jpeg = [
+            b'\xff\xd8',
+            segment(marker = b'\xff\xe0', payload = b'JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00'),
+            segment(marker = b'\xff\xfe', payload = comment.encode('utf-8')),
+            segment(marker = b'\xff\xdb', payload = b'\x00' + b'\x01' * 64),
+            segment(marker = b'\xff\xc0', payload = struct.pack('>BHHB', 8, height, width, 1) + b'\x01\x11\x00'),
+            segment(marker = b'\xff\xc4', payload = b'\x00' + huffman_counts + b'\x00' + b'\x10' + huffman_counts + b'\x00'),
+            segment(marker = b'\xff\xda', payload = b'\x01\x01\x00\x00\x3f\x00'),
+            scan,
+            b'\xff\xd9']
+        padding = size - sum(len(part) for part in jpeg)
+        while padding > 4:
+            pad_length = min(padding - 4, 65533)
+            jpeg.insert(3, segment(marker = b'\xff\xfe', payload = b' ' * pad_length))
+            padding -= pad_length + 4
+        return b''.join(jpeg)
+
+
+class Mock_print_server_http(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """
+    # Threaded HTTP server handing requests to Mock_print_handler, with a reference back to Mock_print_server
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, server_address = None, mock_server = None):
+        self.mock_server = mock_server
+        http.server.HTTPServer.__init__(self, server_address, Mock_print_handler)
+
+
+class Mock_print_handler(http.server.BaseHTTPRequestHandler):
+    """
+    # Request handler for Mock_print_server, keep-alive so pooled connections of Http_client are reused
+    """
+    protocol_version = 'HTTP/1.1'
+    # Size of reads & writes between bandwidth throttling
+    chunk_size = 65536
+    stream_boundary = 'boundarydonotcross'
+
+    # Quiets per request logging, Mock_print_server.request_counts tallies requests instead
+    def log_message(self, format, *args):
+        pass
+
+    # Writes 'payload' in chunks, throttled to the server's bandwidth cap
+    def write_bytes(self, payload = b''):
+        mock_server = self.server.mock_server
+        for offset in range(0, len(payload), self.chunk_size):
+            chunk = payload[offset:offset + self.chunk_size]
+            mock_server.throttle(byte_count = len(chunk))
+            self.wfile.write(chunk)
+        with mock_server.lock:
+            mock_server.sent_bytes += len(payload)
+
+    # Sends 'status' with a JSON body, or no body for 204 & 304
+    def send_json(self, status = 200, body = None, headers = None):
+        payload = b'' if body is None else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if body is not None:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.write_bytes(payload = payload)
+
+    # Returns (location, path) for /api/files/<location>/<path> request paths, else (None, None)
+    def return_file_target(self):
+        split_path = urllib.parse.urlsplit(self.path).path.split('/', 4)
+        if len(split_path) < 4 or split_path[1] != 'api' or split_path[2] != 'files':
+            return None, None
+        if split_path[3] not in self.server.mock_server.locations:
+            return None, None
+        path = urllib.parse.unquote(split_path[4]) if len(split_path) > 4 else ''
+        return split_path[3], path
+
+    # Returns printer slug for /printer/model/<slug> request paths, '' when left off, else None
+    def return_repetier_target(self):
+        split_path = urllib.parse.urlsplit(self.path).path.split('/', 3)
+        if len(split_path) < 3 or split_path[1] != 'printer' or split_path[2] != 'model':
+            return None
+        return urllib.parse.unquote(split_path[3]).strip('/') if len(split_path) > 3 else ''
+
+    # Returns webcam action, 'snapshot' or 'stream', from ?action= of request, else None
+    def return_webcam_action(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        action = query.get('action', [None])[0]
+        return action if action in ('snapshot', 'stream') else None
+
+    # Returns 'True' if no API key is required or the request sent the right one, else sends 401
+    def check_api_key(self):
+        api_key = self.server.mock_server.api_key
+        # Repetier also accepts the key as an 'apikey' query parameter
+        query_api_key = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query).get('apikey', [None])[0]
+        if api_key and api_key not in (self.headers.get('X-Api-Key'), query_api_key):
+            self.send_json(status = 401, body = {'error': 'Invalid API key'})
+            return False
+        return True
+
+    # Returns request body as bytes, an empty body if no Content-Length was sent
+    def return_body(self):
+        mock_server = self.server.mock_server
+        content_length = int(self.headers.get('Content-Length') or 0)
+        chunks = []
+        remaining = content_length
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, self.chunk_size))
+            if not chunk:
+                break
+            mock_server.throttle(byte_count = len(chunk))
+            chunks += [chunk]
+            remaining -= len(chunk)
+        body = b''.join(chunks)
+        with mock_server.lock:
+            mock_server.received_bytes += len(body)
+        return body
+
+    # Returns (fields, files) from a multipart/form-data body, files as {name: (filename, bytes)}
+    def return_multipart(self, body = None):
+        content_type = self.headers.get('Content-Type', '')
+        boundary = content_type.split('boundary=', 1)[-1].strip('"').encode('latin-1')
+        fields = {}
+        files = {}
+        for part in body.split(b'--' + boundary)[1:]:
+            if part.startswith(b'--'):
+                break
+            part_headers, _, part_body = part.partition(b'\r\n\r\n')
+            part_body = part_body[:-2] if part_body.endswith(b'\r\n') else part_body
+            disposition = part_headers.decode('utf-8', 'replace')
+            name = disposition.split('name="', 1)[1].split('"', 1)[0]
+            if 'filename="' in disposition:
+                files[name] = (disposition.split('filename="', 1)[1].split('"', 1)[0], part_body)
+            else:
+                fields[name] = part_body.decode('utf-8')
+        return fields, files
+
+    # Returns 'True' after sending an injected error, latency is waited out first either way
+    def send_fault(self):
+        mock_server = self.server.mock_server
+        mock_server.wait_latency()
+        if mock_server.return_fault():
+            self.send_json(status = mock_server.error_status, body = {'error': 'Injected by Mock_print_server'})
+            return True
+        return False
+
+    # Runs 'handler' no more than 'max_concurrent' at once, as a slow host would queue requests
+    def handle_limited(self, handler = None):
+        semaphore = self.server.mock_server.request_semaphore
+        if semaphore is None:
+            handler()
+            return
+        with semaphore:
+            handler()
+
+    def do_GET(self):
+        self.handle_limited(handler = self.handle_get)
+
+    def do_POST(self):
+        self.handle_limited(handler = self.handle_post)
+
+    def handle_get(self):
+        mock_server = self.server.mock_server
+        if self.send_fault():
+            return
+        action = self.return_webcam_action()
+        if action == 'snapshot':
+            self.send_snapshot()
+            return
+        if action == 'stream':
+            self.send_stream()
+            return
+        if not self.check_api_key():
+            return
+        request_path = urllib.parse.urlsplit(self.path).path
+        if request_path in ('/api/printer', '/api/job'):
+            self.send_printer_state(request_path = request_path)
+            return
+        if request_path.startswith('/printer/api/'):
+            self.send_repetier_printers(slug = urllib.parse.unquote(request_path[len('/printer/api/'):]).strip('/'))
+            return
+        slug = self.return_repetier_target()
+        if slug is not None:
+            mock_server.count_request(name = 'repetier_listing')
+            self.send_json(status = 200, body = {'data': mock_server.return_repetier_models(slug = slug)})
+            return
+        location, path = self.return_file_target()
+        if location is None:
+            self.send_json(status = 404, body = {'error': 'Not found'})
+            return
+        mock_server.count_request(name = 'listing')
+        etag = '"{0}"'.format(mock_server.listing_version)
+        if self.headers.get('If-None-Match') == etag:
+            self.send_json(status = 304, headers = {'ETag': etag})
+            return
+        listing = mock_server.return_listing(location = location, path = path)
+        if listing is None:
+            self.send_json(status = 404, body = {'error': 'File not found'})
+            return
+        self.send_json(status = 200, body = listing, headers = {'ETag': etag})
+
+    def handle_post(self):
+        mock_server = self.server.mock_server
+        # Whole body is read before any fault or error, so keep-alive connections stay usable
+        body = self.return_body()
+        if self.send_fault():
+            return
+        if not self.check_api_key():
+            return
+        slug = self.return_repetier_target()
+        if slug is not None:
+            self.post_repetier(slug = slug, body = body)
+            return
+        location, path = self.return_file_target()
+        if location is None:
+            self.send_json(status = 404, body = {'error': 'Not found'})
+            return
+        if path:
+            self.post_command(location = location, path = path, body = body)
+            return
+        fields, files = self.return_multipart(body = body)
+        folder_path = fields.get('path', '').strip('/')
+        if 'foldername' in fields:
+            mock_server.count_request(name = 'mkdir')
+            new_path = '{0}/{1}'.format(folder_path, fields['foldername']) if folder_path else fields['foldername']
+            if new_path in mock_server.locations[location]:
+                self.send_json(status = 409, body = {'error': 'Folder already exists'})
+                return
+            entry = mock_server.add_entry(location = location, path = new_path, entry_type = 'folder')
+            self.send_json(status = 201, body = {'done': True, 'folder': entry})
+            return
+        if 'file' not in files:
+            self.send_json(status = 400, body = {'error': 'No file or foldername included'})
+            return
+        mock_server.count_request(name = 'upload')
+        file_name, file_bytes = files['file']
+        if mock_server.seconds_per_megabyte:
+            time.sleep(mock_server.seconds_per_megabyte * len(file_bytes) / 1048576.0)
+        new_path = '{0}/{1}'.format(folder_path, file_name) if folder_path else file_name
+        entry_type = 'model' if file_name.lower().endswith('.stl') else 'machinecode'
+        entry = mock_server.add_entry(location = location, path = new_path, entry_type = entry_type,
+            size = len(file_bytes), file_hash = hashlib.sha1(file_bytes).hexdigest())
+        self.send_json(status = 201, body = {'done': True, 'files': {location: entry}})
+
+    # Answers JSON commands sent to an existing file, 'copy', 'move' & 'slice' are understood
+    def post_command(self, location = None, path = None, body = None):
+        mock_server = self.server.mock_server
+        mock_server.count_request(name = 'command')
+        path = path.strip('/')
+        entry = mock_server.locations[location].get(path)
+        if entry is None:
+            self.send_json(status = 404, body = {'error': 'File not found'})
+            return
+        try:
+            command = json.loads(body.decode('utf-8'))
+        except ValueError:
+            self.send_json(status = 400, body = {'error': 'Malformed JSON body'})
+            return
+        if command.get('command') == 'slice':
+            self.post_slice(location = location, entry = entry, command = command)
+            return
+        if command.get('command') not in ('copy', 'move'):
+            self.send_json(status = 400, body = {'error': 'Unknown command'})
+            return
+        destination = command.get('destination', '').strip('/')
+        new_path = '{0}/{1}'.format(destination, entry['name']) if destination else entry['name']
+        if new_path in mock_server.locations[location]:
+            self.send_json(status = 409, body = {'error': 'Destination exists'})
+            return
+        new_entry = mock_server.add_entry(location = location, path = new_path, entry_type = entry['type'],
+            size = entry.get('size', 0), file_hash = entry.get('hash'))
+        if command['command'] == 'move':
+            with mock_server.lock:
+                del mock_server.locations[location][path]
+        self.send_json(status = 201, body = new_entry)
+
+    # Queues slicing of an STL entry, the .gcode entry is listed once Mock_print_server.slice_worker gets to it
+    def post_slice(self, location = None, entry = None, command = None):
+        mock_server = self.server.mock_server
+        mock_server.count_request(name = 'slice')
+        if location != 'local':
+            self.send_json(status = 400, body = {'error': 'Cannot slice files on the SD card'})
+            return
+        if entry['type'] != 'model':
+            self.send_json(status = 415, body = {'error': 'Cannot slice {0}, not a model file'.format(entry['name'])})
+            return
+        gcode_name = command.get('gcode') or '{0}.gcode'.format(entry['name'].rsplit('.', 1)[0])
+        parent_path = entry['path'].rsplit('/', 1)[0] if '/' in entry['path'] else ''
+        gcode_path = '{0}/{1}'.format(parent_path, gcode_name) if parent_path else gcode_name
+        mock_server.slice_queue.put({'location': location, 'stl_entry': dict(entry), 'gcode_path': gcode_path, 'command': command})
+        self.send_json(status = 202, body = {
+            'done': False,
+            'origin': location,
+            'name': gcode_name,
+            'path': gcode_path,
+            'refs': {'resource': 'http://{0}:{1}/api/files/{2}/{3}'.format(mock_server.host, mock_server.port, location, gcode_path)}})
+
+    # Stores a Repetier upload sent as multipart with 'a' of 'upload' & a 'filename' file
+    def post_repetier(self, slug = '', body = None):
+        mock_server = self.server.mock_server
+        mock_server.count_request(name = 'repetier_upload')
+        fields, files = self.return_multipart(body = body)
+        if fields.get('a') != 'upload' or 'filename' not in files:
+            self.send_json(status = 400, body = {'error': 'Expected a=upload with a filename file'})
+            return
+        file_name, file_bytes = files['filename']
+        if mock_server.seconds_per_megabyte:
+            time.sleep(mock_server.seconds_per_megabyte * len(file_bytes) / 1048576.0)
+        with mock_server.lock:
+            models = mock_server.repetier_models.setdefault(slug, [])
+            model = {'id': len(models) + 1, 'name': file_name.rsplit('.', 1)[0], 'length': len(file_bytes), 'created': int(time.time() * 1000)}
+            models += [model]
+        self.send_json(status = 200, body = {'ok': True, 'model': model})
+
+    # Answers /api/printer with state flags, 409 if no printer is connected, & /api/job with progress
+    def send_printer_state(self, request_path = None):
+        mock_server = self.server.mock_server
+        mock_server.count_request(name = 'printer_state')
+        if not mock_server.printer_connected:
+            self.send_json(status = 409, body = {'error': 'Printer is not operational'})
+            return
+        if request_path == '/api/printer':
+            self.send_json(status = 200, body = {'state': mock_server.return_printer_state()})
+            return
+        printing = mock_server.print_seconds_left > 0
+        self.send_json(status = 200, body = {
+            'job': {'file': {'name': 'mock.gcode' if printing else None}},
+            'progress': {'completion': 50.0 if printing else None, 'printTimeLeft': mock_server.print_seconds_left if printing else None},
+            'state': mock_server.return_printer_state()['text']})
+
+    # Answers Repetier's /printer/api/<slug>?a=listPrinter with the one printer this server stands in for
+    def send_repetier_printers(self, slug = ''):
+        mock_server = self.server.mock_server
+        mock_server.count_request(name = 'printer_state')
+        printing = mock_server.print_seconds_left > 0
+        self.send_json(status = 200, body = [{
+            'slug': slug,
+            'name': slug,
+            'active': True,
+            'online': 1 if mock_server.printer_connected else 0,
+            'job': 'mock.gcode' if printing else 'none',
+            'done': 50.0 if printing else 0,
+            'printTime': mock_server.print_seconds_left * 2 if printing else 0,
+            'printedTimeComp': mock_server.print_seconds_left if printing else 0}])
+
+    # Sends one webcam frame as image/jpeg
+    def send_snapshot(self):
+        mock_server = self.server.mock_server
+        mock_server.count_request(name = 'snapshot')
+        payload = mock_server.return_snapshot()
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.write_bytes(payload = payload)
+
+    # Sends frames as multipart/x-mixed-replace at 'stream_fps' until 'stream_seconds' pass or the client leaves
+    def send_stream(self):
+        mock_server = self.server.mock_server
+        mock_server.count_request(name = 'stream')
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'multipart/x-mixed-replace;boundary={0}'.format(self.stream_boundary))
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        end_time = time.time() + mock_server.stream_seconds
+        try:
+            while time.time() < end_time:
+                payload = mock_server.return_snapshot()
+                self.write_bytes(payload = '--{0}\r\nContent-Type: image/jpeg\r\nContent-Length: {1}\r\n\r\n'.format(
+                    self.stream_boundary, len(payload)).encode('latin-1') + payload + b'\r\n')
+                self.wfile.flush()
+                time.sleep(1.0 / max(mock_server.stream_fps, 1))
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Local stand-in for OctoPrint, Repetier & webcam servers, with a load driver')
+    parser.add_argument('mode', nargs = '?', default = 'serve', choices = ['serve', 'load'],
+        help = 'serve: run a server until interrupted, load: run Load_driver clients against a server, default: serve')
+    parser.add_argument('--host', default = '127.0.0.1', help = 'Address to listen on, default: 127.0.0.1')
+    parser.add_argument('--port', type = int, default = None, help = 'Port to listen on, default: 5000 to serve, any free port to load')
+    parser.add_argument('--api-key', default = '', help = 'X-Api-Key required of requests, default: none required')
+    fault_group = parser.add_argument_group('faults', 'Options override those of --profile')
+    fault_group.add_argument('--profile', default = 'none', choices = sorted(Mock_print_server.profiles),
+        help = 'Named fault settings, default: none')
+    fault_group.add_argument('--latency', type = float, help = 'Seconds waited before each response')
+    fault_group.add_argument('--latency-jitter', type = float, help = 'Up to this many more seconds, at random, per response')
+    fault_group.add_argument('--bandwidth', type = float, dest = 'megabytes_per_second', help = 'MB/s shared by all connections, 0 for no cap')
+    fault_group.add_argument('--error-rate', type = float, help = 'Fraction of requests answered with --error-status, such as 0.05')
+    fault_group.add_argument('--error-status', type = int, help = 'HTTP status of injected errors, default: 503')
+    fault_group.add_argument('--max-concurrent', type = int, help = 'Requests handled at once, 0 for no limit')
+    fault_group.add_argument('--seconds-per-megabyte', type = float, help = 'Processing seconds per uploaded MB')
+    fault_group.add_argument('--seconds-per-listing-entry', type = float, help = 'Processing seconds per file listed')
+    fault_group.add_argument('--slice-seconds', type = float, help = 'Seconds each queued slice takes')
+    fault_group.add_argument('--printing', type = float, dest = 'print_seconds_left', help = 'Report a print with this many seconds left, 0 for idle')
+    fault_group.add_argument('--disconnected', action = 'store_true', help = 'Report no printer connected, OctoPrint answers 409')
+    fault_group.add_argument('--seed', type = int, help = 'Random seed for jitter & injected errors')
+    webcam_group = parser.add_argument_group('webcam')
+    webcam_group.add_argument('--snapshot-path', default = None, help = 'JPEG served as every frame, default: generated grey frames')
+    webcam_group.add_argument('--snapshot-bytes', type = int, default = 0, help = 'Pad generated frames to about this size')
+    webcam_group.add_argument('--stream-fps', type = int, default = 10, help = 'Frames per second of ?action=stream, default: 10')
+    load_group = parser.add_argument_group('load')
+    load_group.add_argument('--url', default = None, help = 'Server to load, such as http://192.168.0.2:5000, default: start one in-process')
+    load_group.add_argument('--clients', type = int, default = 4, help = 'Concurrent clients, default: 4')
+    load_group.add_argument('--requests', type = int, default = 10, help = 'Requests per client, default: 10')
+    load_group.add_argument('--scenario', default = 'upload', choices = Load_driver.scenarios, help = 'Operation of each request, default: upload')
+    load_group.add_argument('--file-size', type = float, default = 1.0, help = 'MB per uploaded file, default: 1')
+    load_group.add_argument('--print-shortcuts', default = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'print_shortcuts.py'),
+        help = 'Path to print_shortcuts.py, default: next to this script')
+    arguments = parser.parse_args()
+    server_values = dict(Mock_print_server.profiles[arguments.profile])
+    for key in ('latency', 'latency_jitter', 'megabytes_per_second', 'error_rate', 'error_status', 'max_concurrent',
+            'seconds_per_megabyte', 'seconds_per_listing_entry', 'slice_seconds', 'print_seconds_left', 'seed'):
+        if getattr(arguments, key) is not None:
+            server_values[key] = getattr(arguments, key)
+    if arguments.disconnected:
+        server_values['printer_connected'] = False
+    server_values.update(snapshot_path = arguments.snapshot_path, snapshot_bytes = arguments.snapshot_bytes, stream_fps = arguments.stream_fps)
+    server = None
+    if arguments.mode == 'serve' or arguments.url is None:
+        port = arguments.port if arguments.port is not None else (5000 if arguments.mode == 'serve' else 0)
+        server = Mock_print_server(host = arguments.host, port = port, api_key = arguments.api_key, **server_values)
+        server.start()
+    if arguments.mode == 'serve':
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.stop()
+            sys.exit(0)
+    if arguments.url is not None:
+        split_url = urllib.parse.urlsplit(arguments.url if '://' in arguments.url else 'http://' + arguments.url)
+        host_url = '{0}://{1}'.format(split_url.scheme, split_url.hostname)
+        port = split_url.port
+    else:
+        host_url = server.host_url
+        port = server.port
+    LD = Load_driver(PS = load_print_shortcuts(path = arguments.print_shortcuts), host_url = host_url, port = port,
+        api_key = arguments.api_key, clients = arguments.clients, requests = arguments.requests, scenario = arguments.scenario,
+        file_size = int(arguments.file_size * 1048576))
+    try:
+        LD.run()
+    finally:
+        if server is not None:
+            print('# Mock_print_server request counts: {0}'.format(json.dumps(server.request_counts, sort_keys = True)))
+            server.stop()
+        shutil.rmtree(LD.work_dir, ignore_errors = True)
+    print('\n'.join(LD.return_report()))
@@ -35,38 +35,97 @@ bl_info = {
     "blender": (2, 75, 0),
     "location": "View3D > Tools > 3DPrint_Short_Cuts",
     "description": "Enables translation to GCode without leaving Blender & uploading to OctoPrint or Repetier server(s)",
-    "warning": "Untested on Mac & Win. Uses Curl for server interactions, and Slic3r or CuraEngine for GCode translations.",
+    "warning": "Untested on Mac & Win. Uses pooled HTTP(S) connections for server interactions, and Slic3r or CuraEngine for GCode translations.",
     "wiki_url": "https://s0ands0.github.io/3D_Printing/blender/addons/3dprint-short-cuts/readme.html",
     "category": "Import-Export",
 }
 
 
-import bpy
 import os
+import sys
+import argparse
 import platform
 import subprocess
 import json
+import math
+import re
+import hashlib
+import shutil
+import time
+import queue
+import threading
+import contextlib
+import select
+import base64
+import http.client
+import ssl
+import urllib.parse
+import uuid
+import types
+import tempfile
+import numpy as np
+
+try:
+    # Some Python builds, Blender's own on a few Linux distributions, lack sqlite3, see Job_journal class
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+try:
+    import bpy
+    import bmesh
+    from bpy_extras.io_utils import axis_conversion
+    from mathutils import Matrix
+    from mathutils.bvhtree import BVHTree
+    from bpy.app.handlers import persistent
+    from bpy.types import (
+        Operator,
+        Panel,
+        PropertyGroup)
+    from bpy.props import (
+        BoolProperty,
+        EnumProperty,
+        StringProperty,
+        IntProperty,
+        FloatProperty,
+        FloatVectorProperty)
+except ImportError:
+    # Imported by plain Python, such as worker processes, tests & benchmarks, see Settings class
+    #  for what stands in for bpy.context; classes that build Blender data are not usable
+    bpy = None
+    bmesh = axis_conversion = Matrix = BVHTree = None
+    Operator = Panel = PropertyGroup = object
+    persistent = lambda function: function
+    # Property short-cuts return their default, settings classes store these on Scene_defaults
+    BoolProperty = lambda **keywords: keywords.get('default', False)
+    EnumProperty = lambda **keywords: keywords.get('default', keywords['items'][0][0])
+    StringProperty = lambda **keywords: keywords.get('default', '')
+    IntProperty = lambda **keywords: keywords.get('default', 0)
+    FloatProperty = lambda **keywords: keywords.get('default', 0.0)
+    FloatVectorProperty = lambda **keywords: keywords.get('default', (0.0, 0.0, 0.0))
+
+    class Scene_defaults(object):
+        pass
 
-from bpy.types import (
-    Operator,
-    Panel,
-    PropertyGroup)
-from bpy.props import (
-    BoolProperty,
-    EnumProperty,
-    StringProperty,
-    IntProperty,
-    FloatProperty,
-    FloatVectorProperty)
 
+if bpy is not None:
+    this_addons_name = bpy.path.display_name_from_filepath(__file__)
+    default_context = bpy.context
+    default_temp_dir = bpy.app.tempdir
+else:
+    this_addons_name = os.path.splitext(os.path.basename(__file__))[0]
+    # Outside of Blender a Settings instance must be passed wherever 'context' is asked for
+    default_context = None
+    default_temp_dir = os.path.join(tempfile.gettempdir(), '')
 
-this_addons_name = bpy.path.display_name_from_filepath(__file__)
 this_addons_category = bl_info.get('name')
 
 Target_render_engine = 'BLENDER_GAME'
 Target_material_mode = 'GLSL'
 Target_viewport_shade = 'TEXTURED'
 
+# Caches & journals outlive a Blender session within default_cache_dir, Blender removes
+#  bpy.app.tempdir on exit
 if 'Linux' in platform.system():
     slic3r_exec_name = 'slic3r'
     slic3r_exec_dir = ''
@@ -74,6 +133,7 @@ if 'Linux' in platform.system():
     curaengine_exec_name = 'CuraEngine'
     curl_exec_dir = ''
     curl_exec_name = 'curl'
+    default_cache_dir = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'print_shortcuts')
 elif 'Windows' in platform.system():
     slic3r_exec_name = 'slic3r-console.exe'
     slic3r_exec_dir = ''
@@ -81,6 +141,7 @@ elif 'Windows' in platform.system():
     curaengine_exec_name = 'CuraEngine'
     curl_exec_dir = ''
     curl_exec_name = 'curl'
+    default_cache_dir = os.path.join(os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'), 'print_shortcuts', 'cache')
 elif 'Darwin' in platform.system():
     slic3r_exec_name = 'slic3r'
     slic3r_exec_dir = 'Slic3r.app/Contents/MacOS'
@@ -88,6 +149,7 @@ elif 'Darwin' in platform.system():
     curaengine_exec_name = 'CuraEngine'
     curl_exec_dir = ''
     curl_exec_name = 'curl'
+    default_cache_dir = os.path.join(os.path.expanduser('~/Library/Caches'), 'print_shortcuts')
 else:
     raise Exception('## Did not understand platform.system(): {0}'.format(platform.system()))
 
@@ -103,10 +165,11 @@ class Blender(object):
     #  renaming an object, parenting two object, adding empty & plane objects, and importing & exporting
     #  of various file types.
     """
-    def __init__(self, context = bpy.context):
+    def __init__(self, context = default_context):
         self.blender_version_main = bpy.app.version[0]
         self.blender_version_sub = bpy.app.version[1]
         self.selected_objects = context.selected_objects
+        self.scene = context.scene
         # Slic3r panel settings for this instance
         self.slic3r_exec_dir = context.scene.slic3r_exec_dir
         self.slic3r_exec_name = context.scene.slic3r_exec_name
@@ -123,6 +186,9 @@ class Blender(object):
         self.export_stl_check_existing = context.scene.export_stl_check_existing
         self.export_stl_global_scale = context.scene.export_stl_global_scale
         self.export_stl_use_scene_unit = context.scene.export_stl_use_scene_unit
+        self.export_stl_engine = context.scene.export_stl_engine
+        self.export_stl_use_cache = context.scene.export_stl_use_cache
+        self.export_caches = {}
         # Import OBJ settings
         self.import_obj_directory = context.scene.import_obj_directory
         self.import_obj_axis_forward = context.scene.import_obj_axis_forward
@@ -135,11 +201,12 @@ class Blender(object):
         self.import_obj_use_image_search = context.scene.import_obj_use_image_search
         self.import_obj_split_mode = context.scene.import_obj_split_mode
         self.import_obj_global_clamp_size = context.scene.import_obj_global_clamp_size
+        self.import_obj_engine = context.scene.import_obj_engine
         #
         self.export_stl_treat_selected_as = context.scene.export_stl_treat_selected_as
 
-    # Returns 'stl_path' after running bpy.ops.export_mesh.stl
-    def export_stl(self, stl_path = None, objects = None):
+    # Returns 'stl_path' after exporting, or reusing a cached export of, 'objects'
+    def export_stl(self, stl_path = None, objects = None, object_triangles = None):
         """
         # Copy/paste-able block
         BLDR = Blender(context)
@@ -147,6 +214,8 @@ class Blender(object):
         # stl_path should be a file path to save object(s) to in STL format
         # object should be either an object or list of objects to export to
         #  file path defined by stl_path
+        # 'object_triangles' may be the output of Blender.return_object_triangles to
+        #  avoid evaluating the same meshes twice.
         # Note this method will not export objects that have the type 'EMPTY'
         #  to avoid causing errors with slicers & repair operations on such objects
         """
@@ -154,24 +223,37 @@ class Blender(object):
             raise Exception('No "stl_path" defined for Blender.export_stl(stl_path="?", objects="?")')
         if objects is None:
             raise Exception('No "object" defined for Blender.export_stl(stl_path="?", objects="?")')
-        # De-select all objects then select target objects
-        bpy.ops.object.select_all(action='DESELECT')
-        objs = []
-        if isinstance(objects, list):
-            for obj in objects:
-                if obj.type != 'EMPTY':
-                    print('## Object name being exported:', obj.name)
-                    obj.select = True
-                    objs += [obj]
-                else:
-                    print('## Skipping selection of object', obj.name, ":", obj.type)
-        elif objects:
-            if objects.type != 'EMPTY':
-                print('## Object name being exported:', objects.name)
-                objects.select = True
-                objs += [objects]
-            else:
-                print('## Scipping selection of object', objects.name, ":", objects.type)
+        if self.export_stl_use_cache:
+            # Hash evaluated geometry first, a matching digest means the file on disk is still good
+            export_cache = self.return_export_cache(directory = os.path.dirname(stl_path))
+            if object_triangles is None:
+                object_triangles = self.return_object_triangles(objects = objects)
+            export_digest = Export_cache.return_digest(object_triangles = object_triangles,
+                export_settings = self.return_export_settings())
+            cached_path = export_cache.return_cached_path(path = stl_path, digest = export_digest)
+            if cached_path:
+                print('# Blender.export_stl reusing cached export:', cached_path)
+                if 'Native' not in self.export_stl_engine:
+                    # Selection & visibility are left as an Operator export would leave them, hit or miss
+                    Blender.hide_exported_objects(objects = self.select_export_objects(objects = objects))
+                return cached_path
+        if 'Native' in self.export_stl_engine:
+            path_exists = self.export_stl_native(stl_path = stl_path, objects = objects, object_triangles = object_triangles)
+        else:
+            path_exists = self.export_stl_operator(stl_path = stl_path, objects = objects)
+        if self.export_stl_use_cache and path_exists:
+            export_cache.store(path = stl_path, digest = export_digest)
+        return path_exists
+
+    # Returns 'stl_path' after running bpy.ops.export_mesh.stl
+    def export_stl_operator(self, stl_path = None, objects = None):
+        """
+        # Copy/paste-able block
+        BLDR = Blender(context)
+        export_stl_output = BLDR.export_stl_operator(stl_path = None, objects = None)
+        # Same inputs & output as Blender.export_stl, exported objects are hidden afterwards
+        """
+        objs = self.select_export_objects(objects = objects)
         if len(objs) >= 1:
             print('## Exporting',objs[0].name)
             if self.blender_version_main is 2 and self.blender_version_sub >= 77:
@@ -216,17 +298,148 @@ class Blender(object):
                     ', ascii =', self.export_stl_ascii,
                     ', use_mesh_modifiers=True)')
         # Hide exported object(s) & return stl_path
-        if isinstance(objs, list):
-            for obj in objs:
-                obj.hide = True
+        Blender.hide_exported_objects(objects = objs)
+        path_exists = Os.path_exists(path = stl_path)
+        return path_exists
+
+    # Returns list of 'objects' that are not of type 'EMPTY' after making them the only selected objects
+    def select_export_objects(self, objects = None):
+        # De-select all objects then select target objects
+        bpy.ops.object.select_all(action='DESELECT')
+        objs = []
+        if isinstance(objects, list):
+            for obj in objects:
+                if obj.type != 'EMPTY':
+                    print('## Object name being exported:', obj.name)
+                    obj.select = True
+                    objs += [obj]
+                else:
+                    print('## Skipping selection of object', obj.name, ":", obj.type)
+        elif objects:
+            if objects.type != 'EMPTY':
+                print('## Object name being exported:', objects.name)
+                objects.select = True
+                objs += [objects]
+            else:
+                print('## Scipping selection of object', objects.name, ":", objects.type)
+        return objs
+
+    # Hides 'objects', as Blender.export_stl_operator does after exporting them
+    @staticmethod
+    def hide_exported_objects(objects = None):
+        for obj in objects:
+            obj.hide = True
+
+    # Returns 'stl_path' after writing evaluated mesh data of 'objects' straight to disk
+    def export_stl_native(self, stl_path = None, objects = None, object_triangles = None):
+        """
+        # Copy/paste-able block
+        BLDR = Blender(context)
+        export_stl_output = BLDR.export_stl_native(stl_path = None, objects = None, object_triangles = None)
+        # Same inputs & output as Blender.export_stl, however, triangles are read in bulk
+        #  from evaluated meshes & written without calling bpy.ops.export_mesh.stl, thus
+        #  selection & visibility of objects are left as they where found.
+        # 'object_triangles' may be the output of Blender.return_object_triangles to
+        #  avoid evaluating the same meshes twice.
+        """
+        if stl_path is None:
+            raise Exception('No "stl_path" defined for Blender.export_stl_native(stl_path="?", objects="?")')
+        if objects is None:
+            raise Exception('No "object" defined for Blender.export_stl_native(stl_path="?", objects="?")')
+        if object_triangles is None:
+            object_triangles = self.return_object_triangles(objects = objects)
+        global_matrix = self.return_export_global_matrix()
+        triangles = []
+        for obj, local_triangles in object_triangles:
+            print('## Object name being exported:', obj.name)
+            object_matrix = global_matrix.dot(Mesh_buffers.return_matrix_array(matrix = obj.matrix_world))
+            triangles += [Mesh_buffers.return_transformed_triangles(triangles = local_triangles, matrix = object_matrix)]
+        if triangles:
+            triangles = np.concatenate(triangles)
+            Mesh_buffers.write_stl(path = stl_path, triangles = triangles, ascii = self.export_stl_ascii)
+            print('# Blender.export_stl_native wrote {0} triangles to: {1}'.format(len(triangles), stl_path))
         path_exists = Os.path_exists(path = stl_path)
         return path_exists
 
+    # Returns a list of (object, object space triangles) pairs, skipping objects of type 'EMPTY'
+    def return_object_triangles(self, objects = None):
+        """
+        # Copy/paste-able block
+        object_triangles = BLDR.return_object_triangles(objects = None)
+        """
+        if objects is None:
+            raise Exception('No "objects" defined for Blender.return_object_triangles(objects="?")')
+        if not isinstance(objects, list):
+            objects = [objects]
+        object_triangles = []
+        for obj in objects:
+            if obj.type == 'EMPTY':
+                print('## Skipping export of object', obj.name, ":", obj.type)
+                continue
+            object_triangles += [(obj, Mesh_buffers.return_triangles(obj = obj, scene = self.scene))]
+        return object_triangles
+
+    # Returns a list of export settings that change the contents of exported STL files
+    def return_export_settings(self):
+        """
+        # Copy/paste-able block
+        export_settings = BLDR.return_export_settings()
+        """
+        return [self.export_stl_engine, self.export_stl_axis_forward, self.export_stl_axis_up,
+            self.export_stl_global_scale, self.export_stl_ascii, self.export_stl_use_scene_unit,
+            self.scene.unit_settings.system, self.scene.unit_settings.scale_length]
+
+    # Returns an Export_cache for 'directory', loading the index from disk only once per instance
+    def return_export_cache(self, directory = None):
+        """
+        # Copy/paste-able block
+        export_cache = BLDR.return_export_cache(directory = self.export_stl_directory)
+        """
+        if directory is None:
+            raise Exception('No "directory" defined for Blender.return_export_cache(directory="?")')
+        export_cache = self.export_caches.get(directory)
+        if export_cache is None:
+            export_cache = Export_cache(directory = directory)
+            self.export_caches[directory] = export_cache
+        return export_cache
+
+    # Returns a 4x4 NumPy array built from export axis, global scale & scene unit settings
+    def return_export_global_matrix(self):
+        """
+        # Copy/paste-able block
+        global_matrix = BLDR.return_export_global_matrix()
+        # Mirrors how io_mesh_stl builds its global matrix so that native exports line up
+        #  with files written by bpy.ops.export_mesh.stl
+        """
+        global_scale = self.export_stl_global_scale
+        if self.export_stl_use_scene_unit and self.scene.unit_settings.system != 'NONE':
+            global_scale *= self.scene.unit_settings.scale_length
+        axis_matrix = axis_conversion(to_forward = self.export_stl_axis_forward, to_up = self.export_stl_axis_up).to_4x4()
+        axis_array = Mesh_buffers.return_matrix_array(matrix = axis_matrix)
+        scale_array = Mesh_buffers.return_matrix_array(matrix = Matrix.Scale(global_scale, 4))
+        return axis_array.dot(scale_array)
+
     # Returns imported object if file path exists else raises an exception
     def import_obj(self, path = None):
         """
         # Copy/paste-able block
+        BLDR = Blender(context)
+        imported_object = BLDR.import_obj(path = '/tmp/Cube_fixed.obj')
+        # Native reads OBJ or STL files straight into a new mesh, Operator uses bpy.ops.import_scene.obj
+        """
+        path_exists = Os.path_exists(path = path)
+        if path_exists is False:
+            raise Exception('Could not find OBJ file at: {0}'.format(path))
+        if 'Native' in self.import_obj_engine:
+            return self.import_obj_native(path = path_exists)
+        return self.import_obj_operator(path = path_exists)
 
+    # Returns object imported by bpy.ops.import_scene.obj, found as the first selected object afterwards
+    def import_obj_operator(self, path = None):
+        """
+        # Copy/paste-able block
+        BLDR = Blender(context)
+        imported_object = BLDR.import_obj_operator(path = '/tmp/Cube_fixed.obj')
         """
         path_exists = Os.path_exists(path = path)
         if path_exists is False:
@@ -248,6 +461,37 @@ class Blender(object):
             latest_selected_obj = bpy.context.selected_objects[0]
             return latest_selected_obj
 
+    # Returns new object holding the mesh read from an OBJ or STL file at 'path', named after the file
+    def import_obj_native(self, path = None):
+        """
+        # Copy/paste-able block
+        BLDR = Blender(context)
+        imported_object = BLDR.import_obj_native(path = '/tmp/Cube_fixed.obj')
+        # Import axis & global clamp size settings are applied the same way as bpy.ops.import_scene.obj,
+        #  without changing selection or going through the operator system
+        """
+        if path is None:
+            raise Exception('No "path" defined for Blender.import_obj_native(path="?")')
+        if path.lower().endswith('.stl'):
+            # Facets share no vertices within STL files, identical float32 coordinates are merged
+            coordinates = Mesh_buffers.read_stl(path = path).reshape(-1, 3).astype(np.float32)
+            unique_keys, first_indices, inverse = np.unique(Mesh_repair.return_row_keys(rows = coordinates.view(np.int32)),
+                return_index = True, return_inverse = True)
+            vertices = coordinates[first_indices].astype(np.float64)
+            faces = inverse.reshape(-1, 3)
+        else:
+            vertices, faces = Mesh_buffers.read_obj(path = path)
+        axis_matrix = axis_conversion(from_forward = self.import_obj_axis_forward, from_up = self.import_obj_axis_up).to_4x4()
+        vertices = vertices.dot(Mesh_buffers.return_matrix_array(matrix = axis_matrix)[:3, :3].T)
+        if self.import_obj_global_clamp_size > 0 and len(vertices):
+            max_axis = (vertices.max(axis = 0) - vertices.min(axis = 0)).max()
+            clamp_scale = 1.0
+            while self.import_obj_global_clamp_size < max_axis * clamp_scale:
+                clamp_scale = clamp_scale / 10.0
+            vertices = vertices * clamp_scale
+        object_name = os.path.splitext(bpy.path.basename(path))[0]
+        return Blender.new_mesh_object(name = object_name, vertices = vertices, faces = faces)
+
     # Returns object after setting 'show_name' & 'show_x_ray' to 'True'
     @staticmethod
     def expose_object_name(object_to_expose = None):
@@ -315,11 +559,90 @@ class Blender(object):
         obj = Blender.new_empty(location=(0, 0, 0))
         # Returns object after making a new empty at specified 'location'
         """
-        bpy.ops.object.add(type='EMPTY', location = location)
-        new_empty_output = bpy.context.active_object
+        new_empty_output = bpy.data.objects.new('Empty', None)
+        new_empty_output.location = location
+        Blender.link_object(obj = new_empty_output)
         print('# Blender.new_empty returning new empty object named:', new_empty_output.name)
         return new_empty_output
 
+    # Returns 'obj' after linking it to the current scene
+    @staticmethod
+    def link_object(obj = None):
+        """
+        # Copy/paste-able block
+        obj = Blender.link_object(obj = bpy.data.objects.new('Cube', mesh))
+        """
+        if obj is None:
+            raise Exception('No object supplied to Blender.link_object(obj = "?")')
+        if bpy.app.version < (2, 80, 0):
+            bpy.context.scene.objects.link(obj)
+        else:
+            bpy.context.scene.collection.objects.link(obj)
+        return obj
+
+    # Removes 'obj' from Blender data after unlinking it from every scene, as versions before 2.78 require
+    @staticmethod
+    def remove_object(obj = None):
+        """
+        # Copy/paste-able block
+        Blender.remove_object(obj = bpy.data.objects.get('Cube.gcode'))
+        """
+        if obj is None:
+            raise Exception('No object supplied to Blender.remove_object(obj = "?")')
+        if bpy.app.version < (2, 78, 0):
+            for scene in bpy.data.scenes:
+                if scene.objects.get(obj.name) is not None:
+                    scene.objects.unlink(obj)
+            bpy.data.objects.remove(obj)
+        else:
+            bpy.data.objects.remove(obj, do_unlink = True)
+
+    # Returns new object named 'name' holding a triangle mesh built from 'vertices' & 'faces', linked to the scene
+    @staticmethod
+    def new_mesh_object(name = None, vertices = None, faces = None):
+        """
+        # Copy/paste-able block
+        obj = Blender.new_mesh_object(name = 'Cube_fixed', vertices = vertices, faces = faces)
+        """
+        if name is None:
+            raise Exception('No name supplied to Blender.new_mesh_object(name = "?")')
+        mesh = Mesh_buffers.new_triangle_mesh(name = name, vertices = vertices, faces = faces)
+        obj = bpy.data.objects.new(name, mesh)
+        Blender.link_object(obj = obj)
+        print('# Blender.new_mesh_object returning object named: {0} with {1} faces'.format(obj.name, len(faces)))
+        return obj
+
+    # Returns object holding an edge mesh of 'toolpaths', replacing any previous preview named 'name'
+    @staticmethod
+    def new_toolpath_object(name = None, toolpaths = None, matrix = None):
+        """
+        # Copy/paste-able block
+        obj = Blender.new_toolpath_object(name = 'Cube.gcode', toolpaths = GA.toolpaths, matrix = None)
+        # 'toolpaths' is a list of (layer_number, segments) as collected by Gcode_analyzer, 'matrix' is
+        #  a 4x4 array mapping Blender to GCode coordinates, such as BLDR.return_export_global_matrix(),
+        #  that is inverted to bring millimeters back into scene units
+        """
+        if name is None or toolpaths is None:
+            raise Exception('Blender.new_toolpath_object needs a name & toolpaths to preview.')
+        old_obj = bpy.data.objects.get(name)
+        if old_obj is not None:
+            old_mesh = old_obj.data
+            Blender.remove_object(obj = old_obj)
+            if old_mesh is not None and old_mesh.users == 0:
+                bpy.data.meshes.remove(old_mesh)
+        if toolpaths:
+            segments = np.concatenate([layer_segments for layer_number, layer_segments in toolpaths])
+        else:
+            segments = np.zeros((0, 2, 3), dtype = np.float32)
+        if matrix is not None:
+            inverse_matrix = np.linalg.inv(matrix)
+            segments = segments.dot(inverse_matrix[:3, :3].T) + inverse_matrix[:3, 3]
+        mesh = Mesh_buffers.new_edge_mesh(name = name, segments = segments)
+        obj = bpy.data.objects.new(name, mesh)
+        Blender.link_object(obj = obj)
+        print('# Blender.new_toolpath_object returning object named: {0} with {1} edges'.format(obj.name, len(segments)))
+        return obj
+
     # Returns object after placing on self.preview_layer
     @staticmethod
     def new_plane(name = None, layers = 1):
@@ -417,11 +740,146 @@ class Blender(object):
         return layers
 
 
+class Command_line(object):
+    """
+    # This class runs add-on operations without the user interface, from arguments following '--'
+    #  on Blender's command line, with settings read from a JSON profile of scene property names
+    #  & values rather than from whatever was last saved within each .blend file.
+    # Example of slicing & uploading two named objects of one file
+    blender -b parts.blend -P print_shortcuts.py -- --profile nightly.json --objects Cube Cone --slice --upload
+    # Example of slicing every object of a collection (group prior to Blender 2.80) in many
+    #  files, four Blender processes at a time
+    blender -b -P print_shortcuts.py -- --blend-files a.blend b.blend c.blend --jobs 4 --collections Parts --slice
+    # Example of a profile
+    {"preferred_local_slicer": "Slic3r", "slic3r_conf_path": "/home/user/printer.ini", "local_slicer_max_jobs": 2}
+    """
+    def __init__(self, argv = None):
+        self.arguments = Command_line.return_parser().parse_args(argv or [])
+        # Instances stand in for bpy.context, other classes only read 'scene' & 'selected_objects'
+        self.scene = bpy.context.scene
+        self.selected_objects = []
+
+    # Returns argparse.ArgumentParser for arguments following '--'
+    @staticmethod
+    def return_parser():
+        parser = argparse.ArgumentParser(prog = 'blender -b file.blend -P print_shortcuts.py --',
+            description = 'Repair, slice & upload objects of .blend files without the user interface')
+        parser.add_argument('--profile', help = 'JSON file of scene property names & values to use as settings')
+        parser.add_argument('--objects', nargs = '+', default = [], help = 'Names of objects to act upon')
+        parser.add_argument('--collections', nargs = '+', default = [], help = 'Names of collections, or groups, of objects to act upon')
+        parser.add_argument('--repair', action = 'store_true', help = 'Repair objects, repaired copies are parented to the repaired parent empty')
+        parser.add_argument('--slice', action = 'store_true', help = 'Slice objects with the preferred local slicer')
+        parser.add_argument('--upload', action = 'store_true', help = 'Upload sliced GCode to the preferred print server')
+        parser.add_argument('--save', action = 'store_true', help = 'Save the .blend file afterwards, such as to keep repaired objects')
+        parser.add_argument('--blend-files', nargs = '+', default = [], help = 'Run the other arguments for each of these files in a separate Blender process')
+        parser.add_argument('--jobs', type = int, default = 0, help = 'Blender processes to run at once with --blend-files, default of 0 is one per CPU')
+        return parser
+
+    # Returns exit code, 0 if every requested operation succeeded
+    def run(self):
+        """
+        # Copy/paste-able block
+        exit_code = Command_line(argv = ['--objects', 'Cube', '--slice']).run()
+        """
+        if self.arguments.blend_files:
+            return self.run_blend_files()
+        if self.arguments.profile:
+            self.apply_profile(profile_path = self.arguments.profile)
+        if self.arguments.upload:
+            self.scene.octoprint_auto_upload_from_slicers = 'OctoPrint' in self.scene.preferred_print_server
+            self.scene.repetier_auto_upload_from_slicers = 'Repetier' in self.scene.preferred_print_server
+        else:
+            self.scene.octoprint_auto_upload_from_slicers = False
+            self.scene.repetier_auto_upload_from_slicers = False
+        # There is nobody to look at a browser
+        self.scene.open_browser_after_upload = False
+        self.selected_objects = self.return_objects()
+        if not self.selected_objects:
+            print('# Command_line found no objects to act upon within: {0}'.format(bpy.data.filepath))
+            return 1
+        exit_code = 0
+        operation_outputs = []
+        if self.arguments.repair:
+            operation_outputs += [Selected_objects(self).repair_through_slic3r(self)]
+        if self.arguments.slice:
+            operation_outputs += [Selected_objects(self).local_slicer(self)]
+        for operation_output in operation_outputs:
+            for info in operation_output.return_output():
+                print(info)
+            if operation_output.error_output or any(operation_output.slice_stl_output):
+                exit_code = 1
+        if self.arguments.save:
+            bpy.ops.wm.save_mainfile()
+        return exit_code
+
+    # Sets scene properties from the JSON object within 'profile_path', unknown property names raise an exception
+    def apply_profile(self, profile_path = None):
+        if not os.path.exists(profile_path):
+            raise Exception('Could not find profile file: {0}'.format(profile_path))
+        with open(profile_path) as profile_file:
+            profile = json.load(profile_file)
+        for key, value in profile.items():
+            if not hasattr(self.scene, key):
+                raise Exception('Unknown setting within profile {0}: {1}'.format(profile_path, key))
+            setattr(self.scene, key, value)
+        print('# Command_line applied {0} settings from profile: {1}'.format(len(profile), profile_path))
+
+    # Returns objects named by --objects & within --collections, or those selected when the file was saved if neither is given
+    def return_objects(self):
+        if not self.arguments.objects and not self.arguments.collections:
+            return list(bpy.context.selected_objects)
+        objects = []
+        for object_name in self.arguments.objects:
+            obj = bpy.data.objects.get(object_name)
+            if obj is None:
+                raise Exception('Could not find object named: {0}'.format(object_name))
+            objects += [obj]
+        for collection_name in self.arguments.collections:
+            if bpy.app.version < (2, 80, 0):
+                collection = bpy.data.groups.get(collection_name)
+            else:
+                collection = bpy.data.collections.get(collection_name)
+            if collection is None:
+                raise Exception('Could not find collection named: {0}'.format(collection_name))
+            collection_objects = collection.objects if bpy.app.version < (2, 80, 0) else collection.all_objects
+            objects += [obj for obj in collection_objects if obj.type == 'MESH' and obj not in objects]
+        return objects
+
+    # Returns exit code after running a Blender process per --blend-files file with the remaining arguments
+    def run_blend_files(self):
+        script_path = os.path.abspath(__file__)
+        child_arguments = self.return_child_arguments()
+        blend_pool = Process_pool(max_jobs = self.arguments.jobs)
+        for blend_file in self.arguments.blend_files:
+            blend_pool.add(command = [bpy.app.binary_path, '-b', blend_file, '-P', script_path, '--'] + child_arguments, name = blend_file)
+        failed_jobs = [job for job in blend_pool.wait() if job['returncode'] != 0]
+        for job in failed_jobs:
+            print('# Command_line failed on: {0} exit code {1}'.format(job['name'], job['returncode']))
+        print('# Command_line finished {0} of {1} .blend files'.format(len(self.arguments.blend_files) - len(failed_jobs), len(self.arguments.blend_files)))
+        return 1 if failed_jobs else 0
+
+    # Returns arguments for each Blender process started by run_blend_files
+    def return_child_arguments(self):
+        child_arguments = []
+        if self.arguments.profile:
+            child_arguments += ['--profile', os.path.abspath(self.arguments.profile)]
+        if self.arguments.objects:
+            child_arguments += ['--objects'] + self.arguments.objects
+        if self.arguments.collections:
+            child_arguments += ['--collections'] + self.arguments.collections
+        for flag in ('repair', 'slice', 'upload', 'save'):
+            if getattr(self.arguments, flag):
+                child_arguments += ['--' + flag]
+        return child_arguments
+
+
 class CuraEngine(object):
     """
     # Short-cuts to CuraEngine slice operations
     """
-    def __init__(self, context = bpy.context):
+    def __init__(self, context = default_context):
+        # Kept for SubProcess, which looks up executable paths
+        self.context = context
         self.selected_objects = context.selected_objects
         self.curaengine_exec_dir = context.scene.curaengine_exec_dir
         self.curaengine_exec_name = context.scene.curaengine_exec_name
@@ -431,6 +889,16 @@ class CuraEngine(object):
         self.curaengine_preview_gcode = context.scene.curaengine_preview_gcode
         #
         self.export_stl_treat_selected_as = context.scene.export_stl_treat_selected_as
+        # Sliced GCode cache, 'None' if disabled
+        self.gcode_cache = None
+        if context.scene.gcode_cache_enabled:
+            self.gcode_cache = Gcode_cache(directory = context.scene.gcode_cache_directory, max_size = context.scene.gcode_cache_max_size)
+        # Local GCode analysis, 'None' if disabled
+        self.gcode_analyzer = None
+        self.gcode_analysis = None
+        if context.scene.gcode_analysis_enabled:
+            self.gcode_analyzer = Gcode_analyzer(filament_diameter = context.scene.gcode_analysis_filament_diameter,
+                acceleration = context.scene.gcode_analysis_acceleration)
 
     def slice_stl(self, stl_path=None, gcode_path=None):
         """
@@ -438,7 +906,42 @@ class CuraEngine(object):
         CE = CuraEngine
         slice_output = slice_stl(stl_path=None, gcode_path=None)
         """
-        SP = SubProcess()
+        SP = SubProcess(context = self.context)
+        args = self.return_slice_ops(stl_path = stl_path, gcode_path = gcode_path)
+        if self.gcode_cache is not None:
+            cache_digest = self.gcode_cache.return_digest(command = [SP.curaengine_exec_path] + args, gcode_path = gcode_path)
+            if self.gcode_cache.fetch(digest = cache_digest, gcode_path = gcode_path):
+                self.analyze_gcode(gcode_path = gcode_path)
+                return 0
+        curaengine_slice_stl_output = SP.curaengine_check_call(ops = args)
+        if self.gcode_cache is not None:
+            self.gcode_cache.store(digest = cache_digest, gcode_path = gcode_path)
+        self.analyze_gcode(gcode_path = gcode_path)
+        # curaengine_slice_stl_output = self.curaengine_exec(ops = args)
+        return curaengine_slice_stl_output
+
+    # Returns analysis of 'gcode_path', also kept as 'gcode_analysis', or 'None' if analysis is disabled
+    def analyze_gcode(self, gcode_path = None):
+        if self.gcode_analyzer is None:
+            return None
+        self.gcode_analysis = self.gcode_analyzer.analyze(gcode_path = gcode_path)
+        print('# {0}: {1}'.format(gcode_path, Gcode_analyzer.return_summary(gcode_analysis = self.gcode_analysis)))
+        return self.gcode_analysis
+
+    # Returns a full command list, executable included, for running CuraEngine through Process_pool
+    def return_slice_command(self, stl_path=None, gcode_path=None):
+        """
+        # Copy/paste-able block
+        CE = CuraEngine(context)
+        command = CE.return_slice_command(stl_path = None, gcode_path = None)
+        """
+        SP = SubProcess(context = self.context)
+        command = [SP.curaengine_exec_path]
+        command.extend(self.return_slice_ops(stl_path = stl_path, gcode_path = gcode_path))
+        return command
+
+    # Returns list of arguments for CuraEngine to slice 'stl_path' into 'gcode_path'
+    def return_slice_ops(self, stl_path=None, gcode_path=None):
         args = []
         if os.path.exists(self.curaengine_conf_path):
             args += ['-j', self.curaengine_conf_path]
@@ -454,9 +957,76 @@ class CuraEngine(object):
         else:
             args += [stl_path]
         args += ['-o', gcode_path]
-        curaengine_slice_stl_output = SP.curaengine_check_call(ops = args)
-        # curaengine_slice_stl_output = self.curaengine_exec(ops = args)
-        return curaengine_slice_stl_output
+        return args
+
+
+class Export_cache(object):
+    """
+    # This class keeps a persistent index of exported STL file paths & digests of what was
+    #  exported to them, so that objects which have not changed since the last export
+    #  can reuse the file already on disk instead of being exported again.
+    # The index is saved as JSON within the export directory, see 'index_name'
+    """
+    index_name = 'export_cache.json'
+
+    def __init__(self, directory = None):
+        if directory is None:
+            raise Exception('No directory supplied to Export_cache(directory = "?")')
+        self.index_path = os.path.join(directory, self.index_name)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path) as index_file:
+                    self.index = json.load(index_file)
+            except ValueError:
+                print('# Export_cache ignoring unreadable index:', self.index_path)
+
+    # Returns a hex digest of evaluated geometry, world transforms, modifier stacks & export settings
+    @staticmethod
+    def return_digest(object_triangles = None, export_settings = None):
+        """
+        # Copy/paste-able block
+        export_digest = Export_cache.return_digest(object_triangles = BLDR.return_object_triangles(objects = obj),
+            export_settings = BLDR.return_export_settings())
+        """
+        if object_triangles is None:
+            raise Exception('No object_triangles supplied to Export_cache.return_digest(object_triangles = "?")')
+        digest = hashlib.sha1()
+        digest.update(json.dumps(export_settings).encode('utf-8'))
+        for obj, triangles in object_triangles:
+            modifier_stack = [[m.name, m.type, m.show_viewport] for m in obj.modifiers]
+            digest.update(json.dumps(modifier_stack).encode('utf-8'))
+            digest.update(Mesh_buffers.return_matrix_array(matrix = obj.matrix_world).tobytes())
+            digest.update(np.ascontiguousarray(triangles).tobytes())
+        return digest.hexdigest()
+
+    # Returns 'path' if it exists with the same 'digest' & size it was stored with, else 'False'
+    def return_cached_path(self, path = None, digest = None):
+        """
+        # Copy/paste-able block
+        cached_path = export_cache.return_cached_path(path = stl_path, digest = export_digest)
+        """
+        entry = self.index.get(path)
+        if entry is None or entry.get('digest') != digest:
+            return False
+        if not os.path.exists(path) or os.path.getsize(path) != entry.get('size'):
+            return False
+        return path
+
+    # Records 'digest' for the file at 'path' & saves the index to disk
+    def store(self, path = None, digest = None):
+        """
+        # Copy/paste-able block
+        export_cache.store(path = stl_path, digest = export_digest)
+        """
+        if path is None or digest is None:
+            raise Exception('Export_cache.store requires both path & digest')
+        self.index[path] = {'digest': digest, 'size': os.path.getsize(path)}
+        temp_index_path = self.index_path + '.tmp'
+        with open(temp_index_path, 'w') as index_file:
+            json.dump(self.index, index_file)
+        os.replace(temp_index_path, self.index_path)
+        return path
 
 
 class Formatted_output(object):
@@ -488,8 +1058,16 @@ class Formatted_output(object):
     blender_imported_objects = []
     blender_imported_texts = []
     slic3r_repair_stl_output = []
+    mesh_check_output = []
+    mesh_repair_output = []
     slice_stl_output = []
+    slice_job_output = []
+    gcode_analysis_output = []
+    gcode_preview_output = []
+    upload_output = []
+    error_output = []
     curaengine_slice_stl_output = []
+    farm_output = []
     mkdir_output = []
     rm_file_output = []
     curl_ops = []
@@ -497,6 +1075,9 @@ class Formatted_output(object):
     octoprint_folders = []
     octoprint_machinecode_files = []
     octoprint_model_files = []
+    # Timing spans of this run, see Tracer, and the summary table of them
+    tracer = None
+    timing_output = []
 
     # Returns a list of formated output for calling operations to loop over for printing info to user interface
     def return_output(self):
@@ -513,6 +1094,18 @@ class Formatted_output(object):
         blender_export_stl_output = self.return_formated_list(output_header = 'Exported', parsabel_output = self.blender_export_stl_output)
         if blender_export_stl_output:
             output_list.extend(blender_export_stl_output)
+        mesh_check_output = self.return_formated_list(output_header = 'Checked', parsabel_output = self.mesh_check_output)
+        if mesh_check_output:
+            output_list.extend(mesh_check_output)
+        mesh_repair_output = self.return_formated_list(output_header = 'Repaired', parsabel_output = self.mesh_repair_output)
+        if mesh_repair_output:
+            output_list.extend(mesh_repair_output)
+        slice_job_output = self.return_formated_list(output_header = 'Sliced', parsabel_output = self.slice_job_output)
+        if slice_job_output:
+            output_list.extend(slice_job_output)
+        gcode_analysis_output = self.return_formated_list(output_header = 'Analysed', parsabel_output = self.gcode_analysis_output)
+        if gcode_analysis_output:
+            output_list.extend(gcode_analysis_output)
         blender_import_obj_output = self.return_formated_list(output_header = 'Imported OBJ file', parsabel_output = self.blender_import_obj_output)
         if blender_import_obj_output:
             output_list.extend(blender_import_obj_output)
@@ -522,15 +1115,30 @@ class Formatted_output(object):
                     output_list += ['# Imported object name: {0}'.format(o.name)]
         elif self.blender_imported_objects:
             output_list += ['# Imported object name: {0}'.format(self.blender_imported_objects.name)]
+        gcode_preview_output = self.return_formated_list(output_header = 'Previewed toolpaths', parsabel_output = self.gcode_preview_output)
+        if gcode_preview_output:
+            output_list.extend(gcode_preview_output)
         if isinstance(self.blender_imported_texts, list):
             for i in self.blender_imported_texts:
                 if i:
                     output_list += ['# Imported text file: {0}'.format(i.name)]
         elif self.blender_imported_texts:
             output_list += ['# Imported text file: {0}'.format(self.blender_imported_texts.name)]
+        upload_output = self.return_formated_list(output_header = 'Uploaded', parsabel_output = self.upload_output)
+        if upload_output:
+            output_list.extend(upload_output)
+        farm_output = self.return_formated_list(output_header = 'Farm', parsabel_output = self.farm_output)
+        if farm_output:
+            output_list.extend(farm_output)
+        error_output = self.return_formated_list(output_header = 'Error', parsabel_output = self.error_output)
+        if error_output:
+            output_list.extend(error_output)
         rm_file_output = self.return_formated_list(output_header = 'Removed temporary file', parsabel_output = self.rm_file_output)
         if rm_file_output:
             output_list.extend(rm_file_output)
+        timing_output = self.return_formated_list(output_header = 'Timing', parsabel_output = self.timing_output)
+        if timing_output:
+            output_list.extend(timing_output)
         return output_list
 
     # Returns a list or None
@@ -555,11 +1163,1584 @@ class Formatted_output(object):
         return output_list
 
 
+class Gcode_analyzer(object):
+    """
+    # This class estimates print time, filament use per tool, printing area & layer count of a
+    #  GCode file locally in a single streaming pass, so statistics are available for any print
+    #  server (or none) as soon as a slicer finishes. Files are read in 'chunk_size' mega-byte
+    #  chunks, the bytes of each are parsed into X, Y, Z, E, F, I, J & R columns & moves summed
+    #  with numpy rather than line by line. G2 & G3 arcs are measured along the arc.
+    # Print time accounts for acceleration by treating each move as a trapezoid or triangle
+    #  speed profile starting & ending at rest, at 'acceleration' mm/s^2.
+    # Example of analysing sliced GCode, output keys follow OctoPrint's 'gcodeAnalysis'
+    GA = Gcode_analyzer(filament_diameter = 1.75, acceleration = 1500)
+    gcode_analysis = GA.analyze(gcode_path = '/tmp/Cube.gcode')
+    print(Gcode_analyzer.return_summary(gcode_analysis = gcode_analysis))
+    # Example of also collecting extruding moves of layers 1 to 10 for a preview, at most
+    #  2000 segments per layer, found as a list of (layer_number, segments) within 'toolpaths'
+    GA = Gcode_analyzer(toolpath_layers = (1, 10), toolpath_budget = 2000)
+    gcode_analysis = GA.analyze(gcode_path = '/tmp/Cube.gcode')
+    obj = Blender.new_toolpath_object(name = 'Cube.gcode', toolpaths = GA.toolpaths)
+    """
+    comment_pattern = re.compile(rb';[^\n]*')
+    indent_pattern = re.compile(rb'\n[ \t]+')
+    # Line numbers & checksums as sent by hosts that check for transmission errors, eg. 'N5 G1 X20 E7*33'
+    line_number_pattern = re.compile(rb'\nN-?\d+[ \t]*')
+    checksum_pattern = re.compile(rb'\*\d*')
+    word_axes = b'XYZEFIJR'
+    diameter_pattern = re.compile(rb';\s*filament_diameter\s*=\s*([0-9.]+)', re.I)
+    # Bytes that make up numbers & powers of ten for digit places up to 'max_places' either side of a dot
+    number_bytes = np.zeros(256, dtype = bool)
+    number_bytes[np.frombuffer(b'0123456789.-+', dtype = np.uint8)] = True
+    max_places = 24
+    powers = 10.0 ** np.arange(-max_places, max_places + 1)
+
+    def __init__(self, filament_diameter = 1.75, acceleration = 1500, chunk_size = 4, toolpath_layers = None, toolpath_budget = 0):
+        self.filament_diameter = filament_diameter
+        self.acceleration = acceleration
+        self.chunk_bytes = chunk_size * 1024 * 1024
+        # First & last layer, counted from 1, to collect extruding moves of, a last layer of 0 means all
+        self.toolpath_layers = toolpath_layers
+        # Segments to keep per layer, 0 keeps all
+        self.toolpath_budget = toolpath_budget
+        self.toolpaths = []
+
+    # Returns dictionary of statistics for 'gcode_path' after reading it once from start to end
+    def analyze(self, gcode_path = None):
+        """
+        # Copy/paste-able block
+        gcode_analysis = GA.analyze(gcode_path = '/tmp/Cube.gcode')
+        # Diameter from a '; filament_diameter = ' comment, as Slic3r writes, takes precedence over 'filament_diameter'
+        """
+        if gcode_path is None:
+            raise Exception('No gcode_path supplied to Gcode_analyzer.analyze(gcode_path = "?")')
+        self.position = np.zeros(4)
+        self.feedrate = 1500.0
+        self.relative_xyz = False
+        self.relative_e = False
+        self.tool = 0
+        self.print_time = 0.0
+        self.filament = {}
+        self.minimums = np.full(3, np.inf)
+        self.maximums = np.full(3, -np.inf)
+        self.layer_heights = set()
+        self.diameter = self.filament_diameter
+        # Layers are counted each time extrusion happens above the highest layer so far
+        self.layer_number = 0
+        self.layer_z = -np.inf
+        self.toolpaths = []
+        self.pending_toolpaths = []
+        leftover = b''
+        with open(gcode_path, 'rb') as gcode_file:
+            while True:
+                chunk = gcode_file.read(self.chunk_bytes)
+                if not chunk:
+                    break
+                chunk = leftover + chunk
+                last_newline = chunk.rfind(b'\n')
+                if last_newline < 0:
+                    leftover = chunk
+                    continue
+                leftover = chunk[last_newline + 1:]
+                self.analyze_chunk(chunk = chunk[:last_newline + 1])
+        if leftover:
+            self.analyze_chunk(chunk = leftover + b'\n')
+        self.finish_toolpaths()
+        return self.return_analysis()
+
+    # Updates running totals with every command found within 'chunk', which must end on a new line
+    def analyze_chunk(self, chunk = None):
+        if b'filament_diameter' in chunk:
+            self.diameter = float(self.diameter_pattern.findall(chunk)[-1])
+        if b';' in chunk:
+            chunk = self.comment_pattern.sub(b'', chunk)
+        if b'\n ' in chunk or b'\n\t' in chunk:
+            chunk = self.indent_pattern.sub(b'\n', chunk)
+        chunk = (b'\n' + chunk).upper()
+        if b'*' in chunk:
+            chunk = self.checksum_pattern.sub(b'', chunk)
+        if b'\nN' in chunk:
+            chunk = self.line_number_pattern.sub(b'\n', chunk)
+        chunk_bytes = np.frombuffer(chunk, dtype = np.uint8)
+        line_ends = np.flatnonzero(chunk_bytes == ord('\n'))[1:]
+        line_starts = np.concatenate(([1], line_ends[:-1] + 1))
+        letters = chunk_bytes[line_starts]
+        command_lines = np.flatnonzero(np.isin(letters, np.frombuffer(b'GMT', dtype = np.uint8)))
+        if not len(command_lines):
+            return
+        letters = letters[command_lines]
+        word_starts, word_numbers = self.return_numbers(chunk_bytes = chunk_bytes)
+        # Command numbers follow the letter at the start of each line
+        word_indexes = np.minimum(np.searchsorted(word_starts, line_starts[command_lines] + 1), len(word_starts) - 1)
+        numbers = np.where(word_starts[word_indexes] == line_starts[command_lines] + 1, word_numbers[word_indexes], np.nan)
+        # Row of each line within 'values', lines without a command are left out
+        rows = np.full(len(line_starts), -1)
+        rows[command_lines] = np.arange(len(command_lines))
+        word_rows = rows[np.searchsorted(line_ends, word_starts)]
+        word_letters = chunk_bytes[word_starts - 1]
+        values = np.full((len(command_lines), len(self.word_axes)), np.nan)
+        for column, axis in enumerate(self.word_axes):
+            found = (word_letters == axis) & (word_rows >= 0)
+            values[word_rows[found], column] = word_numbers[found]
+        is_move = (letters == ord('G')) & np.isin(numbers, (0, 1, 2, 3))
+        is_set = (letters == ord('G')) & (numbers == 92)
+        values[~(is_move | is_set)] = np.nan
+        values[is_set, 4:] = np.nan
+        # 2 for clockwise & 3 for counter-clockwise arcs, 0 for straight moves
+        arc_directions = np.where(is_move & (numbers >= 2), numbers, 0)
+        # Modes, homing, dwells & tool changes are rare, moves between them are summed as one run
+        is_state = (((letters == ord('G')) & np.isin(numbers, (4, 28, 90, 91))) |
+            ((letters == ord('M')) & np.isin(numbers, (82, 83))) | (letters == ord('T')))
+        run_start = 0
+        for row in np.flatnonzero(is_state):
+            if row > run_start:
+                self.analyze_moves(values = values[run_start:row], is_set = is_set[run_start:row],
+                    arc_directions = arc_directions[run_start:row])
+            line = command_lines[row]
+            self.apply_state(code = chunk[line_starts[line]:line_ends[line]].split()[0],
+                args = chunk[line_starts[line]:line_ends[line]])
+            run_start = row + 1
+        if run_start < len(command_lines):
+            self.analyze_moves(values = values[run_start:], is_set = is_set[run_start:], arc_directions = arc_directions[run_start:])
+
+    # Returns (word_starts, word_numbers) arrays holding where each number within 'chunk_bytes' starts & its value
+    def return_numbers(self, chunk_bytes = None):
+        is_number = self.number_bytes[chunk_bytes]
+        is_number[0] = False
+        number_indexes = np.flatnonzero(is_number).astype(np.int32)
+        if not len(number_indexes):
+            return number_indexes, np.zeros(0)
+        # Consecutive number bytes make up one word, 'offsets' are where each word begins within 'number_indexes'
+        breaks = np.diff(number_indexes) != 1
+        offsets = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+        word_ids = np.cumsum(np.concatenate(([False], breaks)), dtype = np.int32)
+        characters = chunk_bytes[number_indexes]
+        digits = characters - np.uint8(ord('0'))
+        is_digit = digits < 10
+        is_dot = characters == ord('.')
+        # Place of each digit relative to the dot of its word, or to the word end if there is no dot
+        dots = np.append(number_indexes[offsets[1:] - 1], number_indexes[-1]) + 1
+        dots[word_ids[is_dot]] = number_indexes[is_dot]
+        places = dots[word_ids]
+        places -= number_indexes
+        places -= is_digit & (places > 0)
+        np.clip(places, -self.max_places, self.max_places, out = places)
+        terms = self.powers[places + self.max_places]
+        terms *= digits
+        terms[~is_digit] = 0.0
+        word_numbers = np.add.reduceat(terms, offsets)
+        word_numbers[characters[offsets] == ord('-')] *= -1.0
+        word_numbers[~np.logical_or.reduceat(is_digit, offsets)] = np.nan
+        return number_indexes[offsets], word_numbers
+
+    # Updates running totals from 'values' rows of X, Y, Z, E, F, I, J & R words, 'is_set' rows are G92 position resets
+    def analyze_moves(self, values = None, is_set = None, arc_directions = None):
+        row_count = len(values)
+        positions = np.empty((row_count + 1, 4))
+        positions[0] = self.position
+        for column in range(4):
+            relative = self.relative_e if column == 3 else self.relative_xyz
+            column_values = values[:, column]
+            if relative:
+                deltas = np.where(np.isnan(column_values) | is_set, 0.0, column_values)
+                positions[1:, column] = self.position[column] + np.cumsum(deltas)
+            else:
+                positions[1:, column] = self.return_filled(values = column_values, start = self.position[column])
+        feedrates = self.return_filled(values = values[:, 4], start = self.feedrate)
+        deltas = np.diff(positions, axis = 0)
+        deltas[is_set] = 0.0
+        distances = np.sqrt((deltas[:, :3] ** 2).sum(axis = 1))
+        is_arc = arc_directions > 0
+        if is_arc.any():
+            arc_points = self.measure_arcs(values = values[is_arc], starts = positions[:-1][is_arc],
+                ends = positions[1:][is_arc], deltas = deltas[is_arc], arc_directions = arc_directions[is_arc],
+                distances = distances, is_arc = is_arc)
+        # Extrude or retract only moves still take time
+        travels = np.where(distances > 0, distances, np.abs(deltas[:, 3]))
+        speeds = np.maximum(feedrates / 60.0, 0.01)
+        cruising = travels >= speeds ** 2 / self.acceleration
+        self.print_time += float(np.where(cruising, travels / speeds + speeds / self.acceleration,
+            2.0 * np.sqrt(travels / self.acceleration)).sum())
+        tool_name = 'tool{0}'.format(self.tool)
+        self.filament[tool_name] = self.filament.get(tool_name, 0.0) + float(deltas[:, 3].sum())
+        extruding = (deltas[:, 3] > 0) & (distances > 0)
+        if extruding.any():
+            extruded_points = np.concatenate((positions[:-1][extruding, :3], positions[1:][extruding, :3]))
+            if is_arc.any():
+                # Arcs bulge past their end points wherever they cross an axis through their centre
+                extruded_points = np.concatenate((extruded_points, arc_points[extruding[is_arc]].reshape(-1, 3)))
+                extruded_points = extruded_points[np.isfinite(extruded_points).all(axis = 1)]
+            self.minimums = np.minimum(self.minimums, extruded_points.min(axis = 0))
+            self.maximums = np.maximum(self.maximums, extruded_points.max(axis = 0))
+            self.layer_heights.update(np.unique(np.round(positions[1:][extruding, 2], 4)).tolist())
+            highest_z = np.maximum.accumulate(np.concatenate(([self.layer_z], positions[1:][extruding, 2])))
+            layer_numbers = self.layer_number + np.cumsum(np.diff(highest_z) > 1e-6)
+            self.layer_z = highest_z[-1]
+            self.layer_number = int(layer_numbers[-1])
+            if self.toolpath_layers is not None:
+                first_layer, last_layer = self.toolpath_layers
+                wanted = layer_numbers >= first_layer
+                if last_layer:
+                    wanted &= layer_numbers <= last_layer
+                if wanted.any():
+                    self.pending_toolpaths.append((layer_numbers[wanted],
+                        positions[:-1][extruding, :3][wanted], positions[1:][extruding, :3][wanted]))
+                self.finish_toolpaths(before_layer = self.layer_number)
+        self.position = positions[-1].copy()
+        self.feedrate = float(feedrates[-1])
+
+    # Returns (N, 4, 3) array of points where each arc crosses the axes through its centre, 'nan' where it does not,
+    #  after replacing straight line 'distances' of 'is_arc' rows with lengths along the arcs
+    def measure_arcs(self, values = None, starts = None, ends = None, deltas = None, arc_directions = None, distances = None, is_arc = None):
+        offsets = np.nan_to_num(values[:, 5:7])
+        radii = values[:, 7]
+        chords = np.sqrt((deltas[:, :2] ** 2).sum(axis = 1))
+        # Arcs given by R have their centre on the side of the chord that matches direction & sign of R
+        by_radius = ~np.isnan(radii) & np.all(offsets == 0.0, axis = 1)
+        if by_radius.any():
+            radius = np.maximum(np.abs(radii[by_radius]), chords[by_radius] / 2.0)
+            rise = np.sqrt(np.maximum(radius ** 2 - (chords[by_radius] / 2.0) ** 2, 0.0))
+            side = np.where(arc_directions[by_radius] == 2, -1.0, 1.0) * np.where(radii[by_radius] < 0, -1.0, 1.0)
+            normals = np.stack((-deltas[by_radius, 1], deltas[by_radius, 0]), axis = 1) / np.maximum(chords[by_radius], 1e-9)[:, None]
+            offsets[by_radius] = deltas[by_radius, :2] / 2.0 + normals * (side * rise)[:, None]
+        centres = starts[:, :2] + offsets
+        arc_radii = np.sqrt((offsets ** 2).sum(axis = 1))
+        start_angles = np.arctan2(-offsets[:, 1], -offsets[:, 0])
+        end_angles = np.arctan2(ends[:, 1] - centres[:, 1], ends[:, 0] - centres[:, 0])
+        clockwise = arc_directions == 2
+        sweeps = np.where(clockwise, start_angles - end_angles, end_angles - start_angles) % (2.0 * math.pi)
+        # Ending where it started is a full circle
+        sweeps[sweeps < 1e-9] = 2.0 * math.pi
+        distances[is_arc] = np.sqrt((arc_radii * sweeps) ** 2 + deltas[:, 2] ** 2)
+        axis_angles = np.arange(4) * (math.pi / 2.0)
+        crossed = np.where(clockwise[:, None], start_angles[:, None] - axis_angles, axis_angles - start_angles[:, None]) % (2.0 * math.pi)
+        crossed = crossed <= sweeps[:, None]
+        arc_points = np.empty((len(starts), 4, 3))
+        arc_points[:, :, 0] = centres[:, :1] + arc_radii[:, None] * np.cos(axis_angles)
+        arc_points[:, :, 1] = centres[:, 1:] + arc_radii[:, None] * np.sin(axis_angles)
+        arc_points[:, :, 2] = starts[:, 2:3]
+        arc_points[~crossed] = np.nan
+        return arc_points
+
+    # Moves collected segments of layers below 'before_layer', or of all layers, decimated into 'toolpaths'
+    def finish_toolpaths(self, before_layer = None):
+        if not self.pending_toolpaths:
+            return
+        layer_numbers = np.concatenate([pending[0] for pending in self.pending_toolpaths])
+        if before_layer is not None and layer_numbers[0] >= before_layer:
+            return
+        starts = np.concatenate([pending[1] for pending in self.pending_toolpaths])
+        ends = np.concatenate([pending[2] for pending in self.pending_toolpaths])
+        finished = np.ones(len(layer_numbers), dtype = bool)
+        if before_layer is not None:
+            finished = layer_numbers < before_layer
+        for layer_number in np.unique(layer_numbers[finished]):
+            in_layer = layer_numbers == layer_number
+            segments = self.return_decimated_segments(starts = starts[in_layer], ends = ends[in_layer], budget = self.toolpath_budget)
+            self.toolpaths.append((int(layer_number), segments))
+        self.pending_toolpaths = []
+        if not finished.all():
+            self.pending_toolpaths.append((layer_numbers[~finished], starts[~finished], ends[~finished]))
+
+    # Returns (N, 2, 3) float32 array of at most 'budget' segments tracing the paths from 'starts' to 'ends'
+    @staticmethod
+    def return_decimated_segments(starts = None, ends = None, budget = 0):
+        """
+        # Copy/paste-able block
+        segments = Gcode_analyzer.return_decimated_segments(starts = starts, ends = ends, budget = 2000)
+        # Connected moves are thinned by skipping vertices so outlines keep their shape, if that
+        #  is not enough, such as for many short disconnected moves, evenly spaced segments are kept
+        """
+        segment_count = len(starts)
+        if budget and segment_count > budget:
+            stride = -(-segment_count // budget)
+            # A path begins wherever a move does not start where the previous one ended
+            path_breaks = np.ones(segment_count, dtype = bool)
+            path_breaks[1:] = np.any(starts[1:] != ends[:-1], axis = 1)
+            path_ids = np.cumsum(path_breaks) - 1
+            path_starts = starts[path_breaks]
+            keep = np.append(path_breaks[1:], True) | (np.arange(segment_count) % stride == stride - 1)
+            kept = np.flatnonzero(keep)
+            previous = np.concatenate(([kept[0]], kept[:-1]))
+            same_path = (path_ids[previous] == path_ids[kept]) & (previous != kept)
+            starts = np.where(same_path[:, None], ends[previous], path_starts[path_ids[kept]])
+            ends = ends[kept]
+            if len(kept) > budget:
+                evenly_spaced = np.linspace(0, len(kept) - 1, budget).astype(np.int64)
+                starts = starts[evenly_spaced]
+                ends = ends[evenly_spaced]
+        return np.stack((starts, ends), axis = 1).astype(np.float32)
+
+    # Applies a mode change, homing, dwell or tool change from 'code' & its 'args'
+    def apply_state(self, code = None, args = None):
+        if code == b'G90':
+            self.relative_xyz = False
+            self.relative_e = False
+        elif code == b'G91':
+            self.relative_xyz = True
+            self.relative_e = True
+        elif code == b'M82':
+            self.relative_e = False
+        elif code == b'M83':
+            self.relative_e = True
+        elif code == b'G28':
+            homed_axes = [column for column, axis in enumerate((b'X', b'Y', b'Z')) if axis in args]
+            for column in homed_axes or (0, 1, 2):
+                self.position[column] = 0.0
+        elif code == b'G4':
+            dwell = re.search(rb'([PS])(\d*\.?\d+)', args)
+            if dwell:
+                self.print_time += float(dwell.group(2)) / (1000.0 if dwell.group(1) == b'P' else 1.0)
+        elif code.startswith(b'T'):
+            tool_number = re.match(rb'T(\d+)$', code)
+            if tool_number:
+                self.tool = int(tool_number.group(1))
+            else:
+                print('# Gcode_analyzer ignoring malformed tool change:', code)
+
+    # Returns copy of 'values' with each 'nan' replaced by the last number before it, or 'start'
+    @staticmethod
+    def return_filled(values = None, start = 0.0):
+        filled = np.concatenate(([start], values))
+        indexes = np.where(np.isnan(filled), 0, np.arange(len(filled)))
+        np.maximum.accumulate(indexes, out = indexes)
+        return filled[indexes][1:]
+
+    # Returns dictionary shaped like OctoPrint's 'gcodeAnalysis' plus 'layerCount'
+    def return_analysis(self):
+        area = math.pi * (self.diameter / 2.0) ** 2
+        filament = {}
+        for tool_name, length in sorted(self.filament.items()):
+            filament[tool_name] = {'length': length, 'volume': length * area / 1000.0}
+        if np.isfinite(self.minimums).all():
+            minimums = self.minimums.tolist()
+            maximums = self.maximums.tolist()
+        else:
+            minimums = [0.0, 0.0, 0.0]
+            maximums = [0.0, 0.0, 0.0]
+        gcode_analysis = {
+            'estimatedPrintTime': self.print_time,
+            'filament': filament,
+            'printingArea': {
+                'minX': minimums[0], 'maxX': maximums[0],
+                'minY': minimums[1], 'maxY': maximums[1],
+                'minZ': minimums[2], 'maxZ': maximums[2]},
+            'dimensions': {
+                'width': maximums[0] - minimums[0],
+                'depth': maximums[1] - minimums[1],
+                'height': maximums[2] - minimums[2]},
+            'layerCount': len(self.layer_heights)}
+        return gcode_analysis
+
+    # Returns one line of text describing 'gcode_analysis' for reports
+    @staticmethod
+    def return_summary(gcode_analysis = None):
+        """
+        # Copy/paste-able block
+        summary = Gcode_analyzer.return_summary(gcode_analysis = gcode_analysis)
+        # Example output
+        1h 2m 3s, tool0 1234.5mm (2.97cm3), 120 layers, 40.0 x 40.0 x 12.0mm
+        """
+        minutes, seconds = divmod(int(round(gcode_analysis['estimatedPrintTime'])), 60)
+        hours, minutes = divmod(minutes, 60)
+        summary = ['{0}h {1}m {2}s'.format(hours, minutes, seconds)]
+        for tool_name, tool_filament in sorted(gcode_analysis['filament'].items()):
+            summary += ['{0} {1:.1f}mm ({2:.2f}cm3)'.format(tool_name, tool_filament['length'], tool_filament['volume'])]
+        summary += ['{0} layers'.format(gcode_analysis['layerCount'])]
+        dimensions = gcode_analysis['dimensions']
+        summary += ['{0:.1f} x {1:.1f} x {2:.1f}mm'.format(dimensions['width'], dimensions['depth'], dimensions['height'])]
+        return ', '.join(summary)
+
+
+class Gcode_cache(object):
+    """
+    # This class is a content addressed store of sliced GCode files, keyed by a digest of the
+    #  slicer command where any argument that is a file (STL, config, post processing script
+    #  & the slicer executable itself) is replaced by a digest of its contents, plus the output
+    #  of the slicer's '--version' option. Files are named '<digest>.gcode' within 'directory',
+    #  modification times double as last use times for least recently used eviction once the
+    #  total size passes 'max_size' mega-bytes.
+    # Example of wrapping a slicer call
+    gcode_cache = Gcode_cache(directory = '/tmp/gcode_cache', max_size = 1024)
+    cache_digest = gcode_cache.return_digest(command = command, gcode_path = gcode_path)
+    if not gcode_cache.fetch(digest = cache_digest, gcode_path = gcode_path):
+        subprocess.check_call(command)
+        gcode_cache.store(digest = cache_digest, gcode_path = gcode_path)
+    """
+    # Digests are kept between instances, keyed by path, size & modification time or by executable
+    file_digests = {}
+    version_digests = {}
+
+    def __init__(self, directory = None, max_size = 1024):
+        if not directory:
+            raise Exception('No directory supplied to Gcode_cache(directory = "?")')
+        self.directory = directory
+        self.max_bytes = max_size * 1024 * 1024
+        Os.mkdir(path = directory)
+
+    # Returns hex digest of file contents at 'path', rehashing only if size or modification time changed
+    @staticmethod
+    def return_file_digest(path = None):
+        """
+        # Copy/paste-able block
+        file_digest = Gcode_cache.return_file_digest(path = '/tmp/Cube.stl')
+        """
+        if path is None:
+            raise Exception('No path supplied to Gcode_cache.return_file_digest(path = "?")')
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime)
+        file_digest = Gcode_cache.file_digests.get(key)
+        if file_digest is None:
+            digest = hashlib.sha1()
+            with open(path, 'rb') as opened_file:
+                for chunk in iter(lambda: opened_file.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            file_digest = digest.hexdigest()
+            Gcode_cache.file_digests[key] = file_digest
+        return file_digest
+
+    # Returns hex digest of what 'exec_path --version' prints, run only once per executable
+    @staticmethod
+    def return_version_digest(exec_path = None):
+        """
+        # Copy/paste-able block
+        version_digest = Gcode_cache.return_version_digest(exec_path = 'slic3r')
+        """
+        if exec_path is None:
+            raise Exception('No exec_path supplied to Gcode_cache.return_version_digest(exec_path = "?")')
+        version_digest = Gcode_cache.version_digests.get(exec_path)
+        if version_digest is None:
+            try:
+                process = subprocess.Popen([exec_path, '--version'], stdout = subprocess.PIPE, stderr = subprocess.STDOUT)
+            except OSError as error:
+                version_output = str(error).encode('utf-8')
+            else:
+                try:
+                    version_output = process.communicate(timeout = 15)[0]
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    version_output = process.communicate()[0]
+            version_digest = hashlib.sha1(version_output).hexdigest()
+            Gcode_cache.version_digests[exec_path] = version_digest
+        return version_digest
+
+    # Returns hex digest of 'command' with file arguments replaced by digests of their contents
+    def return_digest(self, command = None, gcode_path = None):
+        """
+        # Copy/paste-able block
+        cache_digest = gcode_cache.return_digest(command = SLCR.return_slice_command(stl_path = stl_path, gcode_path = gcode_path), gcode_path = gcode_path)
+        # 'gcode_path' is left out of the digest so cached files may be reused under other names
+        """
+        if not command:
+            raise Exception('No command supplied to Gcode_cache.return_digest(command = "?")')
+        digest = hashlib.sha1()
+        digest.update(self.return_version_digest(exec_path = command[0]).encode('utf-8'))
+        exec_path = shutil.which(command[0]) or command[0]
+        for arg in [exec_path] + list(command[1:]):
+            if arg == gcode_path:
+                digest.update(b'<output>')
+            elif os.path.isfile(arg):
+                digest.update(self.return_file_digest(path = arg).encode('utf-8'))
+            else:
+                digest.update(arg.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    # Returns 'gcode_path' after copying a cached file for 'digest' to it, else returns 'False'
+    def fetch(self, digest = None, gcode_path = None):
+        """
+        # Copy/paste-able block
+        cached_path = gcode_cache.fetch(digest = cache_digest, gcode_path = gcode_path)
+        """
+        cached_path = os.path.join(self.directory, digest + '.gcode')
+        if not os.path.exists(cached_path):
+            return False
+        # Touching the cached file marks it as recently used
+        os.utime(cached_path, None)
+        shutil.copyfile(cached_path, gcode_path)
+        print('# Gcode_cache.fetch copied cached GCode {0} to: {1}'.format(cached_path, gcode_path))
+        return gcode_path
+
+    # Returns path of cached copy after storing 'gcode_path' under 'digest' & evicting old files
+    def store(self, digest = None, gcode_path = None):
+        """
+        # Copy/paste-able block
+        cached_path = gcode_cache.store(digest = cache_digest, gcode_path = gcode_path)
+        """
+        if not os.path.exists(gcode_path):
+            return False
+        cached_path = os.path.join(self.directory, digest + '.gcode')
+        temp_path = cached_path + '.tmp'
+        shutil.copyfile(gcode_path, temp_path)
+        os.replace(temp_path, cached_path)
+        self.evict()
+        return cached_path
+
+    # Returns list of removed file paths after deleting least recently used files until under 'max_bytes'
+    def evict(self):
+        cached_files = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith('.gcode'):
+                file_stat = os.stat(os.path.join(self.directory, file_name))
+                cached_files += [(file_stat.st_mtime, file_stat.st_size, os.path.join(self.directory, file_name))]
+        total_bytes = sum(cached_file[1] for cached_file in cached_files)
+        removed_paths = []
+        for mtime, size, path in sorted(cached_files):
+            if total_bytes <= self.max_bytes:
+                break
+            os.remove(path)
+            total_bytes -= size
+            removed_paths += [path]
+        if removed_paths:
+            print('# Gcode_cache.evict removed: {0}'.format(removed_paths))
+        return removed_paths
+
+
+class Http_client(object):
+    """
+    # This class replaces spawning a curl process per server request with keep-alive HTTP(S)
+    #  connections held in per-host pools, shared between instances & threads, so that many
+    #  uploads to the same server pay for TCP & TLS set-up once. When a new connection to a
+    #  host has to be opened the TLS session of the last one is offered for resumption.
+    # Options mirror the curl options this addon used to send; '-f' raises Http_error for
+    #  responses of 400 or above, '-k' skips certificate checks & '--connect-timeout 15',
+    #  reads get 'read_timeout' seconds as servers may take a while to answer large uploads
+    # Example of uploading a file
+    HTTP = Http_client(headers = {'X-Api-Key': 'KEY'}, log_headers = {'X-Api-Key': 'X-API-KEY'})
+    response = HTTP.request(method = 'POST', url = 'http://localhost:5000/api/files/local',
+        fields = {'path': 'gcode/'}, files = {'file': '/tmp/Cube.gcode'})
+    """
+    # Idle connections keyed by (scheme, host, port), TLS sessions keyed by (host, port) & TLS
+    #  contexts keyed by 'verify', sessions may only be resumed through the context that made them
+    idle_connections = {}
+    tls_sessions = {}
+    tls_contexts = {}
+    pool_lock = threading.Lock()
+    max_idle_per_host = 8
+    chunk_size = 256 * 1024
+    # Methods that may be sent twice without doing twice, see request
+    idempotent_methods = ('GET', 'HEAD')
+
+    def __init__(self, headers = None, log_headers = None, log_level = 'SCRUBBED', timeout = 15, read_timeout = 300, verify = False):
+        self.headers = headers or {}
+        self.log_headers = log_headers or {}
+        self.log_level = log_level
+        self.timeout = timeout
+        self.read_timeout = read_timeout
+        self.verify = verify
+
+    # Returns value for an 'Authorization' header from user name & pass-phrase, like curl's '-u' option
+    @staticmethod
+    def return_basic_auth(user = None, passphrase = None):
+        """
+        # Copy/paste-able block
+        headers['Authorization'] = Http_client.return_basic_auth(user = 'USER', passphrase = 'PASS')
+        """
+        credentials = '{0}:{1}'.format(user, passphrase).encode('utf-8')
+        return 'Basic {0}'.format(base64.b64encode(credentials).decode('ascii'))
+
+    # Returns Http_response after sending a request over a pooled connection, raises Http_error for status >= 400
+    def request(self, method = 'GET', url = None, headers = None, fields = None, files = None, json_body = None, body = None, download_path = None):
+        """
+        # Copy/paste-able block
+        response = HTTP.request(method = 'GET', url = None, headers = None, fields = None, files = None,
+            json_body = None, body = None, download_path = None)
+        # 'fields' & 'files' dictionaries are sent as multipart/form-data, files are streamed from disk
+        # 'json_body' is serialized & sent as application/json, 'body' is sent as is
+        # 'download_path' streams the response body to disk instead of keeping it in memory
+        """
+        if url is None:
+            raise Exception('No url supplied to Http_client.request(url = "?")')
+        if '://' not in url:
+            url = 'http://' + url
+        split_url = urllib.parse.urlsplit(url)
+        request_path = split_url.path or '/'
+        if split_url.query:
+            request_path += '?' + split_url.query
+        request_headers = dict(self.headers)
+        if headers:
+            request_headers.update(headers)
+        body_parts = []
+        if fields or files:
+            content_type, body_parts = self.return_multipart(fields = fields, files = files)
+            request_headers['Content-Type'] = content_type
+        elif json_body is not None:
+            body_parts = [json.dumps(json_body).encode('utf-8')]
+            request_headers['Content-Type'] = 'application/json'
+        elif body is not None:
+            body_parts = [body]
+        if body_parts:
+            request_headers['Content-Length'] = str(self.return_body_length(body_parts = body_parts))
+        self.print_request(method = method, split_url = split_url, headers = request_headers)
+        key = (split_url.scheme, split_url.hostname, split_url.port)
+        connection, reused = self.return_connection(key = key)
+        while True:
+            written = False
+            try:
+                self.write_request(connection = connection, method = method, request_path = request_path,
+                    headers = request_headers, body_parts = body_parts)
+                written = True
+                response = self.read_response(connection = connection, download_path = download_path)
+                break
+            except (http.client.HTTPException, ConnectionError) as error:
+                connection.close()
+                # Servers may close idle keep-alive connections, but one that dropped after a whole request was
+                #  written may have acted upon it, so only requests not wholly written or idempotent are sent again
+                if not reused or (written and method not in Http_client.idempotent_methods):
+                    raise
+                if self.log_level != 'QUITE':
+                    print('# Http_client.request retrying on a new connection after: {0}'.format(error))
+                connection, reused = self.return_connection(key = key, fresh = True)
+            except Exception:
+                connection.close()
+                raise
+        if response.will_close:
+            connection.close()
+        else:
+            self.release_connection(key = key, connection = connection)
+        if response.status >= 400:
+            raise Http_error(status = response.status, reason = response.reason, url = url, body = response.body)
+        return response
+
+    # Writes request line, 'headers' & 'body_parts' to 'connection', file paths are streamed from disk
+    def write_request(self, connection = None, method = 'GET', request_path = '/', headers = None, body_parts = None):
+        connection.putrequest(method, request_path, skip_accept_encoding = True)
+        for header, value in headers.items():
+            connection.putheader(header, value)
+        connection.endheaders()
+        for part in body_parts:
+            if isinstance(part, bytes):
+                connection.send(part)
+            else:
+                with open(part, 'rb') as part_file:
+                    for chunk in iter(lambda: part_file.read(self.chunk_size), b''):
+                        connection.send(chunk)
+
+    # Returns Http_response after reading the whole response from 'connection', or streaming it to 'download_path'
+    def read_response(self, connection = None, download_path = None):
+        raw_response = connection.getresponse()
+        response = Http_response(status = raw_response.status, reason = raw_response.reason,
+            headers = raw_response.getheaders(), will_close = raw_response.will_close)
+        if download_path and raw_response.status < 400:
+            with open(download_path, 'wb') as download_file:
+                for chunk in iter(lambda: raw_response.read(self.chunk_size), b''):
+                    download_file.write(chunk)
+            response.download_path = download_path
+        else:
+            response.body = raw_response.read()
+        return response
+
+    # Returns (connection, reused) for 'key', preferring an idle pooled connection unless 'fresh' is True
+    def return_connection(self, key = None, fresh = False):
+        if not fresh:
+            with Http_client.pool_lock:
+                idle_connections = Http_client.idle_connections.get(key) or []
+                while idle_connections:
+                    connection = idle_connections.pop()
+                    # An idle socket with something to read has been closed by the server, or sent junk
+                    if connection.sock is None or select.select([connection.sock], [], [], 0)[0]:
+                        connection.close()
+                        continue
+                    # Pooled connections may have been opened by a client with other timeouts
+                    connection.read_timeout = self.read_timeout
+                    connection.sock.settimeout(self.read_timeout)
+                    return connection, True
+        scheme, host, port = key
+        if scheme == 'https':
+            connection = Http_tls_connection(host, port, timeout = self.timeout, read_timeout = self.read_timeout,
+                context = Http_client.return_tls_context(verify = self.verify))
+        else:
+            connection = Http_connection(host, port, timeout = self.timeout, read_timeout = self.read_timeout)
+        return connection, False
+
+    # Returns the SSLContext shared by every connection with the same 'verify' setting
+    @staticmethod
+    def return_tls_context(verify = False):
+        with Http_client.pool_lock:
+            tls_context = Http_client.tls_contexts.get(verify)
+            if tls_context is None:
+                tls_context = ssl.create_default_context()
+                if not verify:
+                    tls_context.check_hostname = False
+                    tls_context.verify_mode = ssl.CERT_NONE
+                Http_client.tls_contexts[verify] = tls_context
+        return tls_context
+
+    # Returns connection to the idle pool for 'key', closing it if the pool is already full
+    def release_connection(self, key = None, connection = None):
+        if isinstance(connection, Http_tls_connection):
+            connection.store_session()
+        with Http_client.pool_lock:
+            idle_connections = Http_client.idle_connections.setdefault(key, [])
+            if len(idle_connections) < Http_client.max_idle_per_host:
+                idle_connections.append(connection)
+                return
+        connection.close()
+
+    # Closes every pooled connection, for example prior to unregistering this addon
+    @staticmethod
+    def close_all():
+        with Http_client.pool_lock:
+            for idle_connections in Http_client.idle_connections.values():
+                for connection in idle_connections:
+                    connection.close()
+            Http_client.idle_connections = {}
+
+    # Returns (content_type, body_parts) for multipart/form-data, file paths are left for send to stream
+    @staticmethod
+    def return_multipart(fields = None, files = None):
+        boundary = uuid.uuid4().hex
+        body_parts = []
+        for name, value in (fields or {}).items():
+            body_parts += [('--{0}\r\nContent-Disposition: form-data; name="{1}"\r\n\r\n{2}\r\n'.format(
+                boundary, name, value)).encode('utf-8')]
+        for name, path in (files or {}).items():
+            body_parts += [('--{0}\r\nContent-Disposition: form-data; name="{1}"; filename="{2}"\r\n'
+                'Content-Type: application/octet-stream\r\n\r\n'.format(boundary, name, os.path.basename(path))).encode('utf-8')]
+            body_parts += [path]
+            body_parts += [b'\r\n']
+        body_parts += ['--{0}--\r\n'.format(boundary).encode('utf-8')]
+        return 'multipart/form-data; boundary={0}'.format(boundary), body_parts
+
+    # Returns total byte length of 'body_parts', file paths are measured on disk
+    @staticmethod
+    def return_body_length(body_parts = None):
+        body_length = 0
+        for part in body_parts:
+            if isinstance(part, bytes):
+                body_length += len(part)
+            else:
+                body_length += os.path.getsize(part)
+        return body_length
+
+    # Prints request line & headers with credentials shown, scrubbed or hidden according to 'log_level'
+    def print_request(self, method = None, split_url = None, headers = None):
+        if self.log_level == 'QUITE':
+            return
+        log_headers = {}
+        for header, value in headers.items():
+            if header not in self.headers or header in ('Content-Type', 'Content-Length'):
+                log_headers[header] = value
+        if self.log_level == 'VERBOSE':
+            log_headers.update(self.headers)
+            log_url = urllib.parse.urlunsplit(split_url)
+        else:
+            log_headers.update(self.log_headers)
+            log_url = 'HOST{0}'.format(split_url.path)
+        print('# Using Http_client.request({0} {1} {2})'.format(method, log_url, log_headers))
+
+
+class Http_connection(http.client.HTTPConnection):
+    """
+    # HTTPConnection that waits 'timeout' seconds to connect, as curl's '--connect-timeout' did,
+    #  then 'read_timeout' seconds on each read once connected.
+    """
+    def __init__(self, host, port = None, timeout = 15, read_timeout = 300):
+        super(Http_connection, self).__init__(host, port, timeout = timeout)
+        self.read_timeout = read_timeout
+
+    def connect(self):
+        http.client.HTTPConnection.connect(self)
+        self.sock.settimeout(self.read_timeout)
+
+
+class Http_error(Exception):
+    """
+    # Raised by Http_client.request for responses with a status of 400 or above, as curl's '-f' option would fail
+    """
+    def __init__(self, status = None, reason = None, url = None, body = None):
+        self.status = status
+        self.reason = reason
+        self.url = url
+        self.body = body
+        super(Http_error, self).__init__('HTTP {0} {1} from: {2}'.format(status, reason, url))
+
+
+class Http_response(object):
+    """
+    # Container for what Http_client.request read back from a server
+    """
+    def __init__(self, status = None, reason = None, headers = None, will_close = False):
+        self.status = status
+        self.reason = reason
+        # Header names are lower cased for easier look-ups
+        self.headers = dict((header.lower(), value) for header, value in (headers or []))
+        self.will_close = will_close
+        self.body = b''
+        self.download_path = None
+
+    # Returns body parsed as JSON
+    def json(self):
+        return json.loads(self.body.decode('utf-8'))
+
+
+class Http_tls_connection(http.client.HTTPSConnection):
+    """
+    # HTTPSConnection that offers the last TLS session negotiated with a host when connecting,
+    #  so that new connections can skip a full handshake where the server allows resumption.
+    """
+    def __init__(self, host, port = None, timeout = 15, read_timeout = 300, context = None):
+        super(Http_tls_connection, self).__init__(host, port, timeout = timeout, context = context)
+        self.tls_context = context
+        self.read_timeout = read_timeout
+
+    def connect(self):
+        http.client.HTTPConnection.connect(self)
+        session_key = (self.host, self.port)
+        wrap_options = {'server_hostname': self.host}
+        # SSLSocket.session is only available from Python 3.6, sessions are stored with the context that made them
+        tls_context, tls_session = Http_client.tls_sessions.get(session_key, (None, None))
+        if hasattr(ssl.SSLSocket, 'session') and tls_session is not None and tls_context is self.tls_context:
+            wrap_options['session'] = tls_session
+        self.sock = self.tls_context.wrap_socket(self.sock, **wrap_options)
+        self.store_session()
+        self.sock.settimeout(self.read_timeout)
+
+    # Keeps TLS session of this connection for the next one to the same host, TLS 1.3 servers send
+    #  session tickets after the handshake so this is called again once a response has been read
+    def store_session(self):
+        if self.sock is not None and getattr(self.sock, 'session', None) is not None:
+            Http_client.tls_sessions[(self.host, self.port)] = (self.tls_context, self.sock.session)
+
+
+class Job_journal(object):
+    """
+    # This class journals Slice_job units within an SQLite file, the stage each reached & every
+    #  upload of its GCode per host, committing as each stage finishes so that a run which dies
+    #  part way, to a slicer crash, dropped connection or Blender closing, may be run again to
+    #  redo only the stages that did not finish. Upload_dispatcher records uploads within the
+    #  same journal when given one. Units of a run that finished are marked 'finished' and
+    #  start over when next run.
+    # Example of listing what an interrupted run left undone
+    journal = Job_journal(path = '/tmp/print_shortcuts_journal.sqlite3')
+    for unit_row in journal.return_unfinished_units():
+        print(unit_row['gcode_path'], unit_row['stage'])
+    for upload_row in journal.return_pending_uploads():
+        print(upload_row['path'], upload_row['host'], upload_row['state'])
+    """
+    # Stages in order reached, 'failed' units are started over
+    stages = ('pending', 'exported', 'sliced', 'finished', 'failed')
+
+    def __init__(self, path = None):
+        if path is None:
+            raise Exception('No path supplied to Job_journal(path = "?")')
+        if sqlite3 is None:
+            raise Exception('Job_journal requires the sqlite3 module, which is missing from this Python')
+        if not os.path.isdir(os.path.dirname(os.path.abspath(path))):
+            Os.mkdir(path = os.path.dirname(os.path.abspath(path)))
+        self.path = path
+        # Uploads record their state from threads of Upload_dispatcher, each statement is serialized
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout = 30, check_same_thread = False)
+        self.connection.row_factory = sqlite3.Row
+        with self.lock:
+            # Write-ahead logging keeps committed stages intact if the process dies mid write
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.executescript('''
+                CREATE TABLE IF NOT EXISTS units (
+                    gcode_path TEXT PRIMARY KEY,
+                    name TEXT,
+                    stage TEXT,
+                    exported_paths TEXT,
+                    export_digests TEXT,
+                    gcode_size INTEGER,
+                    gcode_mtime REAL,
+                    error TEXT,
+                    updated REAL);
+                CREATE TABLE IF NOT EXISTS uploads (
+                    path TEXT,
+                    host TEXT,
+                    state TEXT,
+                    error TEXT,
+                    updated REAL,
+                    PRIMARY KEY (path, host));''')
+            # Journals written before export digests were recorded gain the column, their units start over
+            unit_columns = [row[1] for row in self.connection.execute('PRAGMA table_info(units)')]
+            if 'export_digests' not in unit_columns:
+                self.connection.execute('ALTER TABLE units ADD COLUMN export_digests TEXT')
+                self.connection.commit()
+
+    # Runs 'statement' with 'parameters' within its own committed transaction, returning rows as dictionaries
+    def execute(self, statement = None, parameters = ()):
+        with self.lock:
+            with self.connection:
+                rows = self.connection.execute(statement, parameters).fetchall()
+        return [dict(row) for row in rows]
+
+    # Returns unit row for 'gcode_path' as a dictionary, with 'exported_paths' as a list & 'export_digests' as a dictionary, or None
+    def return_unit(self, gcode_path = None):
+        rows = self.execute('SELECT * FROM units WHERE gcode_path = ?', (gcode_path,))
+        if not rows:
+            return None
+        rows[0]['exported_paths'] = json.loads(rows[0]['exported_paths'] or '[]')
+        rows[0]['export_digests'] = json.loads(rows[0]['export_digests'] or '{}')
+        return rows[0]
+
+    # Records 'unit' of a Slice_job as having reached 'stage', with Export_cache digests of its exports & size & time of its GCode once sliced
+    def record_unit(self, unit = None, stage = 'pending', error = None):
+        """
+        # Copy/paste-able block
+        journal.record_unit(unit = unit, stage = 'sliced', error = None)
+        """
+        if stage not in Job_journal.stages:
+            raise Exception('Unknown stage supplied to Job_journal.record_unit(stage = "{0}")'.format(stage))
+        gcode_size = None
+        gcode_mtime = None
+        if stage in ('sliced', 'finished') and os.path.isfile(unit['gcode_path']):
+            gcode_size = os.path.getsize(unit['gcode_path'])
+            gcode_mtime = os.path.getmtime(unit['gcode_path'])
+        self.execute('''INSERT OR REPLACE INTO units (gcode_path, name, stage, exported_paths, export_digests,
+            gcode_size, gcode_mtime, error, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''', (unit['gcode_path'], unit['name'], stage,
+            json.dumps(unit['exported_paths']), json.dumps(unit['export_digests']), gcode_size, gcode_mtime,
+            None if error is None else str(error), time.time()))
+
+    # Records a fresh start of 'unit', forgetting uploads of any GCode an earlier run made at the same path
+    def reset_unit(self, unit = None):
+        self.execute('DELETE FROM uploads WHERE path = ?', (unit['gcode_path'],))
+        self.record_unit(unit = unit, stage = 'pending')
+
+    # Returns stage an earlier unfinished run got 'unit' through, 'exported' or 'sliced', if its objects & files are still as left, else None
+    def return_resume_stage(self, unit = None):
+        """
+        # Copy/paste-able block
+        unit['export_digests'] = {stl_path: export_digest}
+        resume_stage = journal.return_resume_stage(unit = unit)
+        # 'export_digests' of 'unit' should hold current Export_cache digests of what each of its exports would write
+        """
+        row = self.return_unit(gcode_path = unit['gcode_path'])
+        if row is None or row['stage'] not in ('exported', 'sliced'):
+            return None
+        # Exports must still cover the same files, a changed selection or export mode starts over
+        if sorted(row['exported_paths']) != sorted(stl_path for stl_path, object_names in unit['exports']):
+            return None
+        # Objects edited, moved or exported with other settings since would make stale files, start over
+        if not row['export_digests'] or row['export_digests'] != unit['export_digests']:
+            return None
+        # Sliced GCode no longer needs its exports, they may have been cleaned up after slicing
+        if row['stage'] == 'sliced':
+            if (os.path.isfile(unit['gcode_path']) and os.path.getsize(unit['gcode_path']) == row['gcode_size'] and
+                    os.path.getmtime(unit['gcode_path']) == row['gcode_mtime']):
+                return 'sliced'
+        # GCode went missing or was changed since, slice it again if the exports are still there
+        if not all(os.path.isfile(stl_path) for stl_path in row['exported_paths']):
+            return None
+        return 'exported'
+
+    # Records 'state' of an upload of 'path' to 'host', one of 'queued', 'running', 'done' or 'failed'
+    def record_upload(self, path = None, host = None, state = 'queued', error = None):
+        self.execute('INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?)', (path, str(host), state,
+            None if error is None else str(error), time.time()))
+
+    # Returns set of hosts 'path' was uploaded to without error
+    def return_uploaded_hosts(self, path = None):
+        return set(row['host'] for row in self.execute("SELECT host FROM uploads WHERE path = ? AND state = 'done'", (path,)))
+
+    # Returns list of unit rows left part way by earlier runs
+    def return_unfinished_units(self):
+        return self.execute("SELECT * FROM units WHERE stage NOT IN ('finished') ORDER BY updated")
+
+    # Returns list of upload rows that are queued, running, or failed
+    def return_pending_uploads(self):
+        return self.execute("SELECT * FROM uploads WHERE state != 'done' ORDER BY updated")
+
+    # Closes the SQLite connection, committed stages stay within the file
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class Mesh_buffers(object):
+    """
+    # This class contains staticmethods for moving mesh data in bulk between Blender & NumPy
+    #  arrays via foreach_get, and for writing that data to disk, without relying upon
+    #  operators that need objects selected or visible.
+    """
+    # Binary STL facet layout; normal, three vertices & attribute byte count, 50 bytes per facet
+    stl_dtype = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+    stl_vertex_pattern = re.compile(rb'vertex[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)')
+    obj_vertex_pattern = re.compile(rb'^v[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)', re.M)
+    obj_face_pattern = re.compile(rb'^f[ \t]', re.M)
+    # Faces of three positive indices, with or without texture coordinate & normal indices
+    obj_triangle_pattern = re.compile(rb'^f[ \t]+(\d+)\S*[ \t]+(\d+)\S*[ \t]+(\d+)\S*[ \t]*\r?$', re.M)
+
+    def __init__(self):
+        pass
+
+    # Returns a 4x4 NumPy array from a mathutils.Matrix
+    @staticmethod
+    def return_matrix_array(matrix = None):
+        """
+        # Copy/paste-able block
+        matrix_array = Mesh_buffers.return_matrix_array(matrix = obj.matrix_world)
+        """
+        if matrix is None:
+            raise Exception('No matrix supplied to Mesh_buffers.return_matrix_array(matrix = "?")')
+        return np.array([list(row) for row in matrix], dtype = np.float64)
+
+    # Returns new mesh named 'name' with an edge for each of the (N, 2, 3) 'segments', set in bulk via foreach_set
+    @staticmethod
+    def new_edge_mesh(name = None, segments = None):
+        """
+        # Copy/paste-able block
+        mesh = Mesh_buffers.new_edge_mesh(name = 'Cube.gcode', segments = segments)
+        """
+        if segments is None:
+            raise Exception('No segments supplied to Mesh_buffers.new_edge_mesh(segments = "?")')
+        mesh = bpy.data.meshes.new(name)
+        mesh.vertices.add(len(segments) * 2)
+        mesh.vertices.foreach_set('co', np.ascontiguousarray(segments, dtype = np.float32).ravel())
+        mesh.edges.add(len(segments))
+        mesh.edges.foreach_set('vertices', np.arange(len(segments) * 2, dtype = np.int32))
+        mesh.update()
+        return mesh
+
+    # Returns new mesh named 'name' with a triangle for each row of 'faces' indexing 'vertices', set in bulk via foreach_set
+    @staticmethod
+    def new_triangle_mesh(name = None, vertices = None, faces = None):
+        """
+        # Copy/paste-able block
+        mesh = Mesh_buffers.new_triangle_mesh(name = 'Cube_fixed', vertices = vertices, faces = faces)
+        """
+        if vertices is None or faces is None:
+            raise Exception('Mesh_buffers.new_triangle_mesh requires both vertices & faces')
+        mesh = bpy.data.meshes.new(name)
+        mesh.vertices.add(len(vertices))
+        mesh.vertices.foreach_set('co', np.ascontiguousarray(vertices, dtype = np.float32).ravel())
+        mesh.loops.add(len(faces) * 3)
+        mesh.loops.foreach_set('vertex_index', np.ascontiguousarray(faces, dtype = np.int32).ravel())
+        mesh.polygons.add(len(faces))
+        mesh.polygons.foreach_set('loop_start', np.arange(0, len(faces) * 3, 3, dtype = np.int32))
+        mesh.polygons.foreach_set('loop_total', np.full(len(faces), 3, dtype = np.int32))
+        mesh.update(calc_edges = True)
+        return mesh
+
+    # Returns an (N, 3, 3) array of object space triangle coordinates from the evaluated mesh of 'obj'
+    @staticmethod
+    def return_triangles(obj = None, scene = None):
+        """
+        # Copy/paste-able block
+        triangles = Mesh_buffers.return_triangles(obj = obj, scene = context.scene)
+        # Modifiers are applied, the temporary mesh is removed before returning &
+        #  n-gons are triangulated the same way Blender's own exporters would.
+        """
+        if obj is None:
+            raise Exception('No object supplied to Mesh_buffers.return_triangles(obj = "?")')
+        if bpy.app.version < (2, 80, 0):
+            evaluated_obj = None
+            mesh = obj.to_mesh(scene or bpy.context.scene, True, 'PREVIEW')
+        else:
+            evaluated_obj = obj.evaluated_get(bpy.context.evaluated_depsgraph_get())
+            mesh = evaluated_obj.to_mesh()
+        try:
+            coordinates = np.empty(len(mesh.vertices) * 3, dtype = np.float32)
+            mesh.vertices.foreach_get('co', coordinates)
+            coordinates = coordinates.reshape(-1, 3).astype(np.float64)
+            if hasattr(mesh, 'loop_triangles'):
+                mesh.calc_loop_triangles()
+                indices = np.empty(len(mesh.loop_triangles) * 3, dtype = np.int32)
+                mesh.loop_triangles.foreach_get('vertices', indices)
+            else:
+                loop_totals = np.empty(len(mesh.polygons), dtype = np.int32)
+                mesh.polygons.foreach_get('loop_total', loop_totals)
+                if np.any(loop_totals > 3):
+                    bm = bmesh.new()
+                    bm.from_mesh(mesh)
+                    bmesh.ops.triangulate(bm, faces = bm.faces[:])
+                    bm.to_mesh(mesh)
+                    bm.free()
+                loop_starts = np.empty(len(mesh.polygons), dtype = np.int32)
+                mesh.polygons.foreach_get('loop_start', loop_starts)
+                loop_vertices = np.empty(len(mesh.loops), dtype = np.int32)
+                mesh.loops.foreach_get('vertex_index', loop_vertices)
+                indices = loop_vertices[loop_starts[:, None] + np.arange(3)]
+        finally:
+            if evaluated_obj is None:
+                bpy.data.meshes.remove(mesh)
+            else:
+                evaluated_obj.to_mesh_clear()
+        return coordinates[indices.reshape(-1, 3)]
+
+    # Returns 'triangles' after applying a 4x4 'matrix', winding is flipped for mirroring matrices
+    @staticmethod
+    def return_transformed_triangles(triangles = None, matrix = None):
+        """
+        # Copy/paste-able block
+        world_triangles = Mesh_buffers.return_transformed_triangles(triangles = triangles, matrix = matrix_array)
+        """
+        if triangles is None or matrix is None:
+            raise Exception('Mesh_buffers.return_transformed_triangles requires both triangles & matrix')
+        transformed = triangles.reshape(-1, 3).dot(matrix[:3, :3].T) + matrix[:3, 3]
+        transformed = transformed.reshape(-1, 3, 3)
+        if np.linalg.det(matrix[:3, :3]) < 0:
+            transformed = transformed[:, ::-1, :]
+        return transformed
+
+    # Returns an (N, 3) array of unit length face normals, degenerate faces get zero length normals
+    @staticmethod
+    def return_face_normals(triangles = None):
+        """
+        # Copy/paste-able block
+        normals = Mesh_buffers.return_face_normals(triangles = triangles)
+        """
+        if triangles is None:
+            raise Exception('No triangles supplied to Mesh_buffers.return_face_normals(triangles = "?")')
+        normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+        lengths = np.sqrt((normals * normals).sum(axis = 1))
+        lengths[lengths == 0] = 1
+        return normals / lengths[:, None]
+
+    # Returns an (N, 3, 3) array of triangle coordinates read from a binary or ASCII STL file
+    @staticmethod
+    def read_stl(path = None):
+        """
+        # Copy/paste-able block
+        triangles = Mesh_buffers.read_stl(path = '/tmp/Cube.stl')
+        """
+        if path is None:
+            raise Exception('No path supplied to Mesh_buffers.read_stl(path = "?")')
+        with open(path, 'rb') as stl_file:
+            stl_bytes = stl_file.read()
+        # Binary files are exactly 84 bytes plus 50 per facet, ASCII files may also start with 'solid'
+        if len(stl_bytes) >= 84:
+            facet_count = int(np.frombuffer(stl_bytes, dtype = '<u4', count = 1, offset = 80)[0])
+            if len(stl_bytes) == 84 + facet_count * Mesh_buffers.stl_dtype.itemsize:
+                facets = np.frombuffer(stl_bytes, dtype = Mesh_buffers.stl_dtype, count = facet_count, offset = 84)
+                return facets['vertices'].astype(np.float64)
+        vertex_matches = Mesh_buffers.stl_vertex_pattern.findall(stl_bytes)
+        return np.array(vertex_matches, dtype = bytes).astype(np.float64).reshape(-1, 3, 3)
+
+    # Returns (vertices, faces) arrays read from an OBJ file, faces of more than three vertices are fan triangulated
+    @staticmethod
+    def read_obj(path = None):
+        """
+        # Copy/paste-able block
+        vertices, faces = Mesh_buffers.read_obj(path = '/tmp/Cube_fixed.obj')
+        # Only geometry is read; texture coordinates, normals, groups & materials are skipped
+        """
+        if path is None:
+            raise Exception('No path supplied to Mesh_buffers.read_obj(path = "?")')
+        with open(path, 'rb') as obj_file:
+            obj_bytes = obj_file.read()
+        vertex_matches = Mesh_buffers.obj_vertex_pattern.findall(obj_bytes)
+        vertices = np.array(vertex_matches, dtype = bytes).astype(np.float64).reshape(-1, 3)
+        face_count = len(Mesh_buffers.obj_face_pattern.findall(obj_bytes))
+        triangle_matches = Mesh_buffers.obj_triangle_pattern.findall(obj_bytes)
+        if len(triangle_matches) == face_count:
+            faces = np.array(triangle_matches, dtype = bytes).astype(np.int64).reshape(-1, 3) - 1
+        else:
+            # Relative indices count back from vertices read so far, so mixed files are read line by line
+            faces = []
+            vertex_count = 0
+            for line in obj_bytes.splitlines():
+                if line.startswith(b'v ') or line.startswith(b'v\t'):
+                    vertex_count += 1
+                elif line.startswith(b'f ') or line.startswith(b'f\t'):
+                    indices = [int(token.split(b'/')[0]) for token in line.split()[1:]]
+                    indices = [index - 1 if index > 0 else vertex_count + index for index in indices]
+                    faces += [[indices[0], indices[i], indices[i + 1]] for i in range(1, len(indices) - 1)]
+            faces = np.array(faces, dtype = np.int64).reshape(-1, 3)
+        if len(faces) and (faces.min() < 0 or faces.max() >= len(vertices)):
+            raise Exception('OBJ file has face indices out of range: {0}'.format(path))
+        return vertices, faces
+
+    # Returns 'path' after writing 'triangles' as either a binary or ASCII STL file
+    @staticmethod
+    def write_stl(path = None, triangles = None, ascii = False):
+        """
+        # Copy/paste-able block
+        stl_path = Mesh_buffers.write_stl(path = '/tmp/Cube.stl', triangles = triangles, ascii = False)
+        """
+        if path is None:
+            raise Exception('No path supplied to Mesh_buffers.write_stl(path = "?")')
+        if triangles is None:
+            raise Exception('No triangles supplied to Mesh_buffers.write_stl(triangles = "?")')
+        normals = Mesh_buffers.return_face_normals(triangles = triangles)
+        if bpy is not None:
+            header = 'Exported from Blender-{0}'.format(bpy.app.version_string)
+        else:
+            header = 'Exported from {0}'.format(this_addons_name)
+        if ascii:
+            rows = np.concatenate((normals[:, None, :], triangles), axis = 1).reshape(-1, 12)
+            facet = ('facet normal {:e} {:e} {:e}\n outer loop\n'
+                '  vertex {:e} {:e} {:e}\n  vertex {:e} {:e} {:e}\n  vertex {:e} {:e} {:e}\n'
+                ' endloop\nendfacet\n')
+            with open(path, 'w') as stl_file:
+                stl_file.write('solid {0}\n'.format(header))
+                stl_file.write((facet * len(rows)).format(*rows.ravel().tolist()))
+                stl_file.write('endsolid {0}\n'.format(header))
+        else:
+            facets = np.zeros(len(triangles), dtype = Mesh_buffers.stl_dtype)
+            facets['normal'] = normals
+            facets['vertices'] = triangles
+            with open(path, 'wb') as stl_file:
+                stl_file.write(header.encode('ascii', 'replace')[:80].ljust(80, b'\0'))
+                stl_file.write(np.array([len(facets)], dtype = '<u4').tobytes())
+                stl_file.write(facets.tobytes())
+        return path
+
+
+class Mesh_repair(object):
+    """
+    # This class repairs triangle meshes held within NumPy arrays, taking the same steps as
+    #  'slic3r --repair' without writing files or leaving Blender; vertices are welded onto a
+    #  representative vertex within 'weld_distance' of them, found via a spatial hash, without
+    #  chaining further through its neighbours, degenerate & duplicate faces are removed,
+    #  winding is made consistent with normals pointing outwards & holes bound by no more than
+    #  'max_hole_edges' edges are filled, 0 leaves holes open.
+    # Example of checking world space triangles before deciding whether to repair them
+    MR = Mesh_repair(weld_distance = 0.00001)
+    check_failures = Mesh_repair.return_check_failures(check_stats = MR.check(triangles = world_triangles))
+    # Example of repairing world space triangles of an object into a new object
+    MR = Mesh_repair(weld_distance = 0.00001, max_hole_edges = 32)
+    vertices, faces = MR.repair(triangles = world_triangles)
+    obj = Blender.new_mesh_object(name = 'Cube_fixed', vertices = vertices, faces = faces)
+    print(Mesh_repair.return_summary(repair_stats = MR.repair_stats))
+    """
+    def __init__(self, weld_distance = 0.00001, max_hole_edges = 32):
+        self.weld_distance = weld_distance
+        self.max_hole_edges = max_hole_edges
+        self.repair_stats = {}
+        self.check_stats = {}
+
+    # Returns counts of problems found within 'triangles' without changing them, also saved to check_stats,
+    #  faces intersecting others are only counted if 'self_intersections' is True
+    def check(self, triangles = None, self_intersections = True):
+        """
+        # Copy/paste-able block
+        check_stats = MR.check(triangles = triangles, self_intersections = True)
+        """
+        if triangles is None:
+            raise Exception('No triangles supplied to Mesh_repair.check(triangles = "?")')
+        triangles = np.asarray(triangles, dtype = np.float64).reshape(-1, 3, 3)
+        vertices, faces = self.weld(coordinates = triangles.reshape(-1, 3))
+        corners = vertices[faces]
+        doubled_areas = np.sqrt((np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]) ** 2).sum(axis = 1))
+        distinct = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])
+        solid = distinct & (doubled_areas > self.weld_distance ** 2)
+        faces = faces[solid]
+        self.check_stats = {'faces': len(triangles), 'zero_area_faces': int(len(triangles) - len(faces)),
+            'open_edges': 0, 'non_manifold_edges': 0, 'flipped_edges': 0, 'inside_out': False, 'intersecting_faces': 0}
+        if not len(faces):
+            return self.check_stats
+        directed_edges = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+        edge_keys, edge_counts, edge_inverse = self.return_edge_counts(faces = faces)
+        self.check_stats['open_edges'] = int(np.count_nonzero(edge_counts == 1))
+        self.check_stats['non_manifold_edges'] = int(np.count_nonzero(edge_counts > 2))
+        # Neighbours wound the same way share an edge in the same direction, so the directed edge repeats
+        manifold = edge_counts[edge_inverse] == 2
+        directed_keys = Mesh_repair.return_row_keys(rows = directed_edges[manifold])
+        self.check_stats['flipped_edges'] = int(len(directed_keys) - len(np.unique(directed_keys)))
+        signed_volume = (vertices[faces[:, 0]] * np.cross(vertices[faces[:, 1]], vertices[faces[:, 2]])).sum()
+        self.check_stats['inside_out'] = bool(signed_volume < 0 and not self.check_stats['open_edges'])
+        if self_intersections:
+            self.check_stats['intersecting_faces'] = Mesh_repair.return_intersecting_face_count(vertices = vertices, faces = faces)
+        return self.check_stats
+
+    # Returns count of faces that overlap another face, found by a mathutils.bvhtree BVHTree overlapping itself
+    @staticmethod
+    def return_intersecting_face_count(vertices = None, faces = None):
+        """
+        # Copy/paste-able block
+        intersecting_face_count = Mesh_repair.return_intersecting_face_count(vertices = vertices, faces = faces)
+        """
+        if vertices is None or faces is None:
+            raise Exception('Mesh_repair.return_intersecting_face_count requires both vertices & faces')
+        if BVHTree is None:
+            raise Exception('Mesh_repair.return_intersecting_face_count requires mathutils, disable mesh_check_self_intersections outside of Blender')
+        tree = BVHTree.FromPolygons(vertices.tolist(), faces.tolist())
+        # Faces sharing vertices are not reported as overlapping, same as Blender's 3D print toolbox relies upon
+        intersecting_faces = set()
+        for face_a, face_b in tree.overlap(tree):
+            intersecting_faces.add(face_a)
+            intersecting_faces.add(face_b)
+        return len(intersecting_faces)
+
+    # Returns a list of problems found by check, such as '3 open edges', an empty list means the mesh is clean
+    @staticmethod
+    def return_check_failures(check_stats = None):
+        """
+        # Copy/paste-able block
+        check_failures = Mesh_repair.return_check_failures(check_stats = MR.check_stats)
+        """
+        if check_stats is None:
+            raise Exception('No check_stats supplied to Mesh_repair.return_check_failures(check_stats = "?")')
+        check_failures = []
+        for key, description in (('zero_area_faces', 'zero area faces'), ('open_edges', 'open edges'),
+                ('non_manifold_edges', 'non-manifold edges'), ('flipped_edges', 'edges between flipped faces'),
+                ('intersecting_faces', 'intersecting faces')):
+            if check_stats.get(key):
+                check_failures += ['{0} {1}'.format(check_stats[key], description)]
+        if check_stats.get('inside_out'):
+            check_failures += ['normals pointing inwards']
+        return check_failures
+
+    # Returns (vertices, faces) arrays of repaired 'triangles', an (N, 3, 3) array, counts of each fix are saved to repair_stats
+    def repair(self, triangles = None):
+        """
+        # Copy/paste-able block
+        vertices, faces = MR.repair(triangles = triangles)
+        """
+        if triangles is None:
+            raise Exception('No triangles supplied to Mesh_repair.repair(triangles = "?")')
+        triangles = np.asarray(triangles, dtype = np.float64).reshape(-1, 3, 3)
+        self.repair_stats = {'faces': len(triangles)}
+        vertices, faces = self.weld(coordinates = triangles.reshape(-1, 3))
+        self.repair_stats['welded_vertices'] = len(triangles) * 3 - len(vertices)
+        faces = self.remove_degenerate_faces(vertices = vertices, faces = faces)
+        faces = self.remove_duplicate_faces(faces = faces)
+        faces = self.orient_faces(vertices = vertices, faces = faces)
+        vertices, faces = self.fill_holes(vertices = vertices, faces = faces)
+        self.repair_stats['open_edges'] = int(np.count_nonzero(self.return_edge_counts(faces = faces)[1] == 1))
+        return vertices, faces
+
+    # Returns (vertices, faces) after merging each of 'coordinates' onto a representative no further than
+    #  weld_distance away, every three coordinates make a face
+    def weld(self, coordinates = None):
+        """
+        # Copy/paste-able block
+        vertices, faces = MR.weld(coordinates = triangles.reshape(-1, 3))
+        # Vertices are only merged onto a representative within weld_distance of themselves, never
+        #  through a chain of neighbours, so a merged vertex moves at most weld_distance
+        """
+        coordinates = np.ascontiguousarray(coordinates, dtype = np.float64)
+        # Identical coordinates, most of any triangle soup, are merged by comparing their bytes first
+        coordinate_bytes = coordinates.view(np.dtype((np.void, coordinates.dtype.itemsize * 3))).reshape(-1)
+        unique_bytes, first_indices, exact_inverse = np.unique(coordinate_bytes, return_index = True, return_inverse = True)
+        points = coordinates[first_indices]
+        representatives = np.arange(len(points))
+        if self.weld_distance > 0:
+            # Pairs arrive sorted by their lower index, which claims its unclaimed neighbours, a point already
+            #  merged onto another claims none so merges never chain beyond weld_distance
+            for lower, higher in self.return_close_pairs(points = points).tolist():
+                if representatives[lower] == lower and representatives[higher] == higher:
+                    representatives[higher] = lower
+        labels = representatives[exact_inverse.reshape(-1)]
+        unique_labels, inverse = np.unique(labels, return_inverse = True)
+        return points[unique_labels], inverse.reshape(-1, 3).astype(np.int64)
+
+    # Returns an (N, 2) array of index pairs, lower index first & sorted, of 'points' no further than weld_distance apart
+    def return_close_pairs(self, points = None):
+        """
+        # Copy/paste-able block
+        close_pairs = MR.return_close_pairs(points = vertices)
+        # Points are bucketed into weld_distance sized cells, so close points are within the same or
+        #  one of the 26 neighbouring cells, each neighbouring cell pair is compared once
+        """
+        if points is None:
+            raise Exception('No points supplied to Mesh_repair.return_close_pairs(points = "?")')
+        point_count = len(points)
+        if point_count < 2:
+            return np.zeros((0, 2), dtype = np.int64)
+        cells = np.floor(points / self.weld_distance).astype(np.int64)
+        cell_keys = Mesh_repair.return_cell_hashes(cells = cells)
+        # Points sorted by hash then by cell, so each bucket of equal hashes & each cell within it is a contiguous run
+        order = np.lexsort((cells[:, 2], cells[:, 1], cells[:, 0], cell_keys))
+        sorted_keys = cell_keys[order]
+        sorted_cells = cells[order]
+        bucket_keys, bucket_starts, bucket_counts = np.unique(sorted_keys, return_index = True, return_counts = True)
+        new_cell = np.ones(point_count, dtype = bool)
+        new_cell[1:] = (sorted_keys[1:] != sorted_keys[:-1]) | (sorted_cells[1:] != sorted_cells[:-1]).any(axis = 1)
+        cell_starts = np.flatnonzero(new_cell)
+        unique_cells = sorted_cells[cell_starts]
+        # Cell of each point, in the order points were sorted
+        sorted_point_cells = np.cumsum(new_cell) - 1
+        # The same cell plus half of its 26 neighbours, the other half is covered from their side
+        cell_offsets = [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1) if (x, y, z) >= (0, 0, 0)]
+        pairs = []
+        for cell_offset in cell_offsets:
+            neighbour_keys = Mesh_repair.return_cell_hashes(cells = unique_cells + np.array(cell_offset, dtype = np.int64))
+            # Searching sorted keys is several times faster, as each search starts where the last ended
+            needle_order = np.argsort(neighbour_keys)
+            found = np.empty(len(unique_cells), dtype = np.int64)
+            found[needle_order] = np.searchsorted(bucket_keys, neighbour_keys[needle_order])
+            found = np.minimum(found, len(bucket_keys) - 1)
+            # Every point of the bucket is a candidate, those of cells that only share its hash fail the distance test
+            neighbour_counts = np.where(bucket_keys[found] == neighbour_keys, bucket_counts[found], 0)
+            counts = neighbour_counts[sorted_point_cells]
+            first = np.repeat(order, counts)
+            positions = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            second = order[np.repeat(bucket_starts[found][sorted_point_cells], counts) + positions]
+            keep = first != second
+            if cell_offset == (0, 0, 0):
+                keep = first < second
+            first, second = first[keep], second[keep]
+            close = ((points[first] - points[second]) ** 2).sum(axis = 1) <= self.weld_distance ** 2
+            pairs += [np.stack([np.minimum(first, second), np.maximum(first, second)], axis = 1)[close]]
+        # Colliding hashes may find the same pair from two offsets
+        pairs = np.unique(np.concatenate(pairs), axis = 0)
+        return pairs
+
+    # Returns one uint64 hash per row of integer 'cells', cells that collide only add candidates that
+    #  the distance test of return_close_pairs rejects
+    @staticmethod
+    def return_cell_hashes(cells = None):
+        cells = cells.astype(np.uint64)
+        return (cells[:, 0] * np.uint64(73856093)) ^ (cells[:, 1] * np.uint64(19349663)) ^ (cells[:, 2] * np.uint64(83492791))
+
+    # Returns one int64 key per row of the integer array 'rows', equal only for equal rows, packed
+    #  arithmetically where the ranges of columns allow as sorting rows by np.unique(axis = 0) is far slower
+    @staticmethod
+    def return_row_keys(rows = None):
+        """
+        # Copy/paste-able block
+        unique_keys, labels = np.unique(Mesh_repair.return_row_keys(rows = faces), return_inverse = True)
+        """
+        if rows is None:
+            raise Exception('No rows supplied to Mesh_repair.return_row_keys(rows = "?")')
+        if not len(rows):
+            return np.zeros(0, dtype = np.int64)
+        lowest = rows.min(axis = 0)
+        spans = (rows.max(axis = 0) - lowest + 1).tolist()
+        if np.prod([float(span) for span in spans]) >= 2 ** 62:
+            unique_rows, keys = np.unique(rows, axis = 0, return_inverse = True)
+            return keys.reshape(-1).astype(np.int64)
+        keys = np.zeros(len(rows), dtype = np.int64)
+        for column, span in enumerate(spans):
+            keys = keys * span + (rows[:, column] - lowest[column])
+        return keys
+
+    # Returns faces that have three distinct vertices & more area than a weld_distance sided triangle
+    def remove_degenerate_faces(self, vertices = None, faces = None):
+        distinct = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])
+        corners = vertices[faces]
+        doubled_areas = np.sqrt((np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]) ** 2).sum(axis = 1))
+        keep = distinct & (doubled_areas > self.weld_distance ** 2)
+        self.repair_stats['degenerate_faces'] = int(len(faces) - np.count_nonzero(keep))
+        return faces[keep]
+
+    # Returns faces without repeats of the same three vertices, whichever way around they are wound
+    def remove_duplicate_faces(self, faces = None):
+        unique_faces, first_indices = np.unique(Mesh_repair.return_row_keys(rows = np.sort(faces, axis = 1)), return_index = True)
+        self.repair_stats['duplicate_faces'] = int(len(faces) - len(first_indices))
+        return faces[np.sort(first_indices)]
+
+    # Returns (edge_keys, edge_counts, edge_inverse) where edge_keys is an (N * 3, 2) array of sorted vertex
+    #  pairs for each face edge, edge_counts is how many faces share each unique edge & edge_inverse maps
+    #  each face edge to its unique edge, face edge 'i' belongs to face 'i // 3'
+    @staticmethod
+    def return_edge_counts(faces = None):
+        """
+        # Copy/paste-able block
+        edge_keys, edge_counts, edge_inverse = Mesh_repair.return_edge_counts(faces = faces)
+        open_edge_count = np.count_nonzero(edge_counts == 1)
+        """
+        directed_edges = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+        edge_keys = np.sort(directed_edges, axis = 1)
+        unique_edges, edge_inverse, edge_counts = np.unique(Mesh_repair.return_row_keys(rows = edge_keys), return_inverse = True, return_counts = True)
+        return edge_keys, edge_counts, edge_inverse.reshape(-1)
+
+    # Returns faces flipped so neighbours agree on winding, then per connected part so that normals point outwards
+    def orient_faces(self, vertices = None, faces = None):
+        face_count = len(faces)
+        directed_edges = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+        edge_keys, edge_counts, edge_inverse = self.return_edge_counts(faces = faces)
+        # Pair up the two faces of every manifold edge, neighbours sharing an edge in the same direction disagree
+        order = np.argsort(edge_inverse, kind = 'mergesort')
+        shared = edge_counts[edge_inverse[order]] == 2
+        first = order[shared][0::2]
+        second = order[shared][1::2]
+        disagree = (directed_edges[first, 0] == directed_edges[second, 0]).astype(np.int8)
+        pair_faces = np.concatenate((first // 3, second // 3))
+        pair_neighbours = np.concatenate((second // 3, first // 3))
+        pair_disagree = np.concatenate((disagree, disagree))
+        by_face = np.argsort(pair_faces, kind = 'mergesort')
+        neighbour_starts = np.searchsorted(pair_faces[by_face], np.arange(face_count + 1))
+        neighbours = pair_neighbours[by_face].tolist()
+        neighbour_disagree = pair_disagree[by_face].tolist()
+        neighbour_starts = neighbour_starts.tolist()
+        # Walk each connected part breadth first, flipping faces that disagree with an already visited neighbour
+        flips = [0] * face_count
+        parts = [-1] * face_count
+        part_count = 0
+        for seed in range(face_count):
+            if parts[seed] != -1:
+                continue
+            parts[seed] = part_count
+            queue = [seed]
+            for face in queue:
+                for n in range(neighbour_starts[face], neighbour_starts[face + 1]):
+                    neighbour = neighbours[n]
+                    if parts[neighbour] == -1:
+                        parts[neighbour] = part_count
+                        flips[neighbour] = flips[face] ^ neighbour_disagree[n]
+                        queue.append(neighbour)
+            part_count += 1
+        flips = np.array(flips, dtype = bool)
+        parts = np.array(parts, dtype = np.int64)
+        faces = faces.copy()
+        faces[flips] = faces[flips][:, ::-1]
+        # Parts enclosing negative volume are inside out
+        corners = vertices[faces]
+        signed_volumes = (corners[:, 0] * np.cross(corners[:, 1], corners[:, 2])).sum(axis = 1)
+        part_volumes = np.zeros(part_count)
+        np.add.at(part_volumes, parts, signed_volumes)
+        inside_out = part_volumes[parts] < 0
+        faces[inside_out] = faces[inside_out][:, ::-1]
+        self.repair_stats['flipped_faces'] = int(np.count_nonzero(flips ^ inside_out))
+        return faces
+
+    # Returns (vertices, faces) after closing loops of open edges no longer than max_hole_edges,
+    #  triangles fan out from a new vertex at the centre of each loop
+    def fill_holes(self, vertices = None, faces = None):
+        self.repair_stats['filled_holes'] = 0
+        if not self.max_hole_edges or not len(faces):
+            return vertices, faces
+        directed_edges = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+        edge_keys, edge_counts, edge_inverse = self.return_edge_counts(faces = faces)
+        open_edges = directed_edges[edge_counts[edge_inverse] == 1]
+        # Holes are walked against the winding of the faces around them, so fill faces wind the same way
+        next_vertices = {}
+        ambiguous = set()
+        for start, end in open_edges[:, ::-1].tolist():
+            if start in next_vertices:
+                ambiguous.add(start)
+            next_vertices[start] = end
+        new_vertices = []
+        new_faces = []
+        visited = set()
+        for start in list(next_vertices):
+            if start in visited:
+                continue
+            loop = [start]
+            visited.add(start)
+            vertex = next_vertices[start]
+            while vertex != start and vertex in next_vertices and vertex not in visited and len(loop) <= self.max_hole_edges:
+                loop.append(vertex)
+                visited.add(vertex)
+                vertex = next_vertices[vertex]
+            if vertex != start or len(loop) < 3 or len(loop) > self.max_hole_edges or ambiguous.intersection(loop):
+                continue
+            if len(loop) == 3:
+                new_faces += [loop]
+            else:
+                centre_index = len(vertices) + len(new_vertices)
+                new_vertices += [vertices[loop].mean(axis = 0)]
+                new_faces += [[loop[i], loop[(i + 1) % len(loop)], centre_index] for i in range(len(loop))]
+            self.repair_stats['filled_holes'] += 1
+        if new_vertices:
+            vertices = np.concatenate((vertices, np.array(new_vertices)))
+        if new_faces:
+            faces = np.concatenate((faces, np.array(new_faces, dtype = faces.dtype)))
+        return vertices, faces
+
+    # Returns a one line summary of repair_stats
+    @staticmethod
+    def return_summary(repair_stats = None):
+        """
+        # Copy/paste-able block
+        print(Mesh_repair.return_summary(repair_stats = MR.repair_stats))
+        """
+        if repair_stats is None:
+            raise Exception('No repair_stats supplied to Mesh_repair.return_summary(repair_stats = "?")')
+        return ('welded {welded_vertices} vertices, removed {degenerate_faces} degenerate & {duplicate_faces} duplicate faces, '
+            'flipped {flipped_faces} faces, filled {filled_holes} holes, {open_edges} open edges left').format(**repair_stats)
+
+
 class OctoPrint(object):
     """
     Short cuts to OctoPrint methods
     """
-    def __init__(self, context = bpy.context):
+    def __init__(self, context = default_context):
         # Example of inheriting this class's values
         # super(OctoPrint, self).__init__()
         # self.arg = arg
@@ -576,6 +2757,7 @@ class OctoPrint(object):
         # Where to save uploaded files to
         self.octoprint_save_stl_dir = context.scene.octoprint_save_stl_dir
         self.octoprint_save_gcode_dir = context.scene.octoprint_save_gcode_dir
+        self.octoprint_skip_identical_uploads = context.scene.octoprint_skip_identical_uploads
         # Server file & directory listing settings
         self.octoprint_target_search_dir = context.scene.octoprint_target_search_dir
         self.octoprint_temp_dir = context.scene.octoprint_temp_dir
@@ -595,29 +2777,192 @@ class OctoPrint(object):
             self.host_url = context.scene.octoprint_host + ':' + context.scene.octoprint_port
         else:
             self.host_url = context.scene.octoprint_host
+        # Uploads through one instance are one batch, the listing they are checked against is refreshed once
+        self.listing_refreshed = False
+        self.listing_refresh_lock = threading.Lock()
+
+    # Listings keyed by URL, shared between instances, each {'etag': ..., 'last_modified': ..., 'listing': {...}}
+    file_listings = {}
+    file_listings_loaded = False
+    file_listings_lock = threading.Lock()
+    mkdir_lock = threading.Lock()
+    # (host_url, api_path, path) of directories made or found by mkdir this session
+    ensured_dirs = set()
+
+    # Returns listing URL for target_search_dir, or for octoprint_target_search_dir if not supplied
+    def return_listing_url(self, target_search_dir = None):
+        if target_search_dir is None:
+            target_search_dir = self.octoprint_target_search_dir
+        if target_search_dir and target_search_dir != 'RECURSIVE':
+            return '{0}{1}/{2}?recursive=true'.format(self.host_url, self.octoprint_api_path, target_search_dir.strip('/'))
+        return '{0}{1}?recursive=true'.format(self.host_url, self.octoprint_api_path)
+
+    # Returns parsed file listing, re-using cached listing when server answers 304 Not Modified
+    def return_file_listing(self, target_search_dir = None, refresh = True):
+        """
+        # Copy/paste-able block
+        OP = OctoPrint(context)
+        parsed_json = OP.return_file_listing(target_search_dir = None, refresh = True)
+        """
+        listing_url = self.return_listing_url(target_search_dir = target_search_dir)
+        self.load_file_listings()
+        cached = OctoPrint.file_listings.get(listing_url)
+        if cached and not refresh:
+            return cached['listing']
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        HTTP = self.return_http_client()
+        response = HTTP.request(method = 'GET', url = listing_url, headers = headers)
+        if response.status == 304 and cached:
+            if self.log_level == 'VERBOSE':
+                print('# OctoPrint file listing not modified, using cached copy of ', listing_url)
+            return cached['listing']
+        parsed_json = response.json()
+        OctoPrint.file_listings[listing_url] = {
+            'etag': response.headers.get('etag'),
+            'last_modified': response.headers.get('last-modified'),
+            'listing': parsed_json
+        }
+        self.save_file_listings()
+        return parsed_json
 
-    def download_json_file_listing(self, target_search_dir = None):
+    # Returns path to JSON file that file listings are cached within between sessions
+    def return_file_listings_path(self):
+        return os.path.join(self.octoprint_temp_dir, 'file_list_cache.json')
+
+    # Loads cached file listings once per session, ignoring missing or unreadable cache files
+    def load_file_listings(self):
+        with OctoPrint.file_listings_lock:
+            if OctoPrint.file_listings_loaded:
+                return
+            OctoPrint.file_listings_loaded = True
+            file_listings_path = self.return_file_listings_path()
+            if not os.path.exists(file_listings_path):
+                return
+            try:
+                with open(file_listings_path) as json_file:
+                    file_listings = json.load(json_file)
+            except (IOError, OSError, ValueError) as e:
+                print('# Ignoring unreadable OctoPrint file listing cache ', file_listings_path, e)
+                return
+            for listing_url, cached in file_listings.items():
+                OctoPrint.file_listings.setdefault(listing_url, cached)
+
+    # Writes cached file listings through a temporary file so a failed write keeps the previous cache
+    def save_file_listings(self):
+        file_listings_path = self.return_file_listings_path()
+        with OctoPrint.file_listings_lock:
+            try:
+                with open(file_listings_path + '.tmp', 'w') as json_file:
+                    json.dump(OctoPrint.file_listings, json_file)
+                os.replace(file_listings_path + '.tmp', file_listings_path)
+            except (IOError, OSError) as e:
+                print('# Could not save OctoPrint file listing cache ', file_listings_path, e)
+
+    # Returns {'dir/sub/name': entry} for every file & folder within a parsed listing
+    @staticmethod
+    def return_listing_entries(listing = None, parent_path = ''):
+        """
+        # Copy/paste-able block
+        entries = OctoPrint.return_listing_entries(listing = OP.return_file_listing(target_search_dir = 'RECURSIVE'))
+        """
+        if listing is None:
+            raise Exception('No listing supplied to OctoPrint.return_listing_entries(listing = "?")')
+        entries = {}
+        for entry in listing.get('files', listing.get('children', [])):
+            entry_path = '{0}{1}'.format(parent_path, entry['name'])
+            entries[entry_path] = entry
+            if entry.get('type') == 'folder':
+                entries.update(OctoPrint.return_listing_entries(listing = entry, parent_path = entry_path + '/'))
+        return entries
+
+    # Returns SHA1 hex digest of file at path, the same digest OctoPrint lists as 'hash' for stored files
+    @staticmethod
+    def return_file_hash(path = None, chunk_size = 65536):
+        """
+        # Copy/paste-able block
+        file_hash = OctoPrint.return_file_hash(path = '/tmp/Cube.gcode')
+        """
+        if path is None:
+            raise Exception('No path supplied to OctoPrint.return_file_hash(path = "?")')
+        file_hash = hashlib.sha1()
+        with open(path, 'rb') as hashed_file:
+            for chunk in iter(lambda: hashed_file.read(chunk_size), b''):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    # Returns recursive listing for checking uploads against, refreshed on the first call of this instance only
+    def return_batch_listing(self):
+        with self.listing_refresh_lock:
+            listing = self.return_file_listing(target_search_dir = 'RECURSIVE', refresh = not self.listing_refreshed)
+            self.listing_refreshed = True
+        return listing
+
+    # Adds an entry for a file uploaded or copied to 'target_path' to the cached recursive listing, so later
+    #  uploads of a batch see it without downloading the listing again
+    def record_listing_entry(self, target_path = None, file_hash = None):
+        with OctoPrint.file_listings_lock:
+            cached = OctoPrint.file_listings.get(self.return_listing_url(target_search_dir = 'RECURSIVE'))
+            if not cached:
+                return
+            entries = cached['listing'].setdefault('files', [])
+            path_names = target_path.split('/')
+            for depth, dir_name in enumerate(path_names[:-1]):
+                folder = None
+                for entry in entries:
+                    if entry.get('name') == dir_name and entry.get('type') == 'folder':
+                        folder = entry
+                        break
+                if folder is None:
+                    folder = {'name': dir_name, 'path': '/'.join(path_names[:depth + 1]), 'type': 'folder', 'children': []}
+                    entries.append(folder)
+                entries = folder.setdefault('children', [])
+            file_type = 'machinecode' if target_path.lower().endswith(('.gcode', '.gco', '.g')) else 'model'
+            entries[:] = [entry for entry in entries if entry.get('name') != path_names[-1]]
+            entries.append({'name': path_names[-1], 'path': target_path, 'type': file_type, 'hash': file_hash, 'origin': 'local'})
+
+    # Returns None if an identical file already exists at upload target, response of a server side
+    #  copy if an identical file of the same name exists elsewhere on the server, else False
+    def deduplicate_upload(self, upload_path = None, save_dir = '', file_hash = None):
         """
         # Copy/paste-able block
         OP = OctoPrint(context)
-        OP.download_json_file_listing(target_search_dir = None)
-        """
-        SP = SubProcess()
-        download_file_path = os.path.join(self.octoprint_temp_dir, 'file_list.json')
-        curl_header = self.return_curl_header_lists()
-        curl_ops = curl_header.curl_ops
-        curl_log = curl_header.curl_log
-        if self.octoprint_target_search_dir and self.octoprint_target_search_dir != 'RECURSIVE':
-            curl_ops += ['{0}{1}/{2}?recursive=true'.format(self.host_url, self.octoprint_api_path, self.octoprint_target_search_dir), '-o', download_file_path]
-            if self.log_level != 'QUITE':
-                curl_log += ['{0}{1}/{2}?recursive=true'.format(self.host_url, self.octoprint_api_path, target_search_dir), '-o', download_file_path]
-        else:
-            curl_ops += ['{0}{1}?recursive=true'.format(self.host_url, self.octoprint_api_path), '-o', download_file_path]
-            if self.log_level != 'QUITE':
-                curl_log += ['{0}{1}?recursive=true'.format(self.host_url, self.octoprint_api_path), '-o', download_file_path]
-        octoprint_download_json_file_listing_output = SP.curl_check_call(ops = curl_ops, log_ops = curl_log)
-        # return octoprint_download_json_file_listing_output
-        return download_file_path
+        deduplicated_output = OP.deduplicate_upload(upload_path = '/tmp/Cube.gcode', save_dir = 'gcode', file_hash = None)
+        # The listing is downloaded once per OctoPrint instance, see return_batch_listing
+        """
+        if upload_path is None:
+            raise Exception('No upload_path supplied to OctoPrint.deduplicate_upload(upload_path = "?")')
+        file_name = os.path.basename(upload_path)
+        save_dir = save_dir.strip('/')
+        target_path = '{0}/{1}'.format(save_dir, file_name) if save_dir else file_name
+        try:
+            listing = self.return_batch_listing()
+        except (Http_error, http.client.HTTPException, OSError, ValueError) as e:
+            print('# Could not check OctoPrint file listing for {0}, uploading anyway: {1}'.format(file_name, e))
+            return False
+        entries = OctoPrint.return_listing_entries(listing = listing)
+        if file_hash is None:
+            file_hash = OctoPrint.return_file_hash(path = upload_path)
+        target_entry = entries.get(target_path)
+        if target_entry is not None:
+            if target_entry.get('hash') == file_hash:
+                print('# Skipping upload of {0}, identical file already at {1}'.format(file_name, target_path))
+                return None
+            return False
+        for entry_path, entry in entries.items():
+            if entry.get('type') == 'folder' or entry.get('name') != file_name or entry.get('hash') != file_hash:
+                continue
+            print('# Copying identical file {0} to {1} server side instead of uploading'.format(entry_path, target_path))
+            HTTP = self.return_http_client()
+            copy_output = HTTP.request(method = 'POST', url = '{0}{1}/{2}'.format(self.host_url, self.octoprint_api_path,
+                urllib.parse.quote(entry_path)), json_body = {'command': 'copy', 'destination': save_dir})
+            self.record_listing_entry(target_path = target_path, file_hash = file_hash)
+            return copy_output
+        return False
 
     def return_file_list_as_object(self, dict_obj = None, root_dir = True):
         output = Formatted_output()
@@ -640,33 +2985,22 @@ class OctoPrint(object):
                 output.octoprint_model_files += [item]
         return output
 
-    def return_curl_header_lists(self):
+    # Returns Http_client with X-Api-Key & authentication headers, plus scrubbed copies for logging
+    def return_http_client(self):
         """
         # Copy/paste-able block
-        curl_header = self.return_curl_header_lists()
-        curl_ops = curl_header.curl_ops
-        curl_log = curl_header.curl_log
+        HTTP = self.return_http_client()
+        response = HTTP.request(method = 'GET', url = '{0}{1}'.format(self.host_url, self.octoprint_api_path))
         """
-        output = Formatted_output()
-        curl_ops = ['-f', '-k', '--connect-timeout', '15']
-        curl_log = []
-        if self.log_level != 'QUITE':
-            curl_log.extend(curl_ops)
+        headers = {}
+        log_headers = {}
         if self.octoprint_x_api_key:
-            curl_ops += ['-H', 'X-Api-Key: {0}'.format(self.octoprint_x_api_key)]
-            if self.log_level == 'VERBOSE':
-                curl_log += ['-H', 'X-Api-Key: {0}'.format(self.octoprint_x_api_key)]
-            elif self.log_level == 'SCRUBBED':
-                curl_log += ['-H', 'X-Api-Key: X-API-KEY']
+            headers['X-Api-Key'] = self.octoprint_x_api_key
+            log_headers['X-Api-Key'] = 'X-API-KEY'
         if self.octoprint_user and self.octoprint_pass:
-            curl_ops += ['-u', '{0}:{1}'.format(self.octoprint_user, self.octoprint_pass)]
-            if self.log_level == 'VERBOSE':
-                curl_log += ['-u', '{0}:{1}'.format(self.octoprint_user, self.octoprint_pass)]
-            elif self.log_level == 'SCRUBBED':
-                curl_log += ['-u', 'USER:PASS']
-        output.curl_ops = curl_ops
-        output.curl_log = curl_log
-        return output
+            headers['Authorization'] = Http_client.return_basic_auth(user = self.octoprint_user, passphrase = self.octoprint_pass)
+            log_headers['Authorization'] = 'Basic USER:PASS'
+        return Http_client(headers = headers, log_headers = log_headers, log_level = self.log_level)
 
     def upload_file(self, gcode_path = None, stl_path = None):
         """
@@ -674,43 +3008,30 @@ class OctoPrint(object):
         OP = OctoPrint(context)
         OP.upload_file(gcode_path = None, stl_path = None)
         """
-        SP = SubProcess()
-        if gcode_path:
-            file_name = bpy.path.basename(gcode_path)
-        elif stl_path:
-            file_name = bpy.path.basename(stl_path)
-        # Build an array of options to send to curl command
-        curl_header = self.return_curl_header_lists()
-        # print('## curl_header:', curl_header)
-        # print('## self.return_curl_header_lists()', self.return_curl_header_lists())
-        curl_ops = curl_header.curl_ops
-        curl_log = curl_header.curl_log
-        curl_ops += ['-H', 'Content-Type: multipart/form-data']
-        if self.log_level != 'QUITE':
-            curl_log += ['-H', 'Content-Type: multipart/form-data']
+        HTTP = self.return_http_client()
+        fields = {}
         if gcode_path:
-            if gcode_dir:
-                curl_ops += ['-F', 'path={0}/{1}'.format(self.octoprint_save_gcode_dir, file_name)]
-                if self.log_level != 'QUITE':
-                    curl_log += ['-F', 'path={0}/{1}'.format(self.octoprint_save_gcode_dir, file_name)]
+            upload_path = gcode_path
+            save_dir = self.octoprint_save_gcode_dir
         elif stl_path:
-            if self.octoprint_save_stl_dir:
-                curl_ops += ['-F', 'path={0}/'.format(self.octoprint_save_stl_dir)]
-                if self.log_level != 'QUITE':
-                    curl_log += ['-F', 'path={0}/'.format(self.octoprint_save_stl_dir)]
-        if gcode_path:
-            curl_ops += ['-F', 'file=@{0}'.format(gcode_path), '{0}{1}'.format(self.host_url, self.octoprint_api_path),]
-            if self.log_level == 'VERBOSE':
-                curl_log += ['-F', 'file=@{0}'.format(gcode_path), '{0}{1}'.format(self.host_url, self.octoprint_api_path),]
-            elif self.log_level == 'SCRUBBED':
-                curl_log += ['-F', 'file=@{0}'.format(gcode_path), 'HOST{0}'.format(api_path),]
-        elif stl_path:
-            curl_ops += ['-F', 'file=@{0}'.format(stl_path), '{0}{1}'.format(self.host_url, self.octoprint_api_path),]
-            if self.log_level == 'VERBOSE':
-                curl_log += ['-F', 'file=@{0}'.format(stl_path), '{0}{1}'.format(self.host_url, self.octoprint_api_path),]
-            elif self.log_level == 'SCRUBBED':
-                curl_log += ['-F', 'file=@{0}'.format(stl_path), 'HOST{0}'.format(self.octoprint_api_path),]
-        upload_file_output = SP.curl_check_call(ops = curl_ops, log_ops = curl_log)
+            upload_path = stl_path
+            save_dir = self.octoprint_save_stl_dir
+        else:
+            raise Exception('No gcode_path or stl_path supplied to OctoPrint.upload_file')
+        if save_dir:
+            fields['path'] = '{0}/'.format(save_dir)
+            self.mkdir(path = save_dir, refresh = False)
+        # Returns None when skipped, as identical file is already on server
+        if self.octoprint_skip_identical_uploads:
+            file_hash = OctoPrint.return_file_hash(path = upload_path)
+            deduplicated_output = self.deduplicate_upload(upload_path = upload_path, save_dir = save_dir, file_hash = file_hash)
+            if deduplicated_output is not False:
+                return deduplicated_output
+        upload_file_output = HTTP.request(method = 'POST', url = '{0}{1}'.format(self.host_url, self.octoprint_api_path),
+            fields = fields, files = {'file': upload_path})
+        if self.octoprint_skip_identical_uploads:
+            target_path = '/'.join(name for name in (save_dir.strip('/'), os.path.basename(upload_path)) if name)
+            self.record_listing_entry(target_path = target_path, file_hash = file_hash)
         return upload_file_output
 
     def slice_stl(self, stl_path=''):
@@ -719,131 +3040,106 @@ class OctoPrint(object):
         OP = OctoPrint(context)
         OP.slice_stl(stl_path = None)
         """
-        SP = SubProcess()
-        stl_name = bpy.path.basename(stl_path)
+        HTTP = self.return_http_client()
+        stl_name = os.path.basename(stl_path)
         stl_file_name = stl_name.split('.')
         sliced_gcode_name = '{0}.gcode'.format(stl_file_name[0])
-        curl_header = self.return_curl_header_lists()
-        curl_ops = curl_header.curl_ops
-        curl_log = curl_header.curl_log
-        curl_ops += ['-X', 'POST', '-H', 'Content-Type: application/json']
-        if self.log_level != 'QUITE':
-            curl_log += ['-X', 'POST', '-H', 'Content-Type: application/json']
-        slicer_ops = ['"command": "{0}", '.format('slice')]
-        slicer_ops += ['"slicer": "{0}", '.format(self.octoprint_slice_slicer)]
-        slicer_ops += ['"gcode": "{0}", '.format(sliced_gcode_name)]
+        slicer_ops = {'command': 'slice', 'slicer': self.octoprint_slice_slicer, 'gcode': sliced_gcode_name}
         if self.octoprint_slice_printerProfile:
-            slicer_ops += ['"printerProfile": "{0}", '.format(self.octoprint_slice_printerProfile)]
+            slicer_ops['printerProfile'] = self.octoprint_slice_printerProfile
         if self.octoprint_slice_Profile:
-            slicer_ops += ['"profile": "{0}", '.format(self.octoprint_slice_Profile)]
+            slicer_ops['profile'] = self.octoprint_slice_Profile
         if self.octoprint_slice_Profile_ops:
-            profile_ops = []
-            for profile_op in enumerate(self.octoprint_slice_Profile_ops.split(', ')):
-                split_profile_op = profile_op[1].split(':')
-                if split_profile_op[0] and split_profile_op[1]:
-                    # Format and add to main slicer_ops list
-                    slicer_ops += ['"profile.{0}": {1}, '.format(split_profile_op[0], split_profile_op[1])]
+            for profile_op in self.octoprint_slice_Profile_ops.split(', '):
+                split_profile_op = profile_op.split(':', 1)
+                if len(split_profile_op) == 2 and split_profile_op[0] and split_profile_op[1]:
+                    # Values are sent as JSON numbers or booleans where possible, otherwise as strings
+                    try:
+                        profile_value = json.loads(split_profile_op[1])
+                    except ValueError:
+                        profile_value = split_profile_op[1]
+                    slicer_ops['profile.{0}'.format(split_profile_op[0])] = profile_value
         if self.octoprint_slice_position_x and self.octoprint_slice_position_y:
-            slicer_ops += ['"position": {"x": {0}, "y": {1}}, '.format(self.octoprint_slice_position_x, self.octoprint_slice_position_y)]
+            slicer_ops['position'] = {'x': self.octoprint_slice_position_x, 'y': self.octoprint_slice_position_y}
         else:
-            slicer_ops += ['"position": {"x": 0, "y": 0}, ']
-        slicer_ops += ['"print": false']
-        # Convert slicer_ops list to string before adding to curl_ops list
-        slicer_string = ''.join(slicer_ops)
-        curl_ops += ['-d', '{'+slicer_string+'}']
-        if self.log_level != 'QUITE':
-            curl_log += ['-d', '{'+slicer_string+'}']
-
-        # Finalize curl options with the URL to the uploaded STL file
+            slicer_ops['position'] = {'x': 0, 'y': 0}
+        slicer_ops['print'] = False
+        # Finalize request with the URL to the uploaded STL file
         if self.octoprint_save_stl_dir:
-            curl_ops += ['{0}{1}/{2}/{3}'.format(self.host_url, self.octoprint_api_path, self.octoprint_save_stl_dir, stl_name)]
-            if self.log_level == 'VERBOSE':
-                curl_log += ['{0}{1}/{2}/{3}'.format(self.host_url, self.octoprint_api_path, self.octoprint_save_stl_dir, stl_name)]
-            elif self.log_level == 'SCRUBBED':
-                curl_log += ['HOST/{0}/{1}/{2}'.format(self.octoprint_api_path, self.octoprint_save_stl_dir, stl_name)]
+            slice_url = '{0}{1}/{2}/{3}'.format(self.host_url, self.octoprint_api_path, self.octoprint_save_stl_dir, stl_name)
         else:
-            curl_ops += ['{0}{1}/{2}'.format(self.host_url, self.octoprint_api_path, stl_name)]
-            if self.log_level == 'VERBOSE':
-                curl_log += ['{0}{1}/{2}'.format(self.host_url, self.octoprint_api_path, stl_name)]
-            elif self.log_level == 'SCRUBBED':
-                curl_log += ['HOST/{0}/{1}'.format(self.octoprint_api_path, stl_name)]
-        slice_stl_output = SP.curl_check_call(ops = curl_ops, log_ops = curl_log)
+            slice_url = '{0}{1}/{2}'.format(self.host_url, self.octoprint_api_path, stl_name)
+        slice_stl_output = HTTP.request(method = 'POST', url = slice_url, json_body = slicer_ops)
         return slice_stl_output
 
-    def mkdir(self, path=''):
+    # Returns dictionary of 'online', 'busy', 'state' text & 'time_left' seconds of the current print, from /api/printer & /api/job
+    def return_printer_state(self):
         """
         # Copy/paste-able block
         OP = OctoPrint(context)
-        OP.mkdir(path = None)
-        """
-        SP = SubProcess()
-        exsistent_dirs = ''
-        for dir in enumerate(path.split('/')):
-            if exsistent_dirs:
-                print('# Existent dirs #', exsistent_dirs)
-                check_dir = exsistent_dirs + '/' + dir[1]
-            else:
-                check_dir = dir[1]
-            try:
-                curl_header = self.return_curl_header_lists()
-                curl_ops = curl_header.curl_ops
-                curl_log = curl_header.curl_log
-                curl_ops += ['-G']
-                if self.log_level != 'QUITE':
-                    curl_log += ['-G']
-                curl_ops += ['-H', 'recursive=true', '{0}{1}/{2}'.format(self.host_url, self.octoprint_api_path, check_dir)]
-                if self.log_level != 'QUITE':
-                    curl_log += ['-H', 'recursive=true', '{0}{1}/{2}'.format(self.host_url, self.octoprint_api_path, check_dir)]
-                check_dir_output = SP.curl_check_call(ops = curl_ops, log_ops = curl_log)
-                return check_dir_output
-            except subprocess.CalledProcessError as process_error:
-                print('# Directory does NOT exist #', dir[1])
-                if exsistent_dirs:
-                    dir_path = exsistent_dirs
-                    new_dir = dir[1]
-                    curl_header = self.return_curl_header_lists()
-                    curl_ops = curl_header.curl_ops
-                    curl_log = curl_header.curl_log
-                    curl_ops += ['-H', 'Content-Type: multipart/form-data', '-F', 'foldername={0}'.format(new_dir)]
-                    curl_ops += ['{0}{1}'.format(self.host_url, self.octoprint_api_path)]
-                    if self.log_level != 'QUITE':
-                        curl_log += ['-H', 'Content-Type: multipart/form-data', '-F', 'foldername={0}'.format(new_dir)]
-                        curl_log += ['{0}{1}'.format(self.host_url, self.octoprint_api_path)]
-                    check_dir_output = SP.curl_check_call(ops = curl_ops, log_ops = curl_log)
-                    return check_dir_output
-                else:
-                    dir_path = ''
-                    new_dir = dir[1]
-                    curl_header = self.return_curl_header_lists()
-                    curl_ops = curl_header.curl_ops
-                    curl_log = curl_header.curl_log
-                    curl_ops += ['-H', 'Content-Type: multipart/form-data', '-F', 'foldername={0}'.format(new_dir)]
-                    curl_ops += ['{0}{1}'.format(self.host_url, self.octoprint_api_path)]
-                    if self.log_level != 'QUITE':
-                        curl_log += ['-H', 'Content-Type: multipart/form-data', '-F', 'foldername={0}'.format(new_dir)]
-                        curl_log += ['{0}{1}'.format(self.host_url, self.octoprint_api_path)]
-                    check_dir_output = SP.curl_check_call(ops = curl_ops, log_ops = curl_log)
-                    return check_dir_output
-            exsistent_dirs += check_dir
-        # After all that, return the directory path checked/made
-        return path
-
-    # Returns parsed json to dictionary from: json.load(json_file)
-    @staticmethod
-    def return_file_listing_dict_json(json_file_path = None):
+        printer_state = OP.return_printer_state()
+        # 'time_left' is None while idle or when OctoPrint has no estimate yet
+        """
+        HTTP = self.return_http_client()
+        # Files are served below the API root, '/api/files/local' by default
+        api_root = '{0}{1}'.format(self.host_url, self.octoprint_api_path.split('/files', 1)[0])
+        try:
+            printer = HTTP.request(method = 'GET', url = '{0}/printer?exclude=temperature,sd'.format(api_root)).json()
+        except Http_error as http_error:
+            # 409 Conflict, OctoPrint is up but no printer is connected to it
+            if http_error.status != 409:
+                raise
+            return {'online': False, 'busy': False, 'state': 'Not connected', 'time_left': None}
+        flags = printer.get('state', {}).get('flags', {})
+        printer_state = {
+            'online': bool(flags.get('operational')) and not flags.get('error') and not flags.get('closedOrError'),
+            'busy': bool(flags.get('printing') or flags.get('paused') or flags.get('pausing') or flags.get('cancelling')),
+            'state': printer.get('state', {}).get('text'),
+            'time_left': None}
+        if printer_state['busy']:
+            job = HTTP.request(method = 'GET', url = '{0}/job'.format(api_root)).json()
+            printer_state['time_left'] = (job.get('progress') or {}).get('printTimeLeft')
+        return printer_state
+
+    # Returns path after creating any of its folders missing from one recursive listing of the server, in order,
+    #  if not refresh paths already ensured this session are not checked again
+    def mkdir(self, path='', refresh = True):
         """
         # Copy/paste-able block
-        parsed_json = OctoPrint.return_file_listing_dict_json(json_file_path = None)
+        OP = OctoPrint(context)
+        OP.mkdir(path = None, refresh = True)
         """
-        if not os.path.exists(json_file_path):
-            raise Exception('Could not find json file: {0}'.format(json_file_path))
-        #BLDR = Blender
-        #json_file_obj = BLDR.import_text(path = json_file_path)
-        #parsed_json = json.load(json_file_obj)
-        #return parsed_json
-        with open(json_file_path) as json_file:
-            parsed_json = json.load(json_file)
-        return parsed_json
+        dir_names = [dir_name for dir_name in path.strip('/').split('/') if dir_name]
+        if not dir_names:
+            return path
+        ensured_key = (self.host_url, self.octoprint_api_path, '/'.join(dir_names))
+        # Serialized so concurrent uploads to one new folder do not race to create it
+        with OctoPrint.mkdir_lock:
+            if not refresh and ensured_key in OctoPrint.ensured_dirs:
+                return path
+            entries = OctoPrint.return_listing_entries(listing = self.return_file_listing(target_search_dir = 'RECURSIVE'))
+            HTTP = self.return_http_client()
+            exsistent_dirs = ''
+            for dir_name in dir_names:
+                check_dir = '{0}/{1}'.format(exsistent_dirs, dir_name) if exsistent_dirs else dir_name
+                entry = entries.get(check_dir)
+                if entry is not None and entry.get('type') != 'folder':
+                    raise Exception('OctoPrint.mkdir path component is a file: {0}'.format(check_dir))
+                if entry is None:
+                    print('# Directory does NOT exist #', check_dir)
+                    fields = {'foldername': dir_name}
+                    if exsistent_dirs:
+                        fields['path'] = exsistent_dirs
+                    try:
+                        HTTP.request(method = 'POST', url = '{0}{1}'.format(self.host_url, self.octoprint_api_path), fields = fields)
+                    except Http_error as http_error:
+                        # 409 Conflict, folder was made since the listing was fetched
+                        if http_error.status != 409:
+                            raise
+                exsistent_dirs = check_dir
+            OctoPrint.ensured_dirs.add(ensured_key)
+        # After all that, return the directory path checked/made
+        return path
 
     @staticmethod
     def print_space_statistics(json_dict = None):
@@ -952,8 +3248,8 @@ class Os(object):
         """
         dir_path = Os.path_exists(path = path)
         if dir_path is False:
-            mkdir_output = os.makedirs(dir_path)
-            return_output = dir_path
+            mkdir_output = os.makedirs(path)
+            return_output = path
         else:
             return_output = False
         print('# Os.mkdir returning: {0}'.format(return_output))
@@ -992,9 +3288,344 @@ class Os(object):
         return return_output
 
 
+class Printer_farm(object):
+    """
+    # This class reads a JSON registry of OctoPrint & Repetier hosts, each with its own API key &
+    #  capabilities, queries printer state & job progress of every host at once, one thread per
+    #  host, then routes each GCode file to the compatible printer that is idle or will be free
+    #  soonest, counting estimated print times of files it has already sent there.
+    # Example of a registry file, capabilities are compared against requirements of each job &
+    #  'build_volume' against GCode 'dimensions' when an analysis is supplied
+    {"printers": [
+        {"name": "Prusa 1", "server": "OctoPrint", "host": "http://192.168.0.11", "port": "80", "api_key": "KEY",
+            "save_gcode_dir": "farm", "capabilities": {"nozzle_diameter": 0.4, "filament": ["PLA", "PETG"], "build_volume": [250, 210, 200]}},
+        {"name": "Delta", "server": "Repetier", "host": "http://192.168.0.12", "port": "3344", "api_key": "KEY", "slug": "Delta",
+            "capabilities": {"nozzle_diameter": 0.6, "filament": "PLA", "build_volume": [180, 180, 300]}}]}
+    # Example of routing & uploading sliced GCode
+    farm = Printer_farm(context)
+    farm.refresh()
+    printer = farm.dispatch(gcode_path = '/tmp/Cube.gcode', requirements = {'filament': 'PLA'}, gcode_analysis = gcode_analysis)
+    for line in farm.return_report():
+        print(line)
+    """
+    # Seconds assumed left of prints that report no estimate, & of files routed without an analysis
+    unknown_print_seconds = 3600
+
+    def __init__(self, context = default_context):
+        self.context = context
+        self.log_level = context.scene.log_level
+        self.registry_path = context.scene.farm_registry_path
+        self.requirements = Printer_farm.return_requirements(requirements_text = context.scene.farm_job_requirements)
+        self.printers = [self.return_printer(entry = entry) for entry in Printer_farm.load_registry(registry_path = self.registry_path)]
+        self.refresh_thread = None
+        self.lock = threading.Lock()
+
+    # Returns list of printer entries within JSON file at 'registry_path', each checked for the keys routing needs
+    @staticmethod
+    def load_registry(registry_path = None):
+        """
+        # Copy/paste-able block
+        entries = Printer_farm.load_registry(registry_path = '/home/user/farm.json')
+        """
+        if not registry_path:
+            raise Exception('No registry_path supplied to Printer_farm.load_registry(registry_path = "?")')
+        if not os.path.exists(registry_path):
+            raise Exception('Could not find farm registry file: {0}'.format(registry_path))
+        with open(registry_path) as registry_file:
+            registry = json.load(registry_file)
+        entries = registry.get('printers', []) if isinstance(registry, dict) else registry
+        names = []
+        for entry in entries:
+            for key in ('name', 'server', 'host'):
+                if not entry.get(key):
+                    raise Exception('Printer within farm registry {0} is missing "{1}": {2}'.format(registry_path, key, entry))
+            if entry['server'] not in ('OctoPrint', 'Repetier'):
+                raise Exception('Printer {0} within farm registry has unknown server: {1}'.format(entry['name'], entry['server']))
+            if entry['name'] in names:
+                raise Exception('Printer name used twice within farm registry: {0}'.format(entry['name']))
+            names += [entry['name']]
+        if not entries:
+            raise Exception('No printers listed within farm registry: {0}'.format(registry_path))
+        return entries
+
+    # Returns dictionary of requirement names & values from 'key:value, key:value' text, values parsed as JSON where possible
+    @staticmethod
+    def return_requirements(requirements_text = ''):
+        requirements = {}
+        for requirement in requirements_text.split(','):
+            split_requirement = requirement.strip().split(':', 1)
+            if len(split_requirement) == 2 and split_requirement[0] and split_requirement[1]:
+                try:
+                    requirements[split_requirement[0].strip()] = json.loads(split_requirement[1])
+                except ValueError:
+                    requirements[split_requirement[0].strip()] = split_requirement[1].strip()
+        return requirements
+
+    # Returns printer dictionary with an OctoPrint or Repetier instance using settings of this context & the registry entry
+    def return_printer(self, entry = None):
+        settings = Settings.from_context(context = self.context)
+        scene = settings.scene
+        if entry['server'] == 'OctoPrint':
+            scene.octoprint_host = entry['host']
+            scene.octoprint_port = str(entry.get('port', ''))
+            scene.octoprint_x_api_key = entry.get('api_key', '')
+            scene.octoprint_user = entry.get('user', '')
+            scene.octoprint_pass = entry.get('pass', '')
+            scene.octoprint_save_gcode_dir = entry.get('save_gcode_dir', scene.octoprint_save_gcode_dir)
+            client = OctoPrint(context = settings)
+        else:
+            scene.repetier_host = entry['host']
+            scene.repetier_port = str(entry.get('port', ''))
+            scene.repetier_x_api_key = entry.get('api_key', '')
+            scene.repetier_user = entry.get('user', '')
+            scene.repetier_pass = entry.get('pass', '')
+            scene.repetier_save_gcode_dir = entry.get('slug', scene.repetier_save_gcode_dir)
+            client = Repetier(context = settings)
+        return {
+            'name': entry['name'],
+            'server': entry['server'],
+            'capabilities': entry.get('capabilities', {}),
+            'client': client,
+            'host_url': client.host_url,
+            'state': None,
+            'queued_seconds': 0.0,
+            'queued_files': []}
+
+    # Returns printers after querying the state of every one at once, hosts that fail to answer are marked offline
+    def refresh(self):
+        """
+        # Copy/paste-able block
+        printers = farm.refresh()
+        """
+        threads = [threading.Thread(target = self.query_printer, args = (printer,)) for printer in self.printers]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        online_count = len([printer for printer in self.printers if printer['state']['online']])
+        print('# Printer_farm found {0} of {1} printers online'.format(online_count, len(self.printers)))
+        return self.printers
+
+    # Starts refresh within a thread, so hosts are queried while slicers run, see wait_refresh
+    def refresh_async(self):
+        self.refresh_thread = threading.Thread(target = self.refresh)
+        self.refresh_thread.daemon = True
+        self.refresh_thread.start()
+
+    # Blocks until a refresh started by refresh_async finishes, refreshing now if printers were never queried
+    def wait_refresh(self):
+        if self.refresh_thread is not None:
+            self.refresh_thread.join()
+        elif any(printer['state'] is None for printer in self.printers):
+            self.refresh()
+
+    # Sets 'state' of 'printer', no bpy access allowed here as this runs within a thread
+    def query_printer(self, printer = None):
+        try:
+            printer['state'] = printer['client'].return_printer_state()
+        except Exception as error:
+            printer['state'] = {'online': False, 'busy': False, 'state': 'Error: {0}'.format(error), 'time_left': None}
+
+    # Returns 'True' if 'capabilities' meet every one of 'requirements', plus fit GCode 'dimensions' if an analysis is given
+    @staticmethod
+    def return_compatible(capabilities = None, requirements = None, gcode_analysis = None):
+        for key, value in (requirements or {}).items():
+            capability = capabilities.get(key)
+            if capability is None:
+                return False
+            allowed_values = capability if isinstance(capability, list) else [capability]
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                if not any(isinstance(allowed, (int, float)) and abs(allowed - value) < 1e-6 for allowed in allowed_values):
+                    return False
+            elif str(value).lower() not in [str(allowed).lower() for allowed in allowed_values]:
+                return False
+        build_volume = capabilities.get('build_volume')
+        if build_volume and gcode_analysis and gcode_analysis.get('dimensions'):
+            dimensions = gcode_analysis['dimensions']
+            for size, limit in zip((dimensions['width'], dimensions['depth'], dimensions['height']), build_volume):
+                if size > limit:
+                    return False
+        return True
+
+    # Returns seconds until 'printer' would finish its current print & every file routed to it so far
+    def return_free_seconds(self, printer = None):
+        free_seconds = printer['queued_seconds']
+        if printer['state']['busy']:
+            time_left = printer['state']['time_left']
+            free_seconds += time_left if time_left is not None else Printer_farm.unknown_print_seconds
+        return free_seconds
+
+    # Returns printer dictionary chosen for 'gcode_path', the online compatible printer free soonest, recording the file against it
+    def assign(self, gcode_path = None, requirements = None, gcode_analysis = None):
+        """
+        # Copy/paste-able block
+        printer = farm.assign(gcode_path = '/tmp/Cube.gcode', requirements = None, gcode_analysis = None)
+        # Requirements default to those of 'farm_job_requirements'
+        """
+        if gcode_path is None:
+            raise Exception('No gcode_path supplied to Printer_farm.assign(gcode_path = "?")')
+        self.wait_refresh()
+        if requirements is None:
+            requirements = self.requirements
+        with self.lock:
+            candidates = [printer for printer in self.printers if printer['state'] and printer['state']['online'] and
+                Printer_farm.return_compatible(capabilities = printer['capabilities'], requirements = requirements, gcode_analysis = gcode_analysis)]
+            if not candidates:
+                raise Exception('No online printer within farm is compatible with {0} & requirements {1}'.format(os.path.basename(gcode_path), requirements))
+            # Ties go to the first listed, so a registry may be ordered by preference
+            printer = min(candidates, key = self.return_free_seconds)
+            if gcode_analysis and gcode_analysis.get('estimatedPrintTime') is not None:
+                printer['queued_seconds'] += gcode_analysis['estimatedPrintTime']
+            else:
+                printer['queued_seconds'] += Printer_farm.unknown_print_seconds
+            printer['queued_files'] += [gcode_path]
+        return printer
+
+    # Returns printer that 'gcode_path' was routed to, uploading within 'uploads' if an Upload_dispatcher is supplied, else right away
+    def dispatch(self, gcode_path = None, requirements = None, gcode_analysis = None, uploads = None):
+        """
+        # Copy/paste-able block
+        printer = farm.dispatch(gcode_path = '/tmp/Cube.gcode', requirements = None, gcode_analysis = None, uploads = None)
+        """
+        printer = self.assign(gcode_path = gcode_path, requirements = requirements, gcode_analysis = gcode_analysis)
+        if printer['server'] == 'OctoPrint':
+            function = printer['client'].upload_file
+        else:
+            function = printer['client'].upload_gcode
+        print('# Printer_farm routing {0} to {1}'.format(gcode_path, printer['name']))
+        if uploads is not None:
+            uploads.add(function = function, host = printer['host_url'], name = gcode_path, gcode_path = gcode_path)
+        else:
+            function(gcode_path = gcode_path)
+        return printer
+
+    # Returns list of table rows, one per printer with its state, seconds until free & files routed to it
+    def return_report(self):
+        row_format = '{0:<16} {1:<10} {2:<24} {3:>10} {4:>6}'
+        report = [row_format.format('Printer', 'Server', 'State', 'Free in', 'Files')]
+        for printer in self.printers:
+            if printer['state'] is None:
+                state = 'Not queried'
+                free_in = ''
+            else:
+                state = printer['state']['state'] or ('Online' if printer['state']['online'] else 'Offline')
+                free_in = Slice_tracker.return_duration(seconds = self.return_free_seconds(printer = printer)) if printer['state']['online'] else ''
+            report += [row_format.format(printer['name'][:16], printer['server'], str(state)[:24], free_in, len(printer['queued_files']))]
+        return report
+
+
+class Process_pool(object):
+    """
+    # This class runs queued commands as subprocesses with no more than 'max_jobs' running at once
+    #  across every pool, so that queued Slice_job & repair runs do not multiply slicer processes,
+    #  & collects exit codes as each process finishes, rather than blocking on one at a time
+    #  like SubProcess check_call short-cuts do.
+    # Example of slicing many STL files
+    pool = Process_pool(max_jobs = 0)
+    for stl_path in stl_paths:
+        pool.add(command = SLCR.return_slice_command(stl_path = stl_path, gcode_path = gcode_path), name = gcode_path)
+    for job in pool.wait():
+        print(job['name'], job['returncode'])
+    """
+    # Processes running across every pool, guarded by slots_lock
+    running_total = 0
+    slots_lock = threading.Lock()
+
+    def __init__(self, max_jobs = 0):
+        # Zero or less means one job per CPU
+        if not max_jobs or max_jobs < 1:
+            max_jobs = os.cpu_count() or 1
+        self.max_jobs = max_jobs
+        self.queued_jobs = []
+        self.running_jobs = []
+        self.finished_jobs = []
+
+    # Returns job dictionary after queuing 'command', extra keyword arguments are kept on the job
+    def add(self, command = None, name = None, **job_attributes):
+        """
+        # Copy/paste-able block
+        job = pool.add(command = ['slic3r', '--output', '/tmp/Cube.gcode', '/tmp/Cube.stl'], name = 'Cube')
+        """
+        if not command:
+            raise Exception('No command supplied to Process_pool.add(command = "?")')
+        job = dict(job_attributes)
+        job['name'] = name or command[0]
+        job['command'] = command
+        job['process'] = None
+        job['returncode'] = None
+        job['start_time'] = None
+        job['end_time'] = None
+        self.queued_jobs.append(job)
+        return job
+
+    # Returns list of jobs that finished since last call after starting queued jobs into free slots
+    def poll(self):
+        """
+        # Copy/paste-able block
+        finished_jobs = pool.poll()
+        # Never blocks, so this is safe to call from a timer or modal operator
+        """
+        newly_finished = []
+        for job in list(self.running_jobs):
+            returncode = job['process'].poll()
+            if returncode is not None:
+                newly_finished.append(self.finish_job(job = job, returncode = returncode))
+        with Process_pool.slots_lock:
+            while self.queued_jobs and Process_pool.running_total < self.max_jobs:
+                job = self.queued_jobs.pop(0)
+                print('# Process_pool starting: {0}'.format(job['command']))
+                job['start_time'] = time.perf_counter()
+                job['process'] = subprocess.Popen(job['command'])
+                Process_pool.running_total += 1
+                self.running_jobs.append(job)
+        self.finished_jobs.extend(newly_finished)
+        return newly_finished
+
+    # Returns 'job' after recording its exit code & freeing its slot for other pools
+    def finish_job(self, job = None, returncode = None):
+        job['returncode'] = returncode
+        # Noticed no sooner than the next poll, close enough for timing spans
+        job['end_time'] = time.perf_counter()
+        print('# Process_pool job "{0}" exited with: {1}'.format(job['name'], returncode))
+        self.running_jobs.remove(job)
+        with Process_pool.slots_lock:
+            Process_pool.running_total -= 1
+        return job
+
+    # Drops queued jobs, terminates running processes & waits for them so their slots are free for other pools
+    def terminate(self, timeout = 5):
+        self.queued_jobs = []
+        for job in self.running_jobs:
+            job['process'].terminate()
+        for job in list(self.running_jobs):
+            try:
+                returncode = job['process'].wait(timeout = timeout)
+            except subprocess.TimeoutExpired:
+                job['process'].kill()
+                returncode = job['process'].wait()
+            self.finished_jobs.append(self.finish_job(job = job, returncode = returncode))
+
+    # Returns 'True' when nothing is queued or running
+    def is_done(self):
+        return not self.queued_jobs and not self.running_jobs
+
+    # Returns list of all finished jobs, in order of completion, after blocking until all have exited
+    def wait(self, interval = 0.05):
+        """
+        # Copy/paste-able block
+        finished_jobs = pool.wait()
+        """
+        self.poll()
+        while not self.is_done():
+            time.sleep(interval)
+            self.poll()
+        return self.finished_jobs
+
+
 class Repetier(object):
     """docstring for Repetier"""
-    def __init__(self, context=bpy.context):
+    def __init__(self, context=default_context):
         # super Repetier, self).__init__()
         # self.arg = arg
         # Repetier related settings
@@ -1007,7 +3638,7 @@ class Repetier(object):
         self.repetier_pass = context.scene.repetier_pass
         self.repetier_x_api_key = context.scene.repetier_x_api_key
         self.repetier_api_path = context.scene.repetier_api_path
-        self.repetier_new_dir = context.scene.repetier_new_dir
+        #self.repetier_new_dir = context.scene.repetier_new_dir
         # Where to save uploaded files to
         #self.repetier_save_stl_dir = context.scene.repetier_save_stl_dir
         self.repetier_save_gcode_dir = context.scene.repetier_save_gcode_dir
@@ -1020,49 +3651,67 @@ class Repetier(object):
         else:
             self.host_url = context.scene.repetier_host
 
-    def return_curl_header_lists(self):
-        output = Formatted_output()
-        curl_ops = ['-f', '-k', '--connect-timeout', '15']
-        curl_log = []
-        if self.log_level != 'QUITE':
-            curl_log.extend(curl_ops)
+    # Returns Http_client with x-api-key & authentication headers, plus scrubbed copies for logging
+    def return_http_client(self):
+        headers = {}
+        log_headers = {}
         if self.repetier_x_api_key:
-            curl_ops += ['-H', 'x-api-key: {0}'.format(self.repetier_x_api_key)]
-            if self.log_level == 'VERBOSE':
-                curl_log += ['-H', 'x-api-key: {0}'.format(self.repetier_x_api_key)]
-            elif self.log_level == 'SCRUBBED':
-                curl_log += ['-H', 'x-api-key: X-API-KEY']
+            headers['x-api-key'] = self.repetier_x_api_key
+            log_headers['x-api-key'] = 'X-API-KEY'
         if self.repetier_user and self.repetier_pass:
-            curl_ops += ['-u', '{0}:{1}'.format(self.repetier_user, self.repetier_pass)]
-            if self.log_level == 'VERBOSE':
-                curl_log += ['-u', '{0}:{1}'.format(self.repetier_user, self.repetier_pass)]
-            elif self.log_level == 'SCRUBBED':
-                curl_log += ['-u', 'USER:PASS']
-        output.curl_ops = curl_ops
-        output.curl_log = curl_log
-        return output
-
-    def upload_gcode(gcode_path=''):
-        SP = SubProcess()
-        file_name = bpy.path.basename(gcode_path)
-        curl_header = self.return_curl_header_lists()
-        curl_ops = curl_header.curl_ops
-        curl_log = curl_header.curl_log
-        curl_ops += ['-i', '-X', 'POST', 'Content-Type: multipart/form-data', '-F', '"a=upload"']
-        curl_ops += ['-F', 'filename=@{0}'.format(gcode_path), '{0}{1}/{2}'.format(self.host_url, self.repetier_api_path, self.repetier_save_gcode_dir)]
-        if self.log_level != 'QUITE':
-            curl_log += ['-i', '-X', 'POST', 'Content-Type: multipart/form-data', '-F', '"a=upload"']
-            curl_log += ['-F', 'filename=@{0}'.format(gcode_path), '{0}{1}/{2}'.format(self.host_url, self.repetier_api_path, self.repetier_save_gcode_dir)]
-        upload_gcode_output = SP.curl_check_call(ops = curl_ops, log_ops = curl_log)
+            headers['Authorization'] = Http_client.return_basic_auth(user = self.repetier_user, passphrase = self.repetier_pass)
+            log_headers['Authorization'] = 'Basic USER:PASS'
+        return Http_client(headers = headers, log_headers = log_headers, log_level = self.log_level)
+
+    def upload_gcode(self, gcode_path=''):
+        HTTP = self.return_http_client()
+        upload_url = '{0}{1}/{2}'.format(self.host_url, self.repetier_api_path, self.repetier_save_gcode_dir)
+        upload_gcode_output = HTTP.request(method = 'POST', url = upload_url, fields = {'a': 'upload'}, files = {'filename': gcode_path})
         return upload_gcode_output
 
+    # Returns dictionary of 'online', 'busy', 'state' text & 'time_left' seconds of the current print, from listPrinter
+    def return_printer_state(self):
+        """
+        # Copy/paste-able block
+        RP = Repetier(context)
+        printer_state = RP.return_printer_state()
+        # The printer slug is the last part of uploads' URL, 'GCode Directory' within the user interface
+        """
+        HTTP = self.return_http_client()
+        slug = self.repetier_save_gcode_dir.strip('/')
+        # Models are uploaded to '/printer/model/<slug>', commands go to '/printer/api/<slug>'
+        api_url = '{0}{1}/api/{2}?a=listPrinter'.format(self.host_url, self.repetier_api_path.rsplit('/', 1)[0], slug)
+        printers = HTTP.request(method = 'GET', url = api_url).json()
+        printer = None
+        for listed_printer in printers:
+            if listed_printer.get('slug') == slug:
+                printer = listed_printer
+        if printer is None:
+            # Another listed printer's state would send work to the wrong machine, so report this one offline
+            return {'online': False, 'busy': False, 'state': 'Printer {0} not listed'.format(slug), 'time_left': None}
+        busy = printer.get('job', 'none') != 'none'
+        printer_state = {
+            'online': bool(printer.get('online')) and printer.get('active', True) is not False,
+            'busy': busy,
+            'state': 'Printing {0}'.format(printer['job']) if busy else 'Idle',
+            'time_left': None}
+        if busy and printer.get('printTime') is not None and printer.get('printedTimeComp') is not None:
+            printer_state['time_left'] = max(0.0, printer['printTime'] - printer['printedTimeComp'])
+        return printer_state
+
 
 class Selected_objects(object):
-    def __init__(self, context=bpy.context):
+    def __init__(self, context=default_context):
         self.selected_objects = context.selected_objects
         self.preferred_local_slicer = context.scene.preferred_local_slicer
+        self.local_slicer_max_jobs = context.scene.local_slicer_max_jobs
+        self.upload_max_jobs = context.scene.upload_max_jobs
+        self.upload_max_jobs_per_host = context.scene.upload_max_jobs_per_host
+        self.job_journal_enabled = context.scene.job_journal_enabled
+        self.job_journal_path = context.scene.job_journal_path
         # Export STL settings
         self.export_stl_directory = context.scene.export_stl_directory
+        # Removed exports are simply cache misses next time around, see Export_cache.return_cached_path
         self.clean_temp_stl_files = context.scene.clean_temp_stl_files
         # Import OBJ settings
         self.import_obj_directory = context.scene.import_obj_directory
@@ -1070,16 +3719,31 @@ class Selected_objects(object):
         #
         self.export_stl_treat_selected_as = context.scene.export_stl_treat_selected_as
         self.slic3r_repaired_parent_name = context.scene.slic3r_repaired_parent_name
+        self.mesh_repair_engine = context.scene.mesh_repair_engine
+        self.mesh_repair_weld_distance = context.scene.mesh_repair_weld_distance
+        self.mesh_repair_max_hole_edges = context.scene.mesh_repair_max_hole_edges
+        self.mesh_repair_slic3r_fallback = context.scene.mesh_repair_slic3r_fallback
+        self.mesh_repair_check_first = context.scene.mesh_repair_check_first
+        self.mesh_check_self_intersections = context.scene.mesh_check_self_intersections
         #
         self.slic3r_gcode_directory = context.scene.slic3r_gcode_directory
         self.slic3r_preview_gcode = context.scene.slic3r_preview_gcode
         #
         self.curaengine_gcode_directory = context.scene.curaengine_gcode_directory
         self.curaengine_preview_gcode = context.scene.curaengine_preview_gcode
+        self.gcode_preview_mode = context.scene.gcode_preview_mode
+        self.gcode_preview_first_layer = context.scene.gcode_preview_first_layer
+        self.gcode_preview_last_layer = context.scene.gcode_preview_last_layer
+        self.gcode_preview_layer_budget = context.scene.gcode_preview_layer_budget
         #
         self.octoprint_auto_upload_from_slicers = context.scene.octoprint_auto_upload_from_slicers
         self.repetier_auto_upload_from_slicers = context.scene.repetier_auto_upload_from_slicers
+        self.farm_dispatch_uploads = context.scene.farm_dispatch_uploads
         self.open_browser_after_upload = context.scene.open_browser_after_upload
+        #
+        self.timing_summary = context.scene.timing_summary
+        self.timing_trace = context.scene.timing_trace
+        self.timing_trace_directory = context.scene.timing_trace_directory
         if context.scene.open_browser_after_upload is True and 'Repetier' in context.scene.preferred_print_server:
             if context.scene.repetier_port:
                 self.server_url = context.scene.repetier_host + ':' + context.scene.repetier_port
@@ -1092,7 +3756,7 @@ class Selected_objects(object):
                 self.server_url = context.scene.octoprint_host
 
     # Returns output of export_stl(stl_path = stl_path, objects = object)
-    def export_as_stl(self, context=bpy.context):
+    def export_as_stl(self, context=default_context):
         # Initialize objects for calling class methods
         BLDR = Blender(context)
         operation_output = Formatted_output()
@@ -1101,210 +3765,240 @@ class Selected_objects(object):
         #  path cannot be made.
         operation_output.mkdir_output = Os.mkdir(path = self.export_stl_directory)
         if 'Individual' in self.export_stl_treat_selected_as or 'Merge' in self.export_stl_treat_selected_as:
-            export_stl_output = []
-            for obj in self.selected_objects:
-                stl_path = os.path.join(self.export_stl_directory, obj.name + '.stl')
-                # Export objects as STL
-                operation_output.blender_export_stl_output += [BLDR.export_stl(stl_path = stl_path, objects = obj)]
-        else:
-            if bpy.data.is_saved is True:
-                stl_path = os.path.join(self.export_stl_directory, bpy.path.basename(bpy.context.blend_data.filepath) + '.stl')
-            else:
-        	    stl_path = os.path.join(self.export_stl_directory, 'Untitled' + '.stl')
-            # Export objects as STL
-            operation_output.blender_export_stl_output = BLDR.export_stl(stl_path = stl_path, objects = self.selected_objects)
-        # Return output object of what just happened
-        return operation_output
-
-    #
-    def repair_through_slic3r(self, context=bpy.context):
-        if not self.selected_objects:
-            raise Exception('Please select some objects first.')
-        # Initialize objects for calling class methods
-        BLDR = Blender(context)
-        SLCR = Slic3r(context)
-        operation_output = Formatted_output()
-        # Empty values for operation_output for this run
-        operation_output.mkdir_output = []
-        operation_output.blender_export_stl_output = []
-        operation_output.slic3r_repair_stl_output = []
-        operation_output.blender_imported_objects = []
-        operation_output.rm_file_output = []
-        # Make output directory if needed, output will either be 'False' if directory did not need
-        #  to be made or the value of 'path' if the directory is new and made, or will error out if
-        #  path cannot be made.
-        operation_output.mkdir_output += [Os.mkdir(path = self.export_stl_directory)]
-        operation_output.mkdir_output += [Os.mkdir(path = self.import_obj_directory)]
-        # Either export, repair & re-import individual files (per object) or the whole scene as one file
-        if 'Individual' in self.export_stl_treat_selected_as or 'Merge' in self.export_stl_treat_selected_as:
-            print('## Inidvidual or Merge export settings detected ##')
-            for c, obj in enumerate(self.selected_objects):
+            export_stl_output = []
+            for obj in self.selected_objects:
                 stl_path = os.path.join(self.export_stl_directory, obj.name + '.stl')
-                obj_path = os.path.join(self.import_obj_directory, obj.name + '_fixed.obj')
-                # Export
+                # Export objects as STL
                 operation_output.blender_export_stl_output += [BLDR.export_stl(stl_path = stl_path, objects = obj)]
-                if operation_output.blender_export_stl_output[c]:
-                    # Repair
-                    operation_output.slic3r_repair_stl_output += [SLCR.repair_stl(stl_path = operation_output.blender_export_stl_output[c])]
-                    # Import
-                    imported_object = BLDR.import_obj(path = obj_path)
-                    # Append imported object to list for latter outputting
-                    operation_output.blender_imported_objects += [imported_object]
-                    # Parent to named empty
-                    parent_to_named_empty_output = Blender.parent_object_to_named_empty(empty_name = self.slic3r_repaired_parent_name, empty_location=(0, 0, 0), child_object = imported_object)
-                    # Clean up temp STL & OBJ files if enabled
-                    if self.clean_temp_stl_files is True:
-                        operation_output.rm_file_output += [Os.rm_file(path = stl_path)]
-                    if self.clean_temp_obj_files is True:
-                        operation_output.rm_file_output += [Os.rm_file(path = obj_path)]
         else:
-            print('## Batch or Scene export settings detected ##')
             if bpy.data.is_saved is True:
                 stl_path = os.path.join(self.export_stl_directory, bpy.path.basename(bpy.context.blend_data.filepath) + '.stl')
-                obj_path = os.path.join(self.import_obj_directory, bpy.path.basename(bpy.context.blend_data.filepath) + '_fixed.obj')
             else:
-        	    stl_path = os.path.join(self.export_stl_directory, 'Untitled.stl')
-        	    obj_path = os.path.join(self.import_obj_directory, 'Untitled_fixed.obj')
-            # Export
-            operation_output.blender_export_stl_output += [BLDR.export_stl(stl_path = stl_path, objects = self.selected_objects)]
-            if operation_output.blender_export_stl_output[0]:
-                # Repair
-                operation_output.slic3r_repair_stl_output += [SLCR.repair_stl(stl_path = operation_output.blender_export_stl_output[0])]
-                # Import
-                imported_object = BLDR.import_obj(path = obj_path)
-                operation_output.blender_imported_objects = imported_object
-                # Parent to named empty
-                parent_to_named_empty_output = Blender.parent_object_to_named_empty(empty_name = self.slic3r_repaired_parent_name, empty_location=(0, 0, 0), child_object = imported_object)
-                # Clean up temp STL & OBJ files if enabled.
-                if self.clean_temp_stl_files is True:
-                    operation_output.rm_file_output += [Os.rm_file(path = stl_path)]
-                if self.clean_temp_obj_files is True:
-                    operation_output.rm_file_output += [Os.rm_file(path = obj_path)]
+        	    stl_path = os.path.join(self.export_stl_directory, 'Untitled' + '.stl')
+            # Export objects as STL
+            operation_output.blender_export_stl_output = BLDR.export_stl(stl_path = stl_path, objects = self.selected_objects)
         # Return output object of what just happened
         return operation_output
 
-    #
-    def local_slicer(self, context=bpy.context):
+    # Returns output object after repairing selected objects in-process or through Slic3r, as set by mesh_repair_engine
+    def repair_through_slic3r(self, context=default_context):
+        if not self.selected_objects:
+            raise Exception('Please select some objects first.')
         # Initialize objects for calling class methods
         BLDR = Blender(context)
-        if self.preferred_local_slicer == 'Slic3r':
-            SLCR = Slic3r(context)
-            gcode_dir = self.slic3r_gcode_directory
-        elif self.preferred_local_slicer == 'CuraEngine':
-            SLCR = CuraEngine(context)
-            gcode_dir = self.curaengine_gcode_directory
+        SLCR = Slic3r(context)
         operation_output = Formatted_output()
         # Empty values for operation_output for this run
         operation_output.mkdir_output = []
         operation_output.blender_export_stl_output = []
-        operation_output.slice_stl_output = []
-        operation_output.blender_imported_texts = []
+        operation_output.slic3r_repair_stl_output = []
+        operation_output.mesh_repair_output = []
+        operation_output.mesh_check_output = []
+        operation_output.error_output = []
+        operation_output.blender_imported_objects = []
         operation_output.rm_file_output = []
+        operation_output.timing_output = []
+        operation_output.tracer = Tracer(name = 'Repair')
         # Make output directory if needed, output will either be 'False' if directory did not need
         #  to be made or the value of 'path' if the directory is new and made, or will error out if
         #  path cannot be made.
         operation_output.mkdir_output += [Os.mkdir(path = self.export_stl_directory)]
-        operation_output.mkdir_output += [Os.mkdir(path = gcode_dir)]
-        # Either export, repair & re-import individual files (per object) or the whole scene as one file
-        if 'Individual' in self.export_stl_treat_selected_as:
-            print('## Individual export settings detected ##')
-            stl_file_list = []
-            for c, obj in enumerate(self.selected_objects):
-                stl_path = os.path.join(self.export_stl_directory, obj.name + '.stl')
-                gcode_path = os.path.join(gcode_dir, obj.name + '.gcode')
-                # Export
-                operation_output.blender_export_stl_output += [BLDR.export_stl(stl_path = stl_path, objects = obj)]
-                if operation_output.blender_export_stl_output[c]:
-                    # Slice
-                    operation_output.slice_stl_output += [SLCR.slice_stl(stl_path = operation_output.blender_export_stl_output[c], gcode_path = gcode_path)]
-                    stl_file_list += [operation_output.blender_export_stl_output]
-                    if self.slic3r_preview_gcode is True:
-                        # Import & Append imported object to list for latter outputting
-                        operation_output.blender_imported_texts += [Blender.import_text(path = gcode_path)]
-                    # Upload outputed GCode to servers if enabled
-                    if self.octoprint_auto_upload_from_slicers is True:
-                        print('# Uploading file: {0} to OctoPrint server'.format(gcode_path))
-                        OP = OctoPrint(context)
-                        OP.upload_file(gcode_path = gcode_path)
-                    if self.repetier_auto_upload_from_slicers is True:
-                        print('# Uploading file: {0} to Repetier server'.format(gcode_path))
-                        RP = Repetier(context)
-                        RP.upload_gcode(gcode_path = gcode_path)
-                # Clean up temp STL & OBJ files if enabled
-                if self.clean_temp_stl_files is True:
-                    operation_output.rm_file_output += [Os.rm_file(path = stl_path)]
-            if self.open_browser_after_upload is True:
-                Blender.open_browser(url = self.server_url)
-        elif 'Merge' in self.export_stl_treat_selected_as:
-            print('## Merge export settings detected ##')
-            if bpy.data.is_saved is True:
-                gcode_path = os.path.join(gcode_dir, bpy.path.basename(bpy.context.blend_data.filepath) + '.gcode')
-            else:
-        	    gcode_path = os.path.join(gcode_dir, 'Untitled.gcode')
-            for obj in self.selected_objects:
-                stl_path = os.path.join(self.export_stl_directory, obj.name + '.stl')
-                # Export
-                operation_output.blender_export_stl_output += [BLDR.export_stl(stl_path = stl_path, objects = obj)]
-            if operation_output.blender_export_stl_output:
-                # Slice
-                operation_output.slice_stl_output += [SLCR.slice_stl(stl_path = operation_output.blender_export_stl_output, gcode_path = gcode_path)]
-                if self.slic3r_preview_gcode is True:
-                    # Import text object
-                    operation_output.blender_imported_texts = Blender.import_text(path = gcode_path)
-                # Upload outputed GCode to servers if enabled
-                if self.octoprint_auto_upload_from_slicers is True:
-                    print('# Uploading file: {0} to OctoPrint server'.format(gcode_path))
-                    OP = OctoPrint(context)
-                    OP.upload_file(gcode_path = gcode_path)
-                if self.repetier_auto_upload_from_slicers is True:
-                    print('# Uploading file: {0} to Repetier server'.format(gcode_path))
-                    RP = Repetier(context)
-                    RP.upload_gcode(gcode_path = gcode_path)
-            if self.clean_temp_stl_files is True:
-                # Clean up temp STL & OBJ files if enabled
-                for obj in self.selected_objects:
-                    operation_output.rm_file_output += [Os.rm_file(path = stl_path)]
-            if self.open_browser_after_upload is True:
-                Blender.open_browser(url = self.server_url)
+        operation_output.mkdir_output += [Os.mkdir(path = self.import_obj_directory)]
+        # Either repair individual objects or the whole selection as one
+        if 'Individual' in self.export_stl_treat_selected_as or 'Merge' in self.export_stl_treat_selected_as:
+            print('## Inidvidual or Merge export settings detected ##')
+            repair_units = [(obj.name, obj) for obj in self.selected_objects]
         else:
-            print('## Batch export settings detected ##')
+            print('## Batch or Scene export settings detected ##')
             if bpy.data.is_saved is True:
-                stl_path = os.path.join(self.export_stl_directory, bpy.path.basename(bpy.context.blend_data.filepath) + '.stl')
-                gcode_path = os.path.join(gcode_dir, bpy.path.basename(bpy.context.blend_data.filepath) + '.gcode')
+                repair_units = [(bpy.path.basename(bpy.context.blend_data.filepath), self.selected_objects)]
             else:
-        	    stl_path = os.path.join(self.export_stl_directory, 'Untitled.stl')
-        	    gcode_path = os.path.join(gcode_dir, 'Untitled.gcode')
-            # Export
-            operation_output.blender_export_stl_output += [BLDR.export_stl(stl_path = stl_path, objects = self.selected_objects)]
-            if operation_output.blender_export_stl_output[0]:
-                # Slice
-                operation_output.slice_stl_output += [SLCR.slice_stl(stl_path = operation_output.blender_export_stl_output[0], gcode_path = gcode_path)]
-            if self.slic3r_preview_gcode is True:
-                # Import
-                operation_output.blender_imported_texts = Blender.import_text(path = gcode_path)
-            # Upload outputed GCode to servers if enabled
-            if self.octoprint_auto_upload_from_slicers is True:
-                print('# Uploading file: {0} to OctoPrint server'.format(gcode_path))
-                OP = OctoPrint(context)
-                OP.upload_file(gcode_path = gcode_path)
-            if self.repetier_auto_upload_from_slicers is True:
-                print('# Uploading file: {0} to Repetier server'.format(gcode_path))
-                RP = Repetier(context)
-                RP.upload_gcode(gcode_path = gcode_path)
-            # Clean up temp STL & OBJ files if enabled.
-            if self.clean_temp_stl_files is True:
-                operation_output.rm_file_output += [Os.rm_file(path = stl_path)]
-            if self.open_browser_after_upload is True:
-                Blender.open_browser(url = self.server_url)
+                repair_units = [('Untitled', self.selected_objects)]
+        # Slic3r repairs run as a pool of processes while later units are still being checked & exported
+        repair_pool = Process_pool(max_jobs = self.local_slicer_max_jobs)
+        repair_jobs = []
+        for unit_name, objects in repair_units:
+            triangles = None
+            if self.mesh_repair_check_first:
+                triangles = self.return_world_triangles(BLDR = BLDR, objects = objects)
+                if triangles is None:
+                    continue
+                MR = Mesh_repair(weld_distance = self.mesh_repair_weld_distance)
+                with operation_output.tracer.span(name = 'check', objects = unit_name, triangles = len(triangles)) as attributes:
+                    check_failures = Mesh_repair.return_check_failures(check_stats = MR.check(triangles = triangles,
+                        self_intersections = self.mesh_check_self_intersections))
+                    attributes['failures'] = len(check_failures)
+                if not check_failures:
+                    operation_output.mesh_check_output += ['{0}: clean, not repaired'.format(unit_name)]
+                    continue
+                operation_output.mesh_check_output += ['{0}: {1}'.format(unit_name, ', '.join(check_failures))]
+            if 'Native' in self.mesh_repair_engine:
+                if self.repair_in_process(BLDR = BLDR, unit_name = unit_name, objects = objects, operation_output = operation_output, triangles = triangles):
+                    continue
+            repair_job = self.queue_slic3r_repair(BLDR = BLDR, SLCR = SLCR, repair_pool = repair_pool, unit_name = unit_name,
+                objects = objects, operation_output = operation_output)
+            if repair_job is not None:
+                repair_jobs += [repair_job]
+                repair_pool.poll()
+        # Repaired files are imported together, in selection order, once every Slic3r process has exited
+        repair_pool.wait()
+        for repair_job in repair_jobs:
+            self.import_slic3r_repair(BLDR = BLDR, repair_job = repair_job, operation_output = operation_output)
+        self.finish_trace(operation_output = operation_output)
         # Return output object of what just happened
         return operation_output
 
+    # Sets 'timing_output' of 'operation_output' from its tracer, writing a trace-event file if enabled
+    def finish_trace(self, operation_output = None):
+        if operation_output.tracer is None:
+            return
+        trace_directory = None
+        if self.timing_trace is True:
+            trace_directory = self.timing_trace_directory
+        operation_output.timing_output = operation_output.tracer.return_report(summary = self.timing_summary, trace_directory = trace_directory)
+
+    # Returns True after repairing 'objects' into one new object parented to the repaired parent empty,
+    #  or False if open edges remain & falling back to Slic3r is enabled
+    #  'triangles' may be the output of return_world_triangles to avoid evaluating the same meshes twice
+    def repair_in_process(self, BLDR = None, unit_name = None, objects = None, operation_output = None, triangles = None):
+        if triangles is None:
+            triangles = self.return_world_triangles(BLDR = BLDR, objects = objects)
+        if triangles is None:
+            return True
+        MR = Mesh_repair(weld_distance = self.mesh_repair_weld_distance, max_hole_edges = self.mesh_repair_max_hole_edges)
+        with operation_output.tracer.span(name = 'repair', objects = unit_name, triangles = len(triangles), engine = 'Native') as attributes:
+            vertices, faces = MR.repair(triangles = triangles)
+            attributes['faces'] = len(faces)
+            attributes['open_edges'] = MR.repair_stats['open_edges']
+        repair_summary = Mesh_repair.return_summary(repair_stats = MR.repair_stats)
+        if MR.repair_stats['open_edges'] and self.mesh_repair_slic3r_fallback:
+            print('# {0} has open edges after in-process repair, falling back to Slic3r: {1}'.format(unit_name, repair_summary))
+            return False
+        with operation_output.tracer.span(name = 'import', objects = unit_name, faces = len(faces)):
+            imported_object = Blender.new_mesh_object(name = unit_name + '_fixed', vertices = vertices, faces = faces)
+        operation_output.mesh_repair_output += ['{0}: {1}'.format(imported_object.name, repair_summary)]
+        # Append new object to list for latter outputting
+        operation_output.blender_imported_objects += [imported_object]
+        # Parent to named empty
+        parent_to_named_empty_output = Blender.parent_object_to_named_empty(empty_name = self.slic3r_repaired_parent_name, empty_location=(0, 0, 0), child_object = imported_object)
+        return True
+
+    # Returns world space triangles of 'objects' as one (N, 3, 3) array, or None if none are meshes;
+    #  the same as the STL files Slic3r repairs minus export axis & scale conversions
+    def return_world_triangles(self, BLDR = None, objects = None):
+        triangles = []
+        for obj, local_triangles in BLDR.return_object_triangles(objects = objects):
+            object_matrix = Mesh_buffers.return_matrix_array(matrix = obj.matrix_world)
+            triangles += [Mesh_buffers.return_transformed_triangles(triangles = local_triangles, matrix = object_matrix)]
+        if not triangles:
+            return None
+        return np.concatenate(triangles)
+
+    # Returns Process_pool job repairing 'objects' with Slic3r after exporting them to one STL file, or None if nothing was exported
+    def queue_slic3r_repair(self, BLDR = None, SLCR = None, repair_pool = None, unit_name = None, objects = None, operation_output = None):
+        stl_path = os.path.join(self.export_stl_directory, unit_name + '.stl')
+        obj_path = os.path.join(self.import_obj_directory, unit_name + '_fixed.obj')
+        # Export
+        with operation_output.tracer.span(name = 'export', objects = unit_name) as attributes:
+            export_stl_output = BLDR.export_stl(stl_path = stl_path, objects = objects)
+            attributes.update(Tracer.return_file_attributes(path = export_stl_output))
+        operation_output.blender_export_stl_output += [export_stl_output]
+        if not export_stl_output:
+            return None
+        # Repair
+        return repair_pool.add(command = SLCR.return_repair_command(stl_path = export_stl_output), name = unit_name,
+            stl_path = stl_path, obj_path = obj_path)
+
+    # Imports the OBJ file written by a finished Slic3r 'repair_job' & parents it to the repaired parent empty
+    def import_slic3r_repair(self, BLDR = None, repair_job = None, operation_output = None):
+        operation_output.slic3r_repair_stl_output += [repair_job['returncode']]
+        operation_output.tracer.add_span(name = 'repair', start_time = repair_job['start_time'], end_time = repair_job['end_time'],
+            track = 'Slic3r {0}'.format(repair_job['name']), objects = repair_job['name'], engine = 'Slic3r', exit_code = repair_job['returncode'])
+        if repair_job['returncode'] != 0:
+            operation_output.error_output += ['Slic3r repair of {0} exited with: {1}'.format(repair_job['name'], repair_job['returncode'])]
+            return
+        # Import
+        with operation_output.tracer.span(name = 'import', objects = repair_job['name'], **Tracer.return_file_attributes(path = repair_job['obj_path'])):
+            imported_object = BLDR.import_obj(path = repair_job['obj_path'])
+        # Append imported object to list for latter outputting
+        operation_output.blender_imported_objects += [imported_object]
+        # Parent to named empty
+        parent_to_named_empty_output = Blender.parent_object_to_named_empty(empty_name = self.slic3r_repaired_parent_name, empty_location=(0, 0, 0), child_object = imported_object)
+        # Clean up temp STL & OBJ files if enabled
+        if self.clean_temp_stl_files is True:
+            operation_output.rm_file_output += [Os.rm_file(path = repair_job['stl_path'])]
+        if self.clean_temp_obj_files is True:
+            operation_output.rm_file_output += [Os.rm_file(path = repair_job['obj_path'])]
+
+    # Returns output of Slice_job.run() after exporting, slicing & optionally uploading selected objects
+    def local_slicer(self, context=default_context):
+        if not self.selected_objects:
+            raise Exception('Please select some objects first.')
+        slice_job = Slice_job(context)
+        return slice_job.run()
+
+
+class Settings(object):
+    """
+    # This class stands in for bpy.context where Blender is not running, such as within worker
+    #  processes, tests & benchmarks; 'scene' holds plain values of every scene property this add-on
+    #  defines & 'selected_objects' whatever was passed, so Slic3r, CuraEngine, Gcode_analyzer,
+    #  OctoPrint, Repetier, SubProcess & Webcam snapshot downloads may be used without bpy.
+    # Example of slicing outside of Blender
+    settings = Settings(slic3r_conf_path = '/home/user/printer.ini', slic3r_gcode_directory = '/tmp')
+    SLCR = Slic3r(context = settings)
+    subprocess.check_call(SLCR.return_slice_command(stl_path = '/tmp/Cube.stl', gcode_path = '/tmp/Cube.gcode'))
+    # Example of copying settings within Blender, copies pickle for sending to other processes
+    settings = Settings.from_context(context = bpy.context)
+    """
+    def __init__(self, selected_objects = None, **scene_values):
+        self.selected_objects = selected_objects or []
+        if bpy is None:
+            scene_defaults = Settings.return_scene_defaults()
+            for key in scene_values:
+                if key not in scene_defaults:
+                    raise Exception('Unknown setting supplied to Settings({0} = "?")'.format(key))
+            scene_values = dict(scene_defaults, **scene_values)
+        self.scene = types.SimpleNamespace(**scene_values)
+
+    # Returns dictionary of scene property names & defaults, only populated when imported without bpy
+    @staticmethod
+    def return_scene_defaults():
+        if bpy is not None:
+            return {}
+        return {key: value for key, value in vars(Scene_defaults).items() if not key.startswith('__')}
+
+    # Returns Settings with plain copies of scene property values from 'context', such as bpy.context
+    @staticmethod
+    def from_context(context = None, selected_objects = None):
+        """
+        # Copy/paste-able block
+        settings = Settings.from_context(context = context)
+        """
+        if context is None:
+            raise Exception('No context supplied to Settings.from_context(context = "?")')
+        scene = context.scene
+        if isinstance(scene, types.SimpleNamespace):
+            return Settings(selected_objects = selected_objects, **vars(scene))
+        scene_values = {}
+        # Properties added by add-ons are 'runtime' ones, pointers such as 'render' are left behind
+        for prop in scene.bl_rna.properties:
+            if not prop.is_runtime or prop.type not in ('BOOLEAN', 'INT', 'FLOAT', 'STRING', 'ENUM'):
+                continue
+            value = getattr(scene, prop.identifier)
+            if prop.type != 'STRING' and prop.type != 'ENUM' and prop.array_length:
+                value = tuple(value)
+            scene_values[prop.identifier] = value
+        return Settings(selected_objects = selected_objects, **scene_values)
+
 
 class Slic3r(object):
     """
     # This class contains short-cuts to slicer repair & slice operations
     """
-    def __init__(self, context=bpy.context):
+    def __init__(self, context=default_context):
+        # Kept for SubProcess, which looks up executable paths
+        self.context = context
         self.selected_objects = context.selected_objects
         # Slic3r panel settings for this instance
         self.slic3r_exec_dir = context.scene.slic3r_exec_dir
@@ -1316,10 +4010,20 @@ class Slic3r(object):
         self.slic3r_gcode_directory = context.scene.slic3r_gcode_directory
         #
         self.export_stl_treat_selected_as = context.scene.export_stl_treat_selected_as
+        # Sliced GCode cache, 'None' if disabled
+        self.gcode_cache = None
+        if context.scene.gcode_cache_enabled:
+            self.gcode_cache = Gcode_cache(directory = context.scene.gcode_cache_directory, max_size = context.scene.gcode_cache_max_size)
+        # Local GCode analysis, 'None' if disabled
+        self.gcode_analyzer = None
+        self.gcode_analysis = None
+        if context.scene.gcode_analysis_enabled:
+            self.gcode_analyzer = Gcode_analyzer(filament_diameter = context.scene.gcode_analysis_filament_diameter,
+                acceleration = context.scene.gcode_analysis_acceleration)
 
     # Raises exception if 'stl_path' does not exists, else returns output of SP.slic3r_check_call(ops = ['--repair', path])
     def repair_stl(self, stl_path=''):
-        SP = SubProcess()
+        SP = SubProcess(context = self.context)
         path = Os.path_exists(path = stl_path)
         if path is False:
             raise Exception('No STL file supplied for Slic3r to repair')
@@ -1327,9 +4031,56 @@ class Slic3r(object):
         print("# Slic3r.repair_stl returning output of: SP.slic3r_check_call(ops = ['--repair', {0}])".format(path))
         return repair_output
 
+    # Returns command list for Slic3r to repair 'stl_path', written next to it as '<name>_fixed.obj'
+    def return_repair_command(self, stl_path=None):
+        """
+        # Copy/paste-able block
+        SLCR = Slic3r(context)
+        command = SLCR.return_repair_command(stl_path = '/tmp/Cube.stl')
+        """
+        if not stl_path:
+            raise Exception('No STL file supplied for Slic3r to repair')
+        SP = SubProcess(context = self.context)
+        return [SP.slic3r_exec_path, '--repair', stl_path]
+
     # Raises exception if 'stl_path' or 'gcode_path' does not exists, else returns output of SP.slic3r_check_call(ops = args)
     def slice_stl(self, stl_path=None, gcode_path=None):
-        SP = SubProcess()
+        SP = SubProcess(context = self.context)
+        args = self.return_slice_ops(stl_path = stl_path, gcode_path = gcode_path)
+        if self.gcode_cache is not None:
+            cache_digest = self.gcode_cache.return_digest(command = [SP.slic3r_exec_path] + args, gcode_path = gcode_path)
+            if self.gcode_cache.fetch(digest = cache_digest, gcode_path = gcode_path):
+                self.analyze_gcode(gcode_path = gcode_path)
+                return 0
+        slice_stl_output = SP.slic3r_check_call(ops = args)
+        if self.gcode_cache is not None:
+            self.gcode_cache.store(digest = cache_digest, gcode_path = gcode_path)
+        self.analyze_gcode(gcode_path = gcode_path)
+        print('# Slic3r.slic3r_slice_stl returning output of: SP.slic3r_check_call(ops = {0})'.format(args))
+        return slice_stl_output
+
+    # Returns analysis of 'gcode_path', also kept as 'gcode_analysis', or 'None' if analysis is disabled
+    def analyze_gcode(self, gcode_path = None):
+        if self.gcode_analyzer is None:
+            return None
+        self.gcode_analysis = self.gcode_analyzer.analyze(gcode_path = gcode_path)
+        print('# {0}: {1}'.format(gcode_path, Gcode_analyzer.return_summary(gcode_analysis = self.gcode_analysis)))
+        return self.gcode_analysis
+
+    # Returns a full command list, executable included, for running Slic3r through Process_pool
+    def return_slice_command(self, stl_path=None, gcode_path=None):
+        """
+        # Copy/paste-able block
+        SLCR = Slic3r(context)
+        command = SLCR.return_slice_command(stl_path = None, gcode_path = None)
+        """
+        SP = SubProcess(context = self.context)
+        command = [SP.slic3r_exec_path]
+        command.extend(self.return_slice_ops(stl_path = stl_path, gcode_path = gcode_path))
+        return command
+
+    # Raises exception if 'stl_path' or 'gcode_path' does not exists, else returns list of arguments for Slic3r
+    def return_slice_ops(self, stl_path=None, gcode_path=None):
         if gcode_path is None:
             raise Exception('No GCODE output file path supplied for Slic3r')
         if isinstance(stl_path, list):
@@ -1358,16 +4109,656 @@ class Slic3r(object):
             args.extend(path)
         else:
             args += [path]
-        slice_stl_output = SP.slic3r_check_call(ops = args)
-        print('# Slic3r.slic3r_slice_stl returning output of: SP.slic3r_check_call(ops = {0})'.format(args))
-        return slice_stl_output
+        return args
+
+
+class Slice_job(object):
+    """
+    # This class holds the export, slice, preview & upload pipeline of Selected_objects.local_slicer
+    #  broken into small steps, so that local_slice_modal can advance queued jobs between redraws
+    #  instead of freezing Blender until every object has been sliced & uploaded.
+    # Example of running a job to completion without a modal operator, eg. from 'blender -b'
+    slice_job = Slice_job(context)
+    operation_output = slice_job.run()
+    # Example of queuing a job for local_slice_modal to advance
+    Slice_job.queued_jobs.append(Slice_job(context))
+    bpy.ops.object.local_slice_modal()
+    """
+    # Jobs waiting on or being advanced by local_slice_modal, and the most recently finished jobs
+    queued_jobs = []
+    finished_jobs = []
+    max_finished_jobs = 5
+    job_count = 0
+    # Seconds of exporting per step, at least one file is exported each step however long it takes
+    export_seconds_per_step = 0.05
+
+    def __init__(self, context=default_context):
+        Slice_job.job_count += 1
+        self.name = 'Slice Job {0}'.format(Slice_job.job_count)
+        self.stage = 'Queued'
+        self.error = None
+        # Settings are read now so that later changes within the UI do not alter queued jobs
+        self.SO = Selected_objects(context)
+        self.BLDR = Blender(context)
+        if self.SO.preferred_local_slicer == 'Slic3r':
+            self.SLCR = Slic3r(context)
+            self.gcode_dir = self.SO.slic3r_gcode_directory
+            self.preview_gcode = self.SO.slic3r_preview_gcode
+        elif self.SO.preferred_local_slicer == 'CuraEngine':
+            self.SLCR = CuraEngine(context)
+            self.gcode_dir = self.SO.curaengine_gcode_directory
+            self.preview_gcode = self.SO.curaengine_preview_gcode
+        # Toolpath previews are collected while analysing GCode, text previews load the whole file
+        self.preview_toolpaths = self.preview_gcode is True and self.SO.gcode_preview_mode == 'Toolpaths'
+        self.OP = None
+        self.RP = None
+        self.farm = None
+        if self.SO.farm_dispatch_uploads is True:
+            # Printers are queried while exporting & slicing, GCode is routed once analysed
+            self.farm = Printer_farm(context)
+            self.farm.refresh_async()
+        else:
+            if self.SO.octoprint_auto_upload_from_slicers is True:
+                self.OP = OctoPrint(context)
+            if self.SO.repetier_auto_upload_from_slicers is True:
+                self.RP = Repetier(context)
+        self.operation_output = Formatted_output()
+        # Empty values for operation_output for this run
+        self.operation_output.mkdir_output = []
+        self.operation_output.blender_export_stl_output = []
+        self.operation_output.slice_stl_output = []
+        self.operation_output.slice_job_output = []
+        self.operation_output.gcode_analysis_output = []
+        self.operation_output.blender_imported_texts = []
+        self.operation_output.upload_output = []
+        self.operation_output.error_output = []
+        self.operation_output.rm_file_output = []
+        self.operation_output.timing_output = []
+        self.operation_output.farm_output = []
+        self.operation_output.tracer = Tracer(name = self.name)
+        # Objects are tracked by name, they may be deleted or renamed while the job waits
+        self.units = self.return_slice_units(object_names = [obj.name for obj in self.SO.selected_objects])
+        self.pending_exports = []
+        for unit in self.units:
+            for stl_path, object_names in unit['exports']:
+                self.pending_exports += [(unit, stl_path, object_names)]
+        self.export_total = len(self.pending_exports)
+        self.journal = None
+        if self.SO.job_journal_enabled is True:
+            try:
+                self.journal = Job_journal(path = self.SO.job_journal_path)
+                self.resume_units()
+            except Exception as error:
+                # A locked or unreadable journal should not stop slicing, the run just cannot be resumed
+                self.operation_output.error_output += ['Job journal {0} unavailable: {1}'.format(self.SO.job_journal_path, error)]
+                self.journal = None
+        self.slice_pool = Process_pool(max_jobs = self.SO.local_slicer_max_jobs)
+        self.uploads = Upload_dispatcher(max_uploads = self.SO.upload_max_jobs, max_uploads_per_host = self.SO.upload_max_jobs_per_host,
+            journal = self.journal)
+        self.analysis_threads = []
+        self.sliced_count = 0
+        self.upload_total = 0
+        self.upload_count = 0
+
+    # Returns list of units, each a GCode file to make from one or more exported STL files
+    def return_slice_units(self, object_names = None):
+        """
+        # Copy/paste-able block
+        units = self.return_slice_units(object_names = ['Cube', 'Sphere'])
+        # Individual makes one unit per object, Merge one unit with an STL file per object &
+        #  Batch one unit with a single STL file holding all objects
+        """
+        if object_names is None:
+            raise Exception('No object_names supplied to Slice_job.return_slice_units(object_names = "?")')
+        export_dir = self.SO.export_stl_directory
+        units = []
+        if 'Individual' in self.SO.export_stl_treat_selected_as:
+            print('## Individual export settings detected ##')
+            for name in object_names:
+                units += [{
+                    'name': name,
+                    'exports': [(os.path.join(export_dir, name + '.stl'), [name])],
+                    'gcode_path': os.path.join(self.gcode_dir, name + '.gcode')}]
+        else:
+            if bpy.data.is_saved is True:
+                base_name = bpy.path.basename(bpy.context.blend_data.filepath)
+            else:
+                base_name = 'Untitled'
+            if 'Merge' in self.SO.export_stl_treat_selected_as:
+                print('## Merge export settings detected ##')
+                exports = [(os.path.join(export_dir, name + '.stl'), [name]) for name in object_names]
+            else:
+                print('## Batch export settings detected ##')
+                exports = [(os.path.join(export_dir, base_name + '.stl'), object_names)]
+            units += [{
+                'name': base_name,
+                'exports': exports,
+                'gcode_path': os.path.join(self.gcode_dir, base_name + '.gcode')}]
+        for unit in units:
+            unit['export_count'] = 0
+            unit['exported_paths'] = []
+            unit['returncode'] = None
+            unit['gcode_analysis'] = None
+            unit['resume_stage'] = None
+            unit['dispatch_error'] = None
+            unit['export_digests'] = {}
+        return units
+
+    # Skips exports of units that an earlier, interrupted run got through according to journal, other units start over
+    def resume_units(self):
+        for unit in self.units:
+            row = self.journal.return_unit(gcode_path = unit['gcode_path'])
+            if row is not None and row['stage'] in ('exported', 'sliced'):
+                # Only units an earlier run got part way through are worth evaluating meshes for
+                for stl_path, object_names in unit['exports']:
+                    unit['export_digests'][stl_path] = self.return_export_digest(object_names = object_names)
+            unit['resume_stage'] = self.journal.return_resume_stage(unit = unit)
+            if unit['resume_stage'] is None:
+                self.journal.reset_unit(unit = unit)
+                continue
+            unit['exported_paths'] = [stl_path for stl_path, object_names in unit['exports']]
+            unit['export_count'] = len(unit['exports'])
+            self.pending_exports = [pending for pending in self.pending_exports if pending[0] is not unit]
+            self.operation_output.slice_job_output += ['{0} resumed, {1} by an earlier run'.format(unit['gcode_path'], unit['resume_stage'])]
+
+    # Returns 'True' while there is more to do after exporting STL files for up to export_seconds_per_step & collecting finished slicers
+    def step(self):
+        """
+        # Copy/paste-able block
+        while slice_job.step():
+            pass
+        # Anything touching bpy happens within this method, so it must be called from the main thread
+        """
+        if self.stage in ('Finished', 'Failed'):
+            return False
+        if self.stage == 'Queued':
+            # Make output directory if needed, output will either be 'False' if directory did not need
+            #  to be made or the value of 'path' if the directory is new and made, or will error out if
+            #  path cannot be made.
+            self.operation_output.mkdir_output += [Os.mkdir(path = self.SO.export_stl_directory)]
+            self.operation_output.mkdir_output += [Os.mkdir(path = self.gcode_dir)]
+            # Resumed units pick up after the last stage they finished
+            for unit in self.units:
+                if unit['resume_stage'] == 'exported':
+                    self.queue_slice(unit = unit)
+                elif unit['resume_stage'] == 'sliced':
+                    self.finish_slice(job = {'name': unit['name'], 'unit': unit, 'returncode': 0, 'resumed': True})
+            self.stage = 'Exporting'
+        # Small objects export in milliseconds, so export as many as fit before handing back to the UI
+        export_deadline = time.perf_counter() + self.export_seconds_per_step
+        while self.pending_exports:
+            unit, stl_path, object_names = self.pending_exports.pop(0)
+            self.export_unit_file(unit = unit, stl_path = stl_path, object_names = object_names)
+            if time.perf_counter() >= export_deadline:
+                break
+        for job in self.slice_pool.poll():
+            self.finish_slice(job = job)
+        for upload in self.uploads.poll():
+            self.finish_upload(upload = upload)
+        for analysis_thread in [thread for thread in self.analysis_threads if not thread.is_alive()]:
+            self.analysis_threads.remove(analysis_thread)
+            self.finish_analysis(unit = analysis_thread.unit)
+        if self.pending_exports:
+            self.stage = 'Exporting'
+        elif not self.slice_pool.is_done():
+            self.stage = 'Slicing'
+        elif self.analysis_threads:
+            self.stage = 'Analysing'
+        elif not self.uploads.is_done():
+            self.stage = 'Uploading'
+        else:
+            self.finish()
+            return False
+        return True
+
+    # Returns 'operation_output' after stepping through the whole job, blocking until finished
+    def run(self, interval = 0.05):
+        """
+        # Copy/paste-able block
+        operation_output = slice_job.run()
+        """
+        while self.step():
+            if not self.pending_exports:
+                time.sleep(interval)
+        return self.operation_output
+
+    # Returns list of objects named 'object_names' that still exist, a deleted or renamed object is skipped
+    def return_unit_objects(self, object_names = None):
+        objects = []
+        for name in object_names:
+            obj = bpy.data.objects.get(name)
+            if obj is None:
+                print('## Skipping export of missing object:', name)
+            else:
+                objects += [obj]
+        return objects
+
+    # Returns Export_cache digest of what exporting 'object_names' would write, also given 'object_triangles' already evaluated
+    def return_export_digest(self, object_names = None, object_triangles = None):
+        if object_triangles is None:
+            object_triangles = self.BLDR.return_object_triangles(objects = self.return_unit_objects(object_names = object_names))
+        return Export_cache.return_digest(object_triangles = object_triangles, export_settings = self.BLDR.return_export_settings())
+
+    # Exports 'object_names' to 'stl_path' & queues the unit for slicing once all its files are exported
+    def export_unit_file(self, unit = None, stl_path = None, object_names = None):
+        objects = self.return_unit_objects(object_names = object_names)
+        if objects:
+            with self.operation_output.tracer.span(name = 'export', objects = ', '.join(object_names)) as attributes:
+                object_triangles = None
+                if self.journal is not None:
+                    # Journal keeps the digest so that a resumed run can tell whether objects changed since
+                    object_triangles = self.BLDR.return_object_triangles(objects = objects)
+                    unit['export_digests'][stl_path] = self.return_export_digest(object_names = object_names, object_triangles = object_triangles)
+                export_stl_output = self.BLDR.export_stl(stl_path = stl_path, objects = objects, object_triangles = object_triangles)
+                attributes.update(Tracer.return_file_attributes(path = export_stl_output))
+        else:
+            export_stl_output = False
+        self.operation_output.blender_export_stl_output += [export_stl_output]
+        if export_stl_output:
+            unit['exported_paths'] += [export_stl_output]
+        unit['export_count'] += 1
+        if unit['export_count'] < len(unit['exports']) or not unit['exported_paths']:
+            return
+        if self.journal is not None:
+            self.journal.record_unit(unit = unit, stage = 'exported')
+        self.queue_slice(unit = unit)
+
+    # Queues slicing of the exported files of 'unit', unless GCode cache already holds the result
+    def queue_slice(self, unit = None):
+        if 'Merge' in self.SO.export_stl_treat_selected_as:
+            slice_input = unit['exported_paths']
+        else:
+            slice_input = unit['exported_paths'][0]
+        command = self.SLCR.return_slice_command(stl_path = slice_input, gcode_path = unit['gcode_path'])
+        cache_digest = None
+        if self.SLCR.gcode_cache is not None:
+            cache_digest = self.SLCR.gcode_cache.return_digest(command = command, gcode_path = unit['gcode_path'])
+            if self.SLCR.gcode_cache.fetch(digest = cache_digest, gcode_path = unit['gcode_path']):
+                self.finish_slice(job = {'name': unit['name'], 'unit': unit, 'returncode': 0, 'cached': True})
+                return
+        self.slice_pool.add(command = command, name = unit['name'], unit = unit, cache_digest = cache_digest)
+
+    # Records exit code of a finished slicer, then previews & queues GCode for upload if it succeeded
+    def finish_slice(self, job = None):
+        unit = job['unit']
+        gcode_path = unit['gcode_path']
+        unit['returncode'] = job['returncode']
+        self.sliced_count += 1
+        self.operation_output.slice_stl_output += [job['returncode']]
+        if job.get('start_time') is not None:
+            self.operation_output.tracer.add_span(name = 'slice', start_time = job['start_time'], end_time = job['end_time'],
+                track = 'Slicer {0}'.format(unit['name']), objects = unit['name'], exit_code = job['returncode'],
+                **Tracer.return_file_attributes(path = gcode_path))
+        if job.get('cached'):
+            self.operation_output.slice_job_output += ['{0} reused from GCode cache'.format(gcode_path)]
+        elif not job.get('resumed'):
+            self.operation_output.slice_job_output += ['{0} exit code {1}'.format(gcode_path, job['returncode'])]
+        if self.journal is not None:
+            if job['returncode'] == 0:
+                self.journal.record_unit(unit = unit, stage = 'sliced')
+            else:
+                self.journal.record_unit(unit = unit, stage = 'failed', error = 'Slicer exit code {0}'.format(job['returncode']))
+        if job['returncode'] != 0:
+            return
+        if job.get('cache_digest'):
+            self.SLCR.gcode_cache.store(digest = job['cache_digest'], gcode_path = gcode_path)
+        if self.preview_gcode is True and self.SO.gcode_preview_mode == 'Text':
+            # Import & Append imported object to list for latter outputting
+            with self.operation_output.tracer.span(name = 'preview', objects = unit['name'], mode = 'Text'):
+                self.operation_output.blender_imported_texts += [Blender.import_text(path = gcode_path)]
+        # Analyse GCode within a thread, large files take a few seconds
+        analysing = self.SLCR.gcode_analyzer is not None or self.preview_toolpaths
+        if analysing:
+            analysis_thread = threading.Thread(target = self.analysis_worker, args = (unit,))
+            analysis_thread.daemon = True
+            analysis_thread.unit = unit
+            self.analysis_threads.append(analysis_thread)
+            analysis_thread.start()
+        # Upload outputed GCode to servers if enabled, uploads run within threads so slicing can continue
+        if self.OP is not None and not self.is_uploaded(unit = unit, host = self.OP.host_url):
+            print('# Uploading file: {0} to OctoPrint server'.format(gcode_path))
+            self.uploads.add(function = self.OP.upload_file, host = self.OP.host_url, name = gcode_path, gcode_path = gcode_path)
+            self.upload_total += 1
+        if self.RP is not None and not self.is_uploaded(unit = unit, host = self.RP.host_url):
+            print('# Uploading file: {0} to Repetier server'.format(gcode_path))
+            self.uploads.add(function = self.RP.upload_gcode, host = self.RP.host_url, name = gcode_path, gcode_path = gcode_path)
+            self.upload_total += 1
+        # Farm printers are chosen by estimated print time & dimensions, so wait on analysis if there is one
+        if self.farm is not None and not analysing:
+            self.dispatch_to_farm(unit = unit)
+
+    # Returns 'True' if journal shows an earlier run of resumed 'unit' uploaded its GCode to 'host', or to any host if 'None'
+    def is_uploaded(self, unit = None, host = None):
+        if self.journal is None or unit['resume_stage'] != 'sliced':
+            return False
+        uploaded_hosts = self.journal.return_uploaded_hosts(path = unit['gcode_path'])
+        if (host is None and uploaded_hosts) or host in uploaded_hosts:
+            self.operation_output.upload_output += ['{0} already on {1} from an earlier run, skipped'.format(unit['gcode_path'],
+                host or ', '.join(sorted(uploaded_hosts)))]
+            return True
+        return False
+
+    # Routes GCode of 'unit' to a farm printer & queues its upload, failures to find a printer are recorded as errors
+    def dispatch_to_farm(self, unit = None):
+        # A resumed unit that already went to a farm printer is not routed to a second one
+        if self.is_uploaded(unit = unit, host = None):
+            return
+        try:
+            printer = self.farm.dispatch(gcode_path = unit['gcode_path'], gcode_analysis = unit.get('gcode_analysis'), uploads = self.uploads)
+        except Exception as error:
+            unit['dispatch_error'] = error
+            self.operation_output.error_output += ['Farm dispatch of {0} failed: {1}'.format(unit['gcode_path'], error)]
+            return
+        self.operation_output.slice_job_output += ['{0} routed to farm printer {1}'.format(unit['gcode_path'], printer['name'])]
+        self.upload_total += 1
+
+    # Analyses GCode of 'unit' with a Gcode_analyzer of its own, collecting toolpaths if previewing, no bpy access allowed here
+    def analysis_worker(self, unit = None):
+        GA = Gcode_analyzer()
+        if self.SLCR.gcode_analyzer is not None:
+            GA.filament_diameter = self.SLCR.gcode_analyzer.filament_diameter
+            GA.acceleration = self.SLCR.gcode_analyzer.acceleration
+        if self.preview_toolpaths:
+            GA.toolpath_layers = (self.SO.gcode_preview_first_layer, self.SO.gcode_preview_last_layer)
+            GA.toolpath_budget = self.SO.gcode_preview_layer_budget
+        try:
+            with self.operation_output.tracer.span(name = 'analyse', objects = unit['name'],
+                    **Tracer.return_file_attributes(path = unit['gcode_path'])) as attributes:
+                unit['gcode_analysis'] = GA.analyze(gcode_path = unit['gcode_path'])
+                unit['toolpaths'] = GA.toolpaths
+                attributes['layers'] = unit['gcode_analysis']['layerCount']
+        except Exception as error:
+            unit['gcode_analysis_error'] = error
+
+    # Records outcome of a finished GCode analysis & builds toolpath preview if enabled
+    def finish_analysis(self, unit = None):
+        if self.farm is not None:
+            self.dispatch_to_farm(unit = unit)
+        if unit.get('gcode_analysis') is None:
+            self.operation_output.error_output += ['Analysis of {0} failed: {1}'.format(unit['gcode_path'], unit.get('gcode_analysis_error'))]
+            return
+        if self.SLCR.gcode_analyzer is not None:
+            summary = Gcode_analyzer.return_summary(gcode_analysis = unit['gcode_analysis'])
+            self.operation_output.gcode_analysis_output += ['{0} {1}'.format(unit['gcode_path'], summary)]
+        if self.preview_toolpaths:
+            with self.operation_output.tracer.span(name = 'preview', objects = unit['name'], mode = 'Toolpaths'):
+                preview_obj = Blender.new_toolpath_object(name = bpy.path.basename(unit['gcode_path']), toolpaths = unit['toolpaths'],
+                    matrix = self.BLDR.return_export_global_matrix())
+            self.operation_output.gcode_preview_output += [preview_obj.name]
+            # Segments are within the mesh now, no need to hold onto them
+            unit['toolpaths'] = None
+
+    # Records outcome of a finished upload
+    def finish_upload(self, upload = None):
+        self.upload_count += 1
+        if upload['start_time'] is not None:
+            self.operation_output.tracer.add_span(name = 'upload', start_time = upload['start_time'], end_time = upload['end_time'],
+                track = 'Upload {0}'.format(upload['host']), file = upload['name'], host = upload['host'],
+                skipped = upload['error'] is None and upload['result'] is None, error = upload['error'],
+                **Tracer.return_file_attributes(path = upload['name']))
+        if upload['error'] is None and upload['result'] is None:
+            self.operation_output.upload_output += ['{0} already on {1}, skipped'.format(upload['name'], upload['host'])]
+        elif upload['error'] is None:
+            self.operation_output.upload_output += ['{0} to {1}'.format(upload['name'], upload['host'])]
+        else:
+            self.operation_output.error_output += ['Upload of {0} failed: {1}'.format(upload['name'], upload['error'])]
+
+    # Cleans up temporary STL files & opens a browser if configured to
+    def finish(self):
+        # Clean up temp STL files if enabled
+        if self.SO.clean_temp_stl_files is True:
+            for unit in self.units:
+                for stl_path, object_names in unit['exports']:
+                    self.operation_output.rm_file_output += [Os.rm_file(path = stl_path)]
+        if self.SO.open_browser_after_upload is True and self.farm is None:
+            Blender.open_browser(url = self.SO.server_url)
+        if self.farm is not None:
+            self.operation_output.farm_output = self.farm.return_report()
+        if self.journal is not None:
+            # Units with a failed upload stay 'sliced', so the next run only retries their uploads
+            failed_paths = set(upload['name'] for upload in self.uploads.finished_uploads if upload['error'] is not None)
+            for unit in self.units:
+                if unit['returncode'] == 0 and unit['dispatch_error'] is None and unit['gcode_path'] not in failed_paths:
+                    self.journal.record_unit(unit = unit, stage = 'finished')
+            self.journal.close()
+        self.SO.finish_trace(operation_output = self.operation_output)
+        self.stage = 'Finished'
+
+    # Stops running slicers & uploads after recording 'error'
+    def fail(self, error = None):
+        # Uploads already started are left to finish, threads cannot be stopped part way through
+        self.slice_pool.terminate()
+        self.uploads.cancel_pending(error = 'Cancelled as {0} failed'.format(self.name))
+        if self.journal is not None:
+            # Started uploads record their outcome within the journal, so it is closed once they finish
+            closing_thread = threading.Thread(target = self.close_journal_after_uploads)
+            closing_thread.daemon = True
+            closing_thread.start()
+        self.operation_output.error_output += ['{0} failed: {1}'.format(self.name, error)]
+        self.error = error
+        self.SO.finish_trace(operation_output = self.operation_output)
+        self.stage = 'Failed'
+
+    # Closes journal after blocking until every upload of this job has finished, called from a thread by fail
+    def close_journal_after_uploads(self):
+        self.uploads.wait()
+        self.journal.close()
+
+    # Returns list of strings describing how far along this job is, one per stage
+    def return_progress(self):
+        slice_total = len([unit for unit in self.units if unit['exported_paths'] or unit['export_count'] < len(unit['exports'])])
+        progress = ['{0}: {1}'.format(self.name, self.stage)]
+        progress += ['Exported {0}/{1}'.format(self.export_total - len(self.pending_exports), self.export_total)]
+        progress += ['Sliced {0}/{1}'.format(self.sliced_count, slice_total)]
+        if self.OP is not None or self.RP is not None or self.farm is not None:
+            progress += ['Uploaded {0}/{1}'.format(self.upload_count, self.upload_total)]
+        if self.error:
+            progress += ['Error: {0}'.format(self.error)]
+        return progress
+
+
+class Slice_tracker(object):
+    """
+    # This class sends OctoPrint slice commands for many uploaded STL files at once, through
+    #  Upload_dispatcher, then watches one recursive file listing for the GCode files they make,
+    #  backing off between polls while nothing changes, & collects each file's 'gcodeAnalysis'.
+    #  OctoPrint's push API is a SockJS socket that the standard library cannot speak, instead
+    #  listings are requested with If-None-Match so a poll finding no change costs one 304 response.
+    # Example of slicing uploaded STL files & reporting on the results
+    OP = OctoPrint(context)
+    tracker = Slice_tracker(OP = OP, max_jobs = 4, timeout = 600)
+    for stl_path in stl_paths:
+        tracker.add(stl_path = stl_path)
+    tracker.wait()
+    for line in tracker.return_report():
+        print(line)
+    """
+    def __init__(self, OP = None, max_jobs = 4, poll_interval = 0.5, max_poll_interval = 8.0, timeout = 600, require_analysis = True, tracer = None):
+        if OP is None:
+            raise Exception('No OP supplied to Slice_tracker(OP = "?")')
+        if not getattr(OP, 'octoprint_slice_uploaded_stl', False):
+            raise Exception('Slice_tracker requires octoprint_slice_uploaded_stl, OctoPrint only reads slicer settings when it is enabled')
+        self.OP = OP
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+        # OctoPrint lists a sliced file before analysing it, 'gcodeAnalysis' is added some time later
+        self.require_analysis = require_analysis
+        self.tracer = tracer
+        self.jobs = []
+        self.finished_jobs = []
+        # Submissions have their own pool, so slicing limits do not change those of uploads
+        self.submissions = Upload_dispatcher(max_uploads = max_jobs, max_uploads_per_host = max_jobs, pool = 'slices')
+        self.previous_entries = None
+        self.current_interval = poll_interval
+        self.next_poll_time = 0.0
+        self.listing = None
+
+    # Returns job dictionary after queuing a slice command for 'stl_path', already uploaded to octoprint_save_stl_dir
+    def add(self, stl_path = None):
+        """
+        # Copy/paste-able block
+        job = tracker.add(stl_path = '/tmp/Cube.stl')
+        """
+        if stl_path is None:
+            raise Exception('No stl_path supplied to Slice_tracker.add(stl_path = "?")')
+        # Same name OctoPrint.slice_stl asks for, next to the uploaded STL
+        gcode_name = '{0}.gcode'.format(os.path.basename(stl_path).split('.')[0])
+        save_dir = self.OP.octoprint_save_stl_dir.strip('/')
+        gcode_path = '{0}/{1}'.format(save_dir, gcode_name) if save_dir else gcode_name
+        if self.previous_entries is None:
+            # GCode left by earlier slices must change before a job counts as finished
+            try:
+                self.previous_entries = OctoPrint.return_listing_entries(listing = self.OP.return_file_listing(target_search_dir = 'RECURSIVE'))
+            except (Http_error, http.client.HTTPException, OSError, ValueError) as e:
+                print('# Slice_tracker could not list files before slicing: {0}'.format(e))
+                self.previous_entries = {}
+        previous_entry = self.previous_entries.get(gcode_path) or {}
+        job = {
+            'name': os.path.basename(stl_path),
+            'stl_path': stl_path,
+            'gcode_path': gcode_path,
+            'previous': (previous_entry.get('hash'), previous_entry.get('date')),
+            'state': 'Submitting',
+            'analysis': None,
+            'entry': None,
+            'error': None,
+            'submission': None,
+            'start_time': time.perf_counter(),
+            'end_time': None}
+        job['submission'] = self.submissions.add(function = self.OP.slice_stl, host = self.OP.host_url, name = stl_path, stl_path = stl_path)
+        job['submission']['job'] = job
+        self.jobs.append(job)
+        return job
+
+    # Marks 'job' as finished with 'state', recording a span when a tracer was supplied
+    def finish_job(self, job = None, state = None, error = None):
+        job['state'] = state
+        job['error'] = error
+        job['end_time'] = time.perf_counter()
+        self.finished_jobs.append(job)
+        if self.tracer is not None:
+            attributes = {'state': state, 'gcode_path': job['gcode_path']}
+            if error is not None:
+                attributes['error'] = str(error)
+            self.tracer.add_span(name = 'server slice', start_time = job['start_time'], end_time = job['end_time'],
+                track = 'Server slice {0}'.format(job['name']), **attributes)
+
+    # Returns list of jobs that finished since last call, fetching the file listing only once it is due
+    def poll(self):
+        """
+        # Copy/paste-able block
+        finished_jobs = tracker.poll()
+        # Never waits for slicing, so this is safe to call from a timer or modal operator
+        """
+        finished_count = len(self.finished_jobs)
+        for submission in self.submissions.poll():
+            job = submission['job']
+            if submission['error'] is not None:
+                self.finish_job(job = job, state = 'Failed', error = submission['error'])
+                continue
+            job['state'] = 'Slicing'
+            # OctoPrint answers 202 Accepted with where the GCode will be saved
+            try:
+                response_json = submission['result'].json()
+            except (AttributeError, TypeError, ValueError):
+                response_json = {}
+            if isinstance(response_json, dict) and response_json.get('path'):
+                job['gcode_path'] = response_json['path'].strip('/')
+        waiting_jobs = [job for job in self.jobs if job['state'] in ('Slicing', 'Sliced')]
+        now = time.perf_counter()
+        if waiting_jobs and now >= self.next_poll_time:
+            changed = self.check_listing(jobs = waiting_jobs)
+            for job in waiting_jobs:
+                if job['state'] in ('Slicing', 'Sliced') and self.timeout and now - job['start_time'] > self.timeout:
+                    self.finish_job(job = job, state = 'Timed out', error = 'No GCode after {0} seconds'.format(self.timeout))
+            # Back off while nothing changes, start over quickly once something does
+            if changed:
+                self.current_interval = self.poll_interval
+            else:
+                self.current_interval = min(self.current_interval * 2, self.max_poll_interval)
+            self.next_poll_time = time.perf_counter() + self.current_interval
+        return self.finished_jobs[finished_count:]
+
+    # Returns 'True' if the file listing changed since last check, after updating 'jobs' that have GCode listed
+    def check_listing(self, jobs = None):
+        try:
+            listing = self.OP.return_file_listing(target_search_dir = 'RECURSIVE')
+        except (Http_error, http.client.HTTPException, OSError, ValueError) as e:
+            print('# Slice_tracker could not list files, trying again later: {0}'.format(e))
+            return False
+        # Listings answered 304 Not Modified are the very same cached object
+        if listing is self.listing:
+            return False
+        self.listing = listing
+        entries = OctoPrint.return_listing_entries(listing = listing)
+        for job in jobs:
+            entry = entries.get(job['gcode_path'])
+            if entry is None or (entry.get('hash'), entry.get('date')) == job['previous']:
+                continue
+            job['entry'] = entry
+            job['analysis'] = entry.get('gcodeAnalysis')
+            if job['analysis'] or not self.require_analysis:
+                self.finish_job(job = job, state = 'Done')
+            else:
+                job['state'] = 'Sliced'
+        return True
+
+    # Returns 'True' when every added job has finished, failed or timed out
+    def is_done(self):
+        return len(self.finished_jobs) == len(self.jobs)
+
+    # Returns list of all jobs, in order added, after blocking until all have finished
+    def wait(self, interval = 0.05):
+        """
+        # Copy/paste-able block
+        jobs = tracker.wait()
+        """
+        self.poll()
+        while not self.is_done():
+            time.sleep(interval)
+            self.poll()
+        return self.jobs
+
+    # Returns list of table rows, one per job with its estimated print time & filament, plus totals
+    def return_report(self):
+        row_format = '{0:<28} {1:<9} {2:>8} {3:>10} {4:>12}'
+        report = [row_format.format('File', 'State', 'Slice s', 'Print time', 'Filament mm')]
+        total_print_time = 0.0
+        total_filament = 0.0
+        for job in self.jobs:
+            print_time = ''
+            filament = ''
+            analysis = job['analysis'] or {}
+            if analysis.get('estimatedPrintTime') is not None:
+                total_print_time += analysis['estimatedPrintTime']
+                print_time = Slice_tracker.return_duration(seconds = analysis['estimatedPrintTime'])
+            tool_lengths = [tool.get('length') or 0 for tool in (analysis.get('filament') or {}).values()]
+            if tool_lengths:
+                total_filament += sum(tool_lengths)
+                filament = '{0:.1f}'.format(sum(tool_lengths))
+            seconds = '{0:.1f}'.format((job['end_time'] or time.perf_counter()) - job['start_time'])
+            report += [row_format.format(job['gcode_path'][-28:], job['state'], seconds, print_time, filament)]
+            if job['error'] is not None:
+                report += ['  {0}'.format(job['error'])]
+        done_count = len([job for job in self.jobs if job['state'] == 'Done'])
+        report += [row_format.format('Total {0}/{1} done'.format(done_count, len(self.jobs)), '', '',
+            Slice_tracker.return_duration(seconds = total_print_time), '{0:.1f}'.format(total_filament))]
+        return report
+
+    # Returns 'seconds' as H:MM:SS
+    @staticmethod
+    def return_duration(seconds = 0):
+        minutes, seconds = divmod(int(round(seconds)), 60)
+        hours, minutes = divmod(minutes, 60)
+        return '{0}:{1:02d}:{2:02d}'.format(hours, minutes, seconds)
 
 
 class SubProcess(object):
     """
     # This class holds short-custs to Slic3r, CuraEngin and Curl subprocess.check_call([exce_path, arg])
     """
-    def __init__(self, context=bpy.context):
+    def __init__(self, context=default_context):
         # super SubProcess, self).__init__()
         # self.arg = arg
         if os.path.exists(os.path.join(context.scene.slic3r_exec_dir, context.scene.slic3r_exec_name)):
@@ -1426,9 +4817,306 @@ class SubProcess(object):
         return curl_getoutput_output
 
 
+class Tracer(object):
+    """
+    # This class records timing spans of pipeline stages, such as export, slice & upload, along
+    #  with attributes of what each acted upon, so that a run may be summarised stage by stage or
+    #  written out as a Chrome trace-event JSON file for chrome://tracing or https://ui.perfetto.dev
+    # Example of timing an export
+    tracer = Tracer(name = 'Slice Job 1')
+    with tracer.span(name = 'export', objects = 'Cube') as attributes:
+        stl_path = BLDR.export_stl(stl_path = '/tmp/Cube.stl', objects = [obj])
+        attributes.update(Tracer.return_file_attributes(path = stl_path))
+    for line in tracer.return_report(summary = True, trace_directory = '/tmp/traces'):
+        print(line)
+    # Example of recording a span timed elsewhere, such as a subprocess polled by Process_pool
+    tracer.add_span(name = 'slice', start_time = job['start_time'], end_time = job['end_time'], track = 'Slicer Cube', exit_code = 0)
+    """
+    def __init__(self, name = 'Trace'):
+        self.name = name
+        self.start_time = time.perf_counter()
+        self.spans = []
+        # Uploads & GCode analysis record spans from their own threads
+        self.spans_lock = threading.Lock()
+
+    # Returns dictionary of attributes for the caller to add to, the span is recorded upon leaving the 'with' block
+    @contextlib.contextmanager
+    def span(self, name = None, track = None, **attributes):
+        """
+        # Copy/paste-able block
+        with tracer.span(name = 'repair', objects = 'Cube') as attributes:
+            attributes['faces'] = 12
+        # Exceptions are noted within the span's attributes & raised again
+        """
+        start_time = time.perf_counter()
+        try:
+            yield attributes
+        except Exception as error:
+            attributes['error'] = str(error)
+            raise
+        finally:
+            self.add_span(name = name, start_time = start_time, end_time = time.perf_counter(), track = track, **attributes)
+
+    # Returns span dictionary after recording it, times are from time.perf_counter & 'track' defaults to the calling thread's name
+    def add_span(self, name = None, start_time = None, end_time = None, track = None, **attributes):
+        if name is None or start_time is None or end_time is None:
+            raise Exception('Tracer.add_span requires name, start_time & end_time')
+        span = {
+            'name': name,
+            'start_time': start_time,
+            'end_time': end_time,
+            'track': track or threading.current_thread().name,
+            'attributes': attributes}
+        with self.spans_lock:
+            self.spans.append(span)
+        return span
+
+    # Returns list of table rows with count, total, mean & longest seconds per span name, in order first recorded
+    def return_summary(self):
+        with self.spans_lock:
+            spans = list(self.spans)
+        if not spans:
+            return []
+        names = []
+        durations = {}
+        for span in spans:
+            if span['name'] not in durations:
+                names.append(span['name'])
+                durations[span['name']] = []
+            durations[span['name']].append(span['end_time'] - span['start_time'])
+        elapsed = max(span['end_time'] for span in spans) - self.start_time
+        summary = ['{0:<10} {1:>5} {2:>9} {3:>9} {4:>9}'.format('Stage', 'Count', 'Total s', 'Mean s', 'Max s')]
+        for name in names:
+            stage_durations = durations[name]
+            summary += ['{0:<10} {1:>5} {2:>9.3f} {3:>9.3f} {4:>9.3f}'.format(name, len(stage_durations), sum(stage_durations),
+                sum(stage_durations) / len(stage_durations), max(stage_durations))]
+        summary += ['{0:<10} {1:>5} {2:>9.3f}'.format('Elapsed', '', elapsed)]
+        return summary
+
+    # Returns dictionary in Chrome's trace-event format, one 'complete' event per span & one thread per track
+    def return_trace_events(self):
+        with self.spans_lock:
+            spans = list(self.spans)
+        process_id = os.getpid()
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': process_id, 'tid': 0, 'args': {'name': self.name}}]
+        track_ids = {}
+        for span in spans:
+            if span['track'] not in track_ids:
+                track_ids[span['track']] = len(track_ids) + 1
+                events += [{'name': 'thread_name', 'ph': 'M', 'pid': process_id, 'tid': track_ids[span['track']],
+                    'args': {'name': span['track']}}]
+            events += [{
+                'name': span['name'],
+                'cat': self.name,
+                'ph': 'X',
+                'ts': round((span['start_time'] - self.start_time) * 1000000),
+                'dur': round((span['end_time'] - span['start_time']) * 1000000),
+                'pid': process_id,
+                'tid': track_ids[span['track']],
+                'args': span['attributes']}]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    # Returns path of trace-event JSON file written within 'directory', named after this tracer & the current time
+    def write_trace(self, directory = None):
+        """
+        # Copy/paste-able block
+        trace_path = tracer.write_trace(directory = '/tmp/traces')
+        """
+        if not directory:
+            raise Exception('No directory supplied to Tracer.write_trace(directory = "?")')
+        Os.mkdir(path = directory)
+        trace_name = '{0}_{1}.trace.json'.format(re.sub('[^A-Za-z0-9_-]+', '_', self.name), time.strftime('%Y%m%d-%H%M%S'))
+        trace_path = os.path.join(directory, trace_name)
+        with open(trace_path, 'w') as trace_file:
+            # Attributes such as exceptions are written as strings rather than failing the whole file
+            json.dump(self.return_trace_events(), trace_file, default = str)
+        print('# Tracer wrote trace-event file:', trace_path)
+        return trace_path
+
+    # Returns list of lines for Formatted_output's timing_output, the summary table & or where a trace file was written
+    def return_report(self, summary = True, trace_directory = None):
+        report = []
+        if summary:
+            report += self.return_summary()
+        if trace_directory:
+            report += ['Trace written to {0}'.format(self.write_trace(directory = trace_directory))]
+        return report
+
+    # Returns dictionary with 'file_size' of 'path', plus 'triangles' for binary STL files, or empty if no file exists
+    @staticmethod
+    def return_file_attributes(path = None):
+        if not path or not isinstance(path, str) or not os.path.isfile(path):
+            return {}
+        attributes = {'file_size': os.path.getsize(path)}
+        if path.lower().endswith('.stl'):
+            with open(path, 'rb') as stl_file:
+                header = stl_file.read(84)
+            # Binary STL files hold an 80 byte header, triangle count, then 50 bytes per triangle,
+            #  ASCII files will not add up even when starting with bytes that look like a count
+            if len(header) == 84:
+                triangles = int.from_bytes(header[80:84], 'little')
+                if attributes['file_size'] == 84 + 50 * triangles:
+                    attributes['triangles'] = triangles
+        return attributes
+
+
+class Upload_dispatcher(object):
+    """
+    # This class runs uploads within a pool of no more than 'max_uploads' worker threads, shared
+    #  by every dispatcher of the same 'pool', with no more than 'max_uploads_per_host' to any one
+    #  server, so that files go out while slicers keep working & a slow server does not hold up
+    #  the others. Limits belong to the pool, the latest dispatcher made for it sets them.
+    #  Given a Job_journal each upload's state is recorded under its name & host as it changes.
+    # Example of uploading many STL files to OctoPrint
+    OP = OctoPrint(context)
+    uploads = Upload_dispatcher(max_uploads = 4, max_uploads_per_host = 2)
+    for stl_path in stl_paths:
+        uploads.add(function = OP.upload_file, host = OP.host_url, name = stl_path, stl_path = stl_path)
+    for upload in uploads.wait():
+        print(upload['name'], upload['error'])
+    """
+    # Pools by name, each with its limits, queued tasks, worker threads & uploads running per host,
+    #  shared between dispatchers & guarded by slots_condition
+    pools = {}
+    slots_condition = threading.Condition()
+
+    def __init__(self, max_uploads = 4, max_uploads_per_host = 2, journal = None, pool = 'uploads'):
+        self.pool = pool
+        self.journal = journal
+        self.uploads = []
+        self.finished_queue = queue.Queue()
+        self.finished_uploads = []
+        with Upload_dispatcher.slots_condition:
+            pool_state = Upload_dispatcher.pools.setdefault(pool, {'pending': [], 'workers': [], 'running_per_host': {}})
+            pool_state['max_uploads'] = max(1, max_uploads)
+            pool_state['max_uploads_per_host'] = max(1, max_uploads_per_host)
+            # Workers beyond a lowered limit exit, waiting tasks may fit under a raised one
+            Upload_dispatcher.slots_condition.notify_all()
+
+    # Returns upload dictionary after queuing a call of 'function' with keyword arguments for a worker of the pool
+    def add(self, function = None, host = None, name = None, **function_kwargs):
+        """
+        # Copy/paste-able block
+        upload = uploads.add(function = OP.upload_file, host = OP.host_url, name = 'Cube', gcode_path = '/tmp/Cube.gcode')
+        # No bpy access allowed within 'function', it does not run on the main thread
+        """
+        if function is None:
+            raise Exception('No function supplied to Upload_dispatcher.add(function = "?")')
+        upload = {'name': name, 'host': host, 'result': None, 'error': None, 'start_time': None, 'end_time': None}
+        self.uploads.append(upload)
+        self.record_upload(upload = upload, state = 'queued')
+        with Upload_dispatcher.slots_condition:
+            pool_state = Upload_dispatcher.pools[self.pool]
+            pool_state['pending'].append((self, upload, function, function_kwargs))
+            if len(pool_state['workers']) < pool_state['max_uploads']:
+                worker = threading.Thread(target = Upload_dispatcher.pool_worker, args = (pool_state,))
+                worker.daemon = True
+                pool_state['workers'].append(worker)
+                worker.start()
+            Upload_dispatcher.slots_condition.notify_all()
+        return upload
+
+    # Runs queued tasks of 'pool_state' whose host has a free slot, exiting once none are queued or the pool shrank
+    @staticmethod
+    def pool_worker(pool_state = None):
+        worker = threading.current_thread()
+        running_per_host = pool_state['running_per_host']
+        while True:
+            with Upload_dispatcher.slots_condition:
+                task = None
+                while task is None:
+                    if not pool_state['pending'] or len(pool_state['workers']) > pool_state['max_uploads']:
+                        pool_state['workers'].remove(worker)
+                        return
+                    for pending_task in pool_state['pending']:
+                        if running_per_host.get(pending_task[1]['host'], 0) < pool_state['max_uploads_per_host']:
+                            task = pending_task
+                            break
+                    if task is None:
+                        # Every queued task is for a host at its limit, one of its uploads finishing frees a slot
+                        Upload_dispatcher.slots_condition.wait()
+                pool_state['pending'].remove(task)
+                dispatcher, upload, function, function_kwargs = task
+                running_per_host[upload['host']] = running_per_host.get(upload['host'], 0) + 1
+            try:
+                dispatcher.run_upload(upload = upload, function = function, function_kwargs = function_kwargs)
+            finally:
+                with Upload_dispatcher.slots_condition:
+                    running_per_host[upload['host']] -= 1
+                    Upload_dispatcher.slots_condition.notify_all()
+
+    # Runs the upload, errors are kept on the upload dictionary
+    def run_upload(self, upload = None, function = None, function_kwargs = None):
+        try:
+            print('# Upload_dispatcher starting: {0}'.format(upload['name']))
+            self.record_upload(upload = upload, state = 'running')
+            upload['start_time'] = time.perf_counter()
+            upload['result'] = function(**function_kwargs)
+        except Exception as error:
+            upload['error'] = error
+        finally:
+            upload['end_time'] = time.perf_counter()
+            self.record_upload(upload = upload, state = 'failed' if upload['error'] else 'done')
+            self.finished_queue.put(upload)
+
+    # Finishes uploads of this dispatcher that no worker has started yet as failed with 'error'
+    def cancel_pending(self, error = None):
+        with Upload_dispatcher.slots_condition:
+            pool_state = Upload_dispatcher.pools[self.pool]
+            cancelled_tasks = [task for task in pool_state['pending'] if task[0] is self]
+            for task in cancelled_tasks:
+                pool_state['pending'].remove(task)
+        for dispatcher, upload, function, function_kwargs in cancelled_tasks:
+            upload['error'] = error
+            upload['end_time'] = time.perf_counter()
+            self.record_upload(upload = upload, state = 'failed')
+            self.finished_queue.put(upload)
+
+    # Records 'state' of 'upload' within journal, if any, a journal error is printed rather than failing the upload
+    def record_upload(self, upload = None, state = None):
+        if self.journal is None:
+            return
+        try:
+            self.journal.record_upload(path = upload['name'], host = upload['host'], state = state, error = upload['error'])
+        except Exception as error:
+            print('# Upload_dispatcher could not journal {0}: {1}'.format(upload['name'], error))
+
+    # Returns list of uploads that finished since last call
+    def poll(self):
+        """
+        # Copy/paste-able block
+        finished_uploads = uploads.poll()
+        # Never blocks, so this is safe to call from a timer or modal operator
+        """
+        newly_finished = []
+        while True:
+            try:
+                newly_finished.append(self.finished_queue.get_nowait())
+            except queue.Empty:
+                break
+        self.finished_uploads.extend(newly_finished)
+        return newly_finished
+
+    # Returns 'True' when every added upload has finished & been collected by poll
+    def is_done(self):
+        return len(self.finished_uploads) == len(self.uploads)
+
+    # Returns list of all finished uploads, in order of completion, after blocking until all have finished
+    def wait(self, interval = 0.05):
+        """
+        # Copy/paste-able block
+        finished_uploads = uploads.wait()
+        """
+        self.poll()
+        while not self.is_done():
+            time.sleep(interval)
+            self.poll()
+        return self.finished_uploads
+
+
 class Webcam(object):
     """docstring for Webcam"""
-    def __init__(self, context=bpy.context):
+    def __init__(self, context=default_context):
         # super Webcam, self).__init__()
         # self.arg = arg
         # Webcam related settings
@@ -1452,6 +5140,7 @@ class Webcam(object):
             self.preview_placement = context.scene.octoprint_preview_placement
             self.preview_layer = context.scene.octoprint_preview_layer
             self.preview_xy_scale = context.scene.octoprint_preview_xy_scale
+            self.preview_max_size = context.scene.octoprint_preview_max_size
             self.user = context.scene.octoprint_user
             self.passphrase = context.scene.octoprint_pass
         elif 'Repetier' in context.scene.preferred_print_server:
@@ -1471,8 +5160,13 @@ class Webcam(object):
             self.preview_placement = context.scene.repetier_preview_placement
             self.preview_layer = context.scene.repetier_preview_layer
             self.preview_xy_scale = context.scene.repetier_preview_xy_scale
+            self.preview_max_size = context.scene.repetier_preview_max_size
             self.user = context.scene.repetier_user
             self.passphrase = context.scene.repetier_pass
+        self.timing_summary = context.scene.timing_summary
+        self.timing_trace = context.scene.timing_trace
+        self.timing_trace_directory = context.scene.timing_trace_directory
+        self.tracer = Tracer(name = 'Webcam')
         if self.camera_port:
             self.snapshot_url = self.camera_host + ':' + self.camera_port + '/' + self.snapshot_action
             self.stream_url = self.camera_host + ':' + self.camera_port + '/' + self.stream_action
@@ -1480,31 +5174,151 @@ class Webcam(object):
             self.snapshot_url = self.camera_host + '/' + self.snapshot_action
             self.stream_url = self.camera_host + '/' + self.stream_action
 
+    def return_http_client(self):
+        """
+        # Copy/paste-able block
+        HTTP = self.return_http_client()
+        response = HTTP.request(method = 'GET', url = self.snapshot_url)
+        """
+        headers = {}
+        log_headers = {}
+        if self.user and self.passphrase:
+            headers['Authorization'] = Http_client.return_basic_auth(user = self.user, passphrase = self.passphrase)
+            log_headers['Authorization'] = 'Basic USER:PASS'
+        return Http_client(headers = headers, log_headers = log_headers, log_level = self.log_level)
+
     def download_snapshot(self):
         """
-        # Returns download_file_path unless runnning: SP.curl_check_call(ops = curl_ops, log_ops = curl_log)
+        # Returns download_file_path unless runnning: HTTP.request(method = 'GET', url = self.snapshot_url)
         #  errors out.
         """
-        SP = SubProcess()
         download_file_path = os.path.join(self.temp_dir, self.snapshot_name + '.jpg')
-        curl_ops = ['-k', '--connect-timeout', '15']
-        curl_log = []
-        if self.log_level != 'QUITE':
-            curl_log.extend(curl_ops)
-        if self.user and self.passphrase:
-            curl_ops += ['-u', '{0}:{1}'.format(self.user, self.passphrase)]
-            if self.log_level == 'VERBOSE':
-                curl_log += ['-u', '{0}:{1}'.format(self.user, self.passphrase)]
-            elif self.log_level == 'SCRUBBED':
-                curl_log += ['-u', 'USER:PASS']
-        curl_ops += ['-o', download_file_path, self.snapshot_url]
-        if self.log_level == 'VERBOSE':
-            curl_log += ['-o', download_file_path, self.snapshot_url]
-        elif self.log_level == 'SCRUBBED':
-            curl_log += ['-o', 'DOWNLOAD_PATH', 'URL']
-        download_snapshot_output = SP.curl_check_call(ops = curl_ops, log_ops = curl_log)
+        HTTP = self.return_http_client()
+        with self.tracer.span(name = 'snapshot', url = self.snapshot_url) as attributes:
+            HTTP.request(method = 'GET', url = self.snapshot_url, download_path = download_file_path)
+            attributes.update(Tracer.return_file_attributes(path = download_file_path))
         return download_file_path
 
+    # Returns bytes of a snapshot held in memory, fetched over a pooled keep-alive connection to the webcam
+    def return_snapshot_bytes(self):
+        """
+        # Copy/paste-able block
+        snapshot_bytes = WC.return_snapshot_bytes()
+        # No bpy access within this method, so it may be called from threads & without Blender
+        """
+        HTTP = self.return_http_client()
+        with self.tracer.span(name = 'snapshot', url = self.snapshot_url) as attributes:
+            response = HTTP.request(method = 'GET', url = self.snapshot_url)
+            attributes['bytes'] = len(response.body)
+        return response.body
+
+    # Returns 'pixels', a flat array of RGBA floats bottom row first, box filtered so its longest side is no more than 'max_size'
+    @staticmethod
+    def return_downscaled_pixels(pixels = None, width = None, height = None, max_size = 0):
+        """
+        # Copy/paste-able block
+        pixels, width, height = Webcam.return_downscaled_pixels(pixels = pixels, width = 1280, height = 720, max_size = 320)
+        # Returns inputs unchanged if 'max_size' is 0 or image already fits, sizes are reduced by whole
+        #  factors so every output pixel averages the same number of input pixels
+        """
+        if pixels is None:
+            raise Exception('No pixels supplied to Webcam.return_downscaled_pixels(pixels = "?")')
+        factor = 1
+        if max_size > 0:
+            factor = int(math.ceil(max(width, height) / float(max_size)))
+        if factor <= 1:
+            return pixels, width, height
+        scaled_width = max(1, width // factor)
+        scaled_height = max(1, height // factor)
+        factor_x = width // scaled_width
+        factor_y = height // scaled_height
+        rows = np.asarray(pixels, dtype = np.float32).reshape(height, width, 4)
+        rows = rows[:scaled_height * factor_y, :scaled_width * factor_x]
+        scaled = rows.reshape(scaled_height, factor_y, scaled_width, factor_x, 4).mean(axis = (1, 3), dtype = np.float32)
+        return scaled.ravel(), scaled_width, scaled_height
+
+    # Returns flat array of RGBA floats, width & height after decoding JPEG 'snapshot_bytes' with Blender's own image loader
+    def decode_snapshot(self, snapshot_bytes = None):
+        """
+        # Copy/paste-able block
+        pixels, width, height = WC.decode_snapshot(snapshot_bytes = WC.return_snapshot_bytes())
+        # Bytes are packed into a scratch image that is removed once read, Blender versions before 2.80
+        #  cannot pack bytes so they load a scratch file within self.temp_dir that is removed as well
+        """
+        if not snapshot_bytes:
+            raise Exception('No snapshot_bytes supplied to Webcam.decode_snapshot(snapshot_bytes = "?")')
+        if bpy.app.version < (2, 80, 0):
+            return self.decode_snapshot_file(snapshot_bytes = snapshot_bytes)
+        decode_img = bpy.data.images.new(name = self.snapshot_name + '_Decode', width = 1, height = 1)
+        try:
+            # A packed file image reads from its packed bytes rather than 'filepath'
+            decode_img.pack(data = snapshot_bytes, data_len = len(snapshot_bytes))
+            decode_img.source = 'FILE'
+            pixels, width, height = self.return_image_pixels(img = decode_img)
+        finally:
+            bpy.data.images.remove(decode_img)
+        return pixels, width, height
+
+    # Returns flat array of RGBA floats, width & height after loading 'snapshot_bytes' from a scratch file, for Blender 2.7x
+    def decode_snapshot_file(self, snapshot_bytes = None):
+        if not os.path.isdir(self.temp_dir):
+            Os.mkdir(path = self.temp_dir)
+        file_descriptor, decode_path = tempfile.mkstemp(prefix = self.snapshot_name + '_Decode_', suffix = '.jpg', dir = self.temp_dir)
+        try:
+            with os.fdopen(file_descriptor, 'wb') as decode_file:
+                decode_file.write(snapshot_bytes)
+            decode_img = bpy.data.images.load(decode_path)
+            try:
+                pixels, width, height = self.return_image_pixels(img = decode_img)
+            finally:
+                bpy.data.images.remove(decode_img)
+        finally:
+            os.remove(decode_path)
+        return pixels, width, height
+
+    # Returns flat array of RGBA floats, width & height read from decoded 'img'
+    def return_image_pixels(self, img = None):
+        width, height = img.size
+        if not width or not height:
+            raise Exception('Could not decode snapshot from: {0}'.format(self.snapshot_url))
+        pixels = np.empty(width * height * 4, dtype = np.float32)
+        img.pixels.foreach_get(pixels)
+        return pixels, width, height
+
+    # Returns image named 'image_name' after writing a snapshot into its pixels, plus the width & height of that snapshot
+    def load_snapshot_image(self, image_name = ''):
+        """
+        # Copy/paste-able block
+        WC = Webcam(context)
+        img, snapshot_width, snapshot_height = WC.load_snapshot_image(image_name = WC.snapshot_name + '.jpg')
+        # Replaces download_snapshot & import_local_image for previews, the existing image is updated in
+        #  place so textures using it need no re-linking, downscaled to self.preview_max_size if set
+        """
+        snapshot_bytes = self.return_snapshot_bytes()
+        with self.tracer.span(name = 'decode', bytes = len(snapshot_bytes)) as attributes:
+            pixels, snapshot_width, snapshot_height = self.decode_snapshot(snapshot_bytes = snapshot_bytes)
+            pixels, width, height = Webcam.return_downscaled_pixels(pixels = pixels, width = snapshot_width,
+                height = snapshot_height, max_size = self.preview_max_size)
+            attributes.update({'width': width, 'height': height})
+        img = bpy.data.images.get(image_name)
+        if img is None:
+            img = bpy.data.images.new(name = image_name, width = width, height = height)
+        elif img.source != 'GENERATED':
+            # Images loaded from a snapshot file by earlier versions would reload from that file
+            img.source = 'GENERATED'
+        if tuple(img.size) != (width, height):
+            img.scale(width, height)
+        img.pixels.foreach_set(pixels)
+        img.update()
+        return img, snapshot_width, snapshot_height
+
+    # Returns list of lines summarising timing spans recorded so far, writing a trace-event file if enabled
+    def return_timing_report(self):
+        trace_directory = None
+        if self.timing_trace is True:
+            trace_directory = self.timing_trace_directory
+        return self.tracer.return_report(summary = self.timing_summary, trace_directory = trace_directory)
+
     def add_view_plane(self, image_name='', object_name='', material_name='', texture_name='', x_dimension='', y_dimension='', xy_scale=''):
         """
         # Copy / paste-able block
@@ -1813,13 +5627,9 @@ class Webcam(object):
         stream_url = self.stream_url
         # Take a picture of 3D Printer to use as a static texture,
         #  this will allow users to see their print bed without playing
-        #  the Blender Game Renderer
-        snapshot_file = self.download_snapshot()
-        # Pull in the downloaded picture into current Blender file/scene
-        img = self.import_local_image(filename = image_file_name, directory = self.temp_dir)
-        # Save image X & Y dimensions to variables for use with scaling preview plane
-        image_X_size = img.size[0]
-        image_Y_size = img.size[1]
+        #  the Blender Game Renderer, decoded in memory into the preview image
+        img, image_X_size, image_Y_size = self.load_snapshot_image(image_name = image_file_name)
+        # Preview plane is sized by snapshot X & Y dimensions, a downscaled image still covers the same area
         # Bail with an exception if image dimensions could not be read.
         if image_X_size is None:
             raise Exception('Could not read image X size')
@@ -1881,6 +5691,20 @@ class curl_test_button(Operator):
         return {'FINISHED'}
 
 
+class farm_status_button(Operator):
+    """Query state & job progress of every printer within the printer farm registry"""
+    bl_idname = 'object.farm_status_button'
+    bl_label = 'Printer Farm Status'
+
+    def execute(self, context):
+        farm = Printer_farm(context)
+        farm.refresh()
+        for line in farm.return_report():
+            print('# Printer_farm: {0}'.format(line))
+            self.report({'INFO'}, line)
+        return {'FINISHED'}
+
+
 class local_slice_button(Operator):
     """Export STL to Slic3r, generate GCODE and if configured upload to print server"""
     bl_idname = 'object.local_slice_button'
@@ -1890,17 +5714,76 @@ class local_slice_button(Operator):
         if not context.selected_objects:
             raise Exception('Please select some objects first.')
 
-        op = Selected_objects(context)
-        op_output = op.local_slicer(context)
-        op_output.calling_operator = 'local_slice_button(Operator)'
-        formated_output = Formatted_output.return_output(op_output)
-        for info in formated_output:
+        slice_job = Slice_job(context)
+        # Without a window, eg. 'blender -b', there is no event loop for a modal operator
+        if context.window is None:
+            op_output = slice_job.run()
+            op_output.calling_operator = 'local_slice_button(Operator)'
+            formated_output = Formatted_output.return_output(op_output)
+            for info in formated_output:
+                self.report({'INFO'}, info)
+            info = ('# ' + op_output.calling_operator + 'finished')
             self.report({'INFO'}, info)
-        info = ('# ' + op_output.calling_operator + 'finished')
+            return {'FINISHED'}
+        Slice_job.queued_jobs.append(slice_job)
+        if local_slice_modal.is_running is False:
+            bpy.ops.object.local_slice_modal()
+        info = ('# Queued {0} with {1} file(s) to export'.format(slice_job.name, slice_job.export_total))
         self.report({'INFO'}, info)
         return {'FINISHED'}
 
 
+class local_slice_modal(Operator):
+    """Advance queued slice jobs a step at a time so that Blender stays responsive while slicing & uploading"""
+    bl_idname = 'object.local_slice_modal'
+    bl_label = 'Slice Job Runner'
+
+    is_running = False
+    timer_interval = 0.1
+    # A runner that has not stepped for this many seconds was dropped, eg. its window closed
+    stale_seconds = 5.0
+    last_step_time = 0.0
+
+    def execute(self, context):
+        if local_slice_modal.is_running is True:
+            if time.perf_counter() - local_slice_modal.last_step_time < local_slice_modal.stale_seconds:
+                return {'CANCELLED'}
+            print('# local_slice_modal replacing a runner that stopped stepping')
+        local_slice_modal.is_running = True
+        local_slice_modal.last_step_time = time.perf_counter()
+        self._timer = context.window_manager.event_timer_add(self.timer_interval, window = context.window)
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        local_slice_modal.last_step_time = time.perf_counter()
+        for slice_job in list(Slice_job.queued_jobs):
+            try:
+                still_running = slice_job.step()
+            except Exception as error:
+                slice_job.fail(error = error)
+                still_running = False
+            if still_running is False:
+                Slice_job.queued_jobs.remove(slice_job)
+                Slice_job.finished_jobs.insert(0, slice_job)
+                del Slice_job.finished_jobs[Slice_job.max_finished_jobs:]
+                op_output = slice_job.operation_output
+                op_output.calling_operator = 'local_slice_modal(Operator) {0}'.format(slice_job.name)
+                for info in Formatted_output.return_output(op_output):
+                    self.report({'INFO'}, info)
+        # Redraw panels so that progress of each job stays current
+        for area in context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+        if not Slice_job.queued_jobs:
+            context.window_manager.event_timer_remove(self._timer)
+            local_slice_modal.is_running = False
+            return {'FINISHED'}
+        return {'PASS_THROUGH'}
+
+
 class octoprint_download_file_list_button(Operator):
     """Download a list of files from OctoPrint server"""
     bl_idname = 'object.octoprint_download_file_list'
@@ -1909,8 +5792,7 @@ class octoprint_download_file_list_button(Operator):
     def execute(self, context):
         Scene = context.scene
         OP = OctoPrint(context)
-        downloaded_json = OP.download_json_file_listing(target_search_dir = None)
-        parsed_json = OctoPrint.return_file_listing_dict_json(json_file_path = downloaded_json)
+        parsed_json = OP.return_file_listing(target_search_dir = None)
         file_list_as_object = OP.return_file_list_as_object(dict_obj = parsed_json)
         if not Scene.octoprint_target_search_dir:
             OctoPrint.print_space_statistics(json_dict = parsed_json)
@@ -1962,17 +5844,104 @@ class octoprint_upload_stl_button(Operator):
         OP = OctoPrint(context)
         so_output = SO.export_as_stl(context)
         stls = so_output.blender_export_stl_output
-        if isinstance(stls, list):
-            for stl in stls:
-                op_output = OP.upload_file(stl_path = stl)
-        elif stl_file:
-            op_output = OP.upload_file(stl_path = stls)
-
-        info = ('Finished uploading selected objects to OctoPrint server')
+        if not isinstance(stls, list):
+            stls = [stls]
+        uploads = Upload_dispatcher(max_uploads = Scene.upload_max_jobs, max_uploads_per_host = Scene.upload_max_jobs_per_host)
+        for stl in stls:
+            if stl:
+                uploads.add(function = OP.upload_file, host = OP.host_url, name = stl, stl_path = stl)
+        tracker = None
+        if Scene.octoprint_slice_uploaded_stl:
+            tracker = Slice_tracker(OP = OP, max_jobs = Scene.octoprint_slice_max_jobs, timeout = Scene.octoprint_slice_timeout)
+        batch = {'uploads': uploads, 'tracker': tracker, 'failed': 0}
+        # Without a window, eg. 'blender -b', there is no event loop for a modal operator, so block until done
+        if context.window is None:
+            while octoprint_upload_modal.step_batch(batch = batch, operator = self):
+                time.sleep(octoprint_upload_modal.timer_interval)
+            if batch['failed'] or (tracker is not None and [job for job in tracker.jobs if job['state'] != 'Done']):
+                return {'CANCELLED'}
+            return {'FINISHED'}
+        # Uploads & server slices finish from octoprint_upload_modal timer events, Blender stays responsive meanwhile
+        octoprint_upload_modal.queued_batches.append(batch)
+        bpy.ops.object.octoprint_upload_modal()
+
+        info = ('Uploading {0} STL files to OctoPrint server in the background'.format(len([stl for stl in stls if stl])))
         self.report({'INFO'}, info)
         return {'FINISHED'}
 
 
+class octoprint_upload_modal(Operator):
+    """Collect finished OctoPrint uploads & poll server slices a step at a time so that Blender stays responsive"""
+    bl_idname = 'object.octoprint_upload_modal'
+    bl_label = 'OctoPrint Upload Runner'
+
+    # Batches queued by octoprint_upload_stl_button, each {'uploads': Upload_dispatcher, 'tracker': Slice_tracker or None, 'failed': int}
+    queued_batches = []
+    is_running = False
+    timer_interval = 0.25
+    # A runner that has not stepped for this many seconds was dropped, eg. its window closed
+    stale_seconds = 5.0
+    last_step_time = 0.0
+
+    def execute(self, context):
+        if octoprint_upload_modal.is_running is True:
+            if time.perf_counter() - octoprint_upload_modal.last_step_time < octoprint_upload_modal.stale_seconds:
+                return {'CANCELLED'}
+            print('# octoprint_upload_modal replacing a runner that stopped stepping')
+        octoprint_upload_modal.is_running = True
+        octoprint_upload_modal.last_step_time = time.perf_counter()
+        self._timer = context.window_manager.event_timer_add(self.timer_interval, window = context.window)
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        octoprint_upload_modal.last_step_time = time.perf_counter()
+        for batch in list(octoprint_upload_modal.queued_batches):
+            try:
+                still_running = octoprint_upload_modal.step_batch(batch = batch, operator = self)
+            except Exception as error:
+                self.report({'ERROR'}, 'OctoPrint upload batch failed: {0}'.format(error))
+                still_running = False
+            if still_running is False:
+                octoprint_upload_modal.queued_batches.remove(batch)
+        if not octoprint_upload_modal.queued_batches:
+            context.window_manager.event_timer_remove(self._timer)
+            octoprint_upload_modal.is_running = False
+            return {'FINISHED'}
+        return {'PASS_THROUGH'}
+
+    # Returns 'False' after reporting on a finished 'batch' through 'operator', otherwise hands finished uploads to its tracker & returns 'True'
+    @staticmethod
+    def step_batch(batch = None, operator = None):
+        uploads = batch['uploads']
+        tracker = batch['tracker']
+        for upload in uploads.poll():
+            if upload['error'] is not None:
+                batch['failed'] += 1
+                operator.report({'ERROR'}, 'Upload of {0} failed: {1}'.format(upload['name'], upload['error']))
+            elif tracker is not None:
+                # Each STL starts slicing as soon as it is on the server, not after the whole batch
+                tracker.add(stl_path = upload['name'])
+        if tracker is not None:
+            tracker.poll()
+        if not uploads.is_done() or (tracker is not None and not tracker.is_done()):
+            return True
+        if tracker is not None and tracker.jobs:
+            for line in tracker.return_report():
+                print('# Slice_tracker: {0}'.format(line))
+                operator.report({'INFO'}, line)
+            failed_jobs = [job for job in tracker.jobs if job['state'] != 'Done']
+            if failed_jobs:
+                operator.report({'ERROR'}, '{0} of {1} server slices did not finish'.format(len(failed_jobs), len(tracker.jobs)))
+        if batch['failed']:
+            operator.report({'ERROR'}, '{0} uploads to OctoPrint server failed'.format(batch['failed']))
+        else:
+            operator.report({'INFO'}, 'Finished uploading selected objects to OctoPrint server')
+        return False
+
+
 class preview_webcam_button(Operator):
     """Preform some magic so users can see snapshot of their printer build plate without leaving Blender"""
     bl_idname = 'object.preview_webcam_button'
@@ -1981,6 +5950,8 @@ class preview_webcam_button(Operator):
     def execute(self, context):
         WC = Webcam(context)
         WC.init_preview(action='snapshot')
+        for info in WC.return_timing_report():
+            self.report({'INFO'}, '# Timing: ' + info)
 
         info = ('Finished')
         self.report({'INFO'}, info)
@@ -1988,9 +5959,9 @@ class preview_webcam_button(Operator):
 
 
 class slic3r_repair_button(Operator):
-    """Export as STL then import to Slic3r running with --repair and import repaired objects back into Blender"""
+    """Repair selected objects within Blender, or export as STL for Slic3r --repair, and import repaired objects back into Blender"""
     bl_idname = 'object.slic3r_repair_button'
-    bl_label = 'Slic3r Repair Selected'
+    bl_label = 'Repair Selected'
     bl_options = {'REGISTER', 'UNDO'}
 
     # execute() is called by blender when running the operator
@@ -2016,6 +5987,8 @@ class stream_webcam_button(Operator):
     def execute(self, context):
         WC = Webcam(context)
         WC.init_preview(action='stream')
+        for info in WC.return_timing_report():
+            self.report({'INFO'}, '# Timing: ' + info)
 
         info = ('Finished')
         self.report({'INFO'}, info)
@@ -2028,7 +6001,7 @@ class stream_webcam_button(Operator):
 
 
 class curaengine_settings(PropertyGroup):
-    Scene = bpy.types.Scene
+    Scene = bpy.types.Scene if bpy is not None else Scene_defaults
     if curaengine_exec_dir:
         Scene.curaengine_exec_dir = StringProperty(
             name='CuraEngine path',
@@ -2077,19 +6050,19 @@ class curaengine_settings(PropertyGroup):
     )
     Scene.curaengine_preview_gcode = BoolProperty(
         name='Preview locally sliced GCode',
-        description='Opens GCode file(s) within Blender Text Editor when local slicers have finished converting selected object into GCode files. Default: False',
+        description='Previews GCode file(s), as toolpaths or within Blender Text Editor per GCode Preview Mode, when local slicers have finished converting selected object into GCode files. Default: False',
         default=False
     )
     Scene.curaengine_gcode_directory = StringProperty(
         name='Local GCode directory',
-        default=bpy.app.tempdir,
-        description='Local slicer GCode output directory, default: {0}'.format(bpy.app.tempdir),
+        default=default_temp_dir,
+        description='Local slicer GCode output directory, default: {0}'.format(default_temp_dir),
         subtype='DIR_PATH'
     )
 
 
 class curl_settings(PropertyGroup):
-    Scene = bpy.types.Scene
+    Scene = bpy.types.Scene if bpy is not None else Scene_defaults
     if curl_exec_dir:
         Scene.curl_exec_dir = StringProperty(
             name='Curl path',
@@ -2124,7 +6097,7 @@ class curl_settings(PropertyGroup):
 
 
 class export_stl_settings(PropertyGroup):
-    Scene = bpy.types.Scene
+    Scene = bpy.types.Scene if bpy is not None else Scene_defaults
     Scene.export_stl_axis_forward = EnumProperty(
         name='Export STL Axis - Forward',
         description='Which axis should be the relative front of the selected models, default: Y',
@@ -2170,6 +6143,18 @@ class export_stl_settings(PropertyGroup):
         description='Enabled or disables checking for preexisting exported STL files, default: True',
         default=True
     )
+    Scene.export_stl_use_cache = BoolProperty(
+        name='Reuse Unchanged STL Exports',
+        description='Skips exporting objects whose evaluated geometry, transform, modifiers & export settings match the STL file already on disk, only useful while temporary STL files are not removed, default: True',
+        default=True
+    )
+    Scene.export_stl_engine = EnumProperty(
+        name='Export STL Engine',
+        items=(('Native', 'Native', ''),
+               ('Operator', 'Operator', '')),
+        default='Native',
+        description='Native writes evaluated mesh data straight to STL files without changing selection or visibility, Operator uses bpy.ops.export_mesh.stl and hides exported objects. Default: Native',
+    )
     Scene.clean_temp_stl_files = BoolProperty(
         name='Clean-up Temp. STL Files',
         description='Removes temporary STL files after importing or uploading to another application or server, default: True',
@@ -2185,14 +6170,14 @@ class export_stl_settings(PropertyGroup):
     )
     Scene.export_stl_directory = StringProperty(
         name='Temporary STL file path',
-        default=bpy.app.tempdir,
-        description='Directory used for temporary STL files generated by this addon, default: {0}'.format(bpy.app.tempdir),
+        default=default_temp_dir,
+        description='Directory used for temporary STL files generated by this addon, default: {0}'.format(default_temp_dir),
         subtype='DIR_PATH'
     )
 
 
 class import_obj_settings(PropertyGroup):
-    Scene = bpy.types.Scene
+    Scene = bpy.types.Scene if bpy is not None else Scene_defaults
     Scene.import_obj_axis_forward = EnumProperty(
         name='Import OBJ Axis - Forward',
         description='Which axis should be the relative front of the imported OBJ files form Slic3r repair, default: Y',
@@ -2245,6 +6230,13 @@ class import_obj_settings(PropertyGroup):
         description='Use image search when importing OBJ files from Slic3r repair operations, default: True',
         default=True
     )
+    Scene.import_obj_engine = EnumProperty(
+        name='Import OBJ Engine',
+        items=(('Native', 'Native', ''),
+               ('Operator', 'Operator', '')),
+        default='Native',
+        description='Native reads repaired OBJ or STL files straight into new meshes, applying axis & clamp size settings only, Operator uses bpy.ops.import_scene.obj with all settings. Default: Native',
+    )
     Scene.import_obj_split_mode = EnumProperty(
         name='Import OBJ Split Mode',
         description='Activate split mode when importing OBJ files from Slic3r repair operations, default: On',
@@ -2267,14 +6259,14 @@ class import_obj_settings(PropertyGroup):
     )
     Scene.import_obj_directory = StringProperty(
         name='Temporary OBJ file path',
-        default=bpy.app.tempdir,
-        description='Directory used for temporary OBJ files generated by calling Slic3r with "--repair" option, default: {0}'.format(bpy.app.tempdir),
+        default=default_temp_dir,
+        description='Directory used for temporary OBJ files generated by calling Slic3r with "--repair" option, default: {0}'.format(default_temp_dir),
         subtype='DIR_PATH'
     )
 
 
 class misc_settings(PropertyGroup):
-    Scene = bpy.types.Scene
+    Scene = bpy.types.Scene if bpy is not None else Scene_defaults
     Scene.preferred_local_slicer = EnumProperty(
         name='Preferred Local Slicer',
         items=(('Slic3r', 'Slic3r', ''),
@@ -2282,6 +6274,110 @@ class misc_settings(PropertyGroup):
         default='Slic3r',
         description='Local slicer to use for translating exported STL files from Blender into GCode files. Default: Slic3r',
     )
+    Scene.local_slicer_max_jobs = IntProperty(
+        name='Local Slicer Max Jobs',
+        description='How many local slicer processes may run at once when exporting Individual objects, 0 uses one per CPU, default: 0',
+        default=0,
+        min=0,
+    )
+    Scene.gcode_cache_enabled = BoolProperty(
+        name='Reuse Sliced GCode',
+        description='Reuses previously sliced GCode when STL files, slicer configuration, extra arguments, post processing script & slicer version are unchanged, default: True',
+        default=True
+    )
+    Scene.gcode_cache_directory = StringProperty(
+        name='GCode cache directory',
+        default=os.path.join(default_cache_dir, 'gcode_cache'),
+        description='Directory holding previously sliced GCode files, default: {0}'.format(os.path.join(default_cache_dir, 'gcode_cache')),
+        subtype='DIR_PATH'
+    )
+    Scene.gcode_cache_max_size = IntProperty(
+        name='GCode cache size limit',
+        description='Mega-bytes of sliced GCode to keep, least recently used files are removed first, default: 1024',
+        default=1024,
+        min=1,
+    )
+    Scene.job_journal_enabled = BoolProperty(
+        name='Resume Interrupted Slicing',
+        description='Journals the stage each object reached within an SQLite file, so running local slicer again after a crash only redoes unfinished exports, slices & uploads, default: True',
+        default=True
+    )
+    Scene.job_journal_path = StringProperty(
+        name='Job journal file',
+        default=os.path.join(default_cache_dir, 'print_shortcuts_journal.sqlite3'),
+        description='SQLite file recording stages of local slicer runs, default: {0}'.format(os.path.join(default_cache_dir, 'print_shortcuts_journal.sqlite3')),
+        subtype='FILE_PATH'
+    )
+    Scene.gcode_analysis_enabled = BoolProperty(
+        name='Analyse Sliced GCode',
+        description='Estimates print time, filament use, printing area & layer count of sliced GCode locally, default: True',
+        default=True
+    )
+    Scene.gcode_analysis_filament_diameter = FloatProperty(
+        name='GCode analysis filament diameter',
+        description='Filament diameter in mm for volume estimates, unless GCode notes its own filament_diameter, default: 1.75',
+        default=1.75,
+        min=0.1,
+    )
+    Scene.gcode_analysis_acceleration = FloatProperty(
+        name='GCode analysis acceleration',
+        description='Printer acceleration in mm/s^2 for print time estimates, default: 1500',
+        default=1500.0,
+        min=1.0,
+    )
+    Scene.gcode_preview_mode = EnumProperty(
+        name='GCode Preview Mode',
+        items=(('Toolpaths', 'Toolpaths', 'Build an edge mesh of extruding moves'),
+               ('Text', 'Text', 'Load GCode into the Text Editor')),
+        default='Toolpaths',
+        description='How Preview GCode shows sliced GCode, Toolpaths builds an edge mesh of extruding moves & Text loads whole files into the Text Editor, default: Toolpaths',
+    )
+    Scene.gcode_preview_first_layer = IntProperty(
+        name='GCode Preview First Layer',
+        description='First layer, counting from 1, to include within toolpath previews, default: 1',
+        default=1,
+        min=1,
+    )
+    Scene.gcode_preview_last_layer = IntProperty(
+        name='GCode Preview Last Layer',
+        description='Last layer to include within toolpath previews, 0 includes every layer after the first, default: 0',
+        default=0,
+        min=0,
+    )
+    Scene.gcode_preview_layer_budget = IntProperty(
+        name='GCode Preview Layer Budget',
+        description='Most edges to keep per layer of toolpath previews, paths are thinned to fit, 0 keeps all, default: 2000',
+        default=2000,
+        min=0,
+    )
+    Scene.upload_max_jobs = IntProperty(
+        name='Upload Max Jobs',
+        description='How many uploads to print servers may run at once, default: 4',
+        default=4,
+        min=1,
+    )
+    Scene.upload_max_jobs_per_host = IntProperty(
+        name='Upload Max Jobs per Host',
+        description='How many uploads to any one print server may run at once, default: 2',
+        default=2,
+        min=1,
+    )
+    Scene.farm_dispatch_uploads = BoolProperty(
+        name='Dispatch Uploads to Printer Farm',
+        description='Sends each sliced GCode file to the idle or soonest free compatible printer listed within the farm registry, instead of the preferred print server, default: False',
+        default=False
+    )
+    Scene.farm_registry_path = StringProperty(
+        name='Printer Farm Registry',
+        default='',
+        description='JSON file listing OctoPrint & Repetier hosts of a printer farm, with API keys & capabilities of each',
+        subtype='FILE_PATH'
+    )
+    Scene.farm_job_requirements = StringProperty(
+        name='Printer Farm Job Requirements',
+        default='',
+        description='Capabilities printers must have to be sent GCode, eg. nozzle_diameter:0.4, filament:PLA',
+    )
     Scene.preferred_print_server = EnumProperty(
         name='Preferred Print Server',
         items=(('OctoPrint', 'OctoPrint', ''),
@@ -2302,7 +6398,7 @@ class misc_settings(PropertyGroup):
         description='Opens a web browser (or new tab) to the uploaded GCode directory if enabled, default: False',
         default=False
     )
-    Scene.button_text_color = bpy.props.FloatVectorProperty(
+    Scene.button_text_color = FloatVectorProperty(
         name='Button Text Color Picker',
         subtype='COLOR',
         size=4,
@@ -2311,7 +6407,7 @@ class misc_settings(PropertyGroup):
         default=(0.1, 0.75, 0.75, 1.0),
         description='Color text of buttons that get generated by this addon for streaming printer interactions',
     )
-    Scene.button_background_color = bpy.props.FloatVectorProperty(
+    Scene.button_background_color = FloatVectorProperty(
         name='Button Background Color Picker',
         subtype='COLOR',
         size=4,
@@ -2320,10 +6416,26 @@ class misc_settings(PropertyGroup):
         default=(0.0, 0.0, 0.0, 1.0),
         description='Color background plane of buttons that get generated by this addon for streaming printer interactions',
     )
+    Scene.timing_summary = BoolProperty(
+        name='Timing Summary',
+        description='Reports a table of time spent per stage, such as export, repair, slice & upload, after each run, default: True',
+        default=True
+    )
+    Scene.timing_trace = BoolProperty(
+        name='Write Trace File',
+        description='Writes a Chrome trace-event JSON file per run, for viewing within chrome://tracing or ui.perfetto.dev, default: False',
+        default=False
+    )
+    Scene.timing_trace_directory = StringProperty(
+        name='Trace file directory',
+        default=os.path.join(default_temp_dir, 'traces'),
+        description='Directory trace-event JSON files are written to, default: {0}'.format(os.path.join(default_temp_dir, 'traces')),
+        subtype='DIR_PATH'
+    )
 
 
 class octoprint_settings(PropertyGroup):
-    Scene = bpy.types.Scene
+    Scene = bpy.types.Scene if bpy is not None else Scene_defaults
     Scene.octoprint_auto_upload_from_slicers = BoolProperty(
         name='Upload GCode from Slicers',
         description='Uploads selected objects to OctoPrint server automatically after slicing with a local slicer if enabled, default: False',
@@ -2355,6 +6467,11 @@ class octoprint_settings(PropertyGroup):
         default='',
         description='Directory to save GCode file uploads to OctoPrint server',
     )
+    Scene.octoprint_skip_identical_uploads = BoolProperty(
+        name='Skip Identical Uploads',
+        description='Compares SHA1 hash of files against OctoPrint file listing before uploading, identical files already on the server are skipped or copied server side, default: True',
+        default=True
+    )
     Scene.octoprint_save_stl_dir = StringProperty(
         name='OctoPrint STL directory',
         default='',
@@ -2383,6 +6500,18 @@ class octoprint_settings(PropertyGroup):
         description='Uploaded STL files will be set to slice into GCode files by OctoPrint server, this is an asynchronous process according to the documentation, default: False',
         default=False
     )
+    Scene.octoprint_slice_max_jobs = IntProperty(
+        name='OctoPrint Max Server Slices',
+        description='How many uploaded STL files OctoPrint server is asked to slice at once, default: 2',
+        default=2,
+        min=1,
+    )
+    Scene.octoprint_slice_timeout = IntProperty(
+        name='OctoPrint Slice Timeout',
+        description='Seconds to wait for each uploaded STL file to be sliced & analysed by OctoPrint server before giving up on it, default: 600',
+        default=600,
+        min=1,
+    )
     Scene.octoprint_slice_slicer = StringProperty(
         name='OctoPrint Slicer',
         default='cura',
@@ -2415,14 +6544,14 @@ class octoprint_settings(PropertyGroup):
     )
     Scene.octoprint_snapshot_dir = StringProperty(
         name='Temporary .jpg file path',
-        default=bpy.app.tempdir,
-        description='Directory used for temporary JPG files generated by this addon, default: {0}'.format(bpy.app.tempdir),
+        default=default_temp_dir,
+        description='Directory used for temporary JPG files generated by this addon, default: {0}'.format(default_temp_dir),
         subtype='DIR_PATH'
     )
     Scene.octoprint_temp_dir = StringProperty(
         name='Temporary Directory for OctoPrint',
-        default=bpy.app.tempdir,
-        description='Directory used for temporary JPG & JSON files generated by this addon, default: {0}'.format(bpy.app.tempdir),
+        default=default_temp_dir,
+        description='Directory used for temporary JPG & JSON files generated by this addon, default: {0}'.format(default_temp_dir),
         subtype='DIR_PATH'
     )
     Scene.octoprint_snapshot_name = StringProperty(
@@ -2441,6 +6570,12 @@ class octoprint_settings(PropertyGroup):
         default=10,
         min=1,
     )
+    Scene.octoprint_preview_max_size = IntProperty(
+        name='OctoPrint Preview Max Size',
+        description='Longest side in pixels of preview image, larger snapshots are downscaled in memory, 0 keeps snapshot size, default: 0',
+        default=0,
+        min=0,
+    )
     Scene.octoprint_snapshot_action = StringProperty(
         name='Snapshot Action',
         default='?action=snapshot',
@@ -2488,7 +6623,7 @@ class octoprint_settings(PropertyGroup):
 
 
 class repetier_settings(PropertyGroup):
-    Scene = bpy.types.Scene
+    Scene = bpy.types.Scene if bpy is not None else Scene_defaults
     Scene.repetier_auto_upload_from_slicers = BoolProperty(
         name='Upload GCode from Slicers',
         description='Uploads selected objects to Repetier server automatically after slicing into GCode files locally has finished if enabled, default: False',
@@ -2538,14 +6673,14 @@ class repetier_settings(PropertyGroup):
     )
     Scene.repetier_snapshot_dir = StringProperty(
         name='Temporary .jpg file path',
-        default=bpy.app.tempdir,
-        description='Directory used for temporary JPG files generated by this addon, default: {0}'.format(bpy.app.tempdir),
+        default=default_temp_dir,
+        description='Directory used for temporary JPG files generated by this addon, default: {0}'.format(default_temp_dir),
         subtype='DIR_PATH'
     )
     Scene.repetier_temp_dir = StringProperty(
         name='Temporary Directory for Repetier',
-        default=bpy.app.tempdir,
-        description='Directory used for temporary files generated by this addon, default: {0}'.format(bpy.app.tempdir),
+        default=default_temp_dir,
+        description='Directory used for temporary files generated by this addon, default: {0}'.format(default_temp_dir),
         subtype='DIR_PATH'
     )
     Scene.repetier_snapshot_name = StringProperty(
@@ -2564,6 +6699,12 @@ class repetier_settings(PropertyGroup):
         default=10,
         min=1,
     )
+    Scene.repetier_preview_max_size = IntProperty(
+        name='Repetier Preview Max Size',
+        description='Longest side in pixels of preview image, larger snapshots are downscaled in memory, 0 keeps snapshot size, default: 0',
+        default=0,
+        min=0,
+    )
     Scene.repetier_snapshot_action = StringProperty(
         name='Snapshot Action',
         default='?action=snapshot',
@@ -2610,7 +6751,7 @@ class repetier_settings(PropertyGroup):
 
 
 class slic3r_settings(PropertyGroup):
-    Scene = bpy.types.Scene
+    Scene = bpy.types.Scene if bpy is not None else Scene_defaults
     if slic3r_exec_dir:
         Scene.slic3r_exec_dir = StringProperty(
             name='Slic3r path',
@@ -2661,6 +6802,41 @@ class slic3r_settings(PropertyGroup):
         default='Slic3r-Fixed-Meshes',
         description='Imported OBJ files will be parented to this named empty, default: Slic3r-Fixed-Meshes',
     )
+    Scene.mesh_repair_engine = EnumProperty(
+        name='Mesh Repair Engine',
+        items=(('Native', 'Native', ''),
+               ('Slic3r', 'Slic3r', '')),
+        default='Native',
+        description='Native welds vertices, removes degenerate & duplicate faces, fixes winding & fills small holes within Blender, Slic3r exports STL files for slic3r --repair & imports the OBJ files it writes. Default: Native',
+    )
+    Scene.mesh_repair_weld_distance = FloatProperty(
+        name='Mesh Repair Weld Distance',
+        description='Vertices within this many Blender units of another are welded onto it by Native mesh repair, default: 0.00001',
+        min=0,
+        precision=6,
+        default=0.00001
+    )
+    Scene.mesh_repair_max_hole_edges = IntProperty(
+        name='Mesh Repair Max Hole Edges',
+        description='Holes bound by up to this many edges are filled by Native mesh repair, 0 leaves holes open, default: 32',
+        min=0,
+        default=32
+    )
+    Scene.mesh_repair_slic3r_fallback = BoolProperty(
+        name='Mesh Repair Slic3r Fallback',
+        description='Sends meshes that still have open edges after Native mesh repair through Slic3r instead, default: False',
+        default=False
+    )
+    Scene.mesh_repair_check_first = BoolProperty(
+        name='Check Meshes Before Repair',
+        description='Checks for zero area faces, open & non-manifold edges, flipped normals & intersecting faces first, only meshes that fail are repaired, default: True',
+        default=True
+    )
+    Scene.mesh_check_self_intersections = BoolProperty(
+        name='Check for Intersecting Faces',
+        description='Includes intersecting faces, found via mathutils.bvhtree, within checks before repair; slower on large meshes, default: True',
+        default=True
+    )
     Scene.export_stl_treat_selected_as = EnumProperty(
         name='Export as:',
         items=(('Individual', 'Individual', ''),
@@ -2671,13 +6847,13 @@ class slic3r_settings(PropertyGroup):
     )
     Scene.slic3r_preview_gcode = BoolProperty(
         name='Preview locally sliced GCode',
-        description='Opens GCode file(s) within Blender Text Editor when local slicers have finished converting selected object into GCode files. Default: False',
+        description='Previews GCode file(s), as toolpaths or within Blender Text Editor per GCode Preview Mode, when local slicers have finished converting selected object into GCode files. Default: False',
         default=False
     )
     Scene.slic3r_gcode_directory = StringProperty(
         name='Local GCode directory',
-        default=bpy.app.tempdir,
-        description='Local slicer GCode output directory, default: {0}'.format(bpy.app.tempdir),
+        default=default_temp_dir,
+        description='Local slicer GCode output directory, default: {0}'.format(default_temp_dir),
         subtype='DIR_PATH'
     )
 
@@ -2709,6 +6885,12 @@ class debug_panel(Panel):
             layout.prop(scene, 'octoprint_target_search_dir', text='OctoPrint search Dir')
             layout.operator('object.octoprint_download_file_list', text='Parse OctoPrint File list')
 
+        layout.label(text='Timing')
+        layout.prop(scene, 'timing_summary', text='Timing Summary')
+        layout.prop(scene, 'timing_trace', text='Write Trace File')
+        if scene.timing_trace is True:
+            layout.prop(scene, 'timing_trace_directory', text='Trace Directory')
+
 
 class export_stl_config_panel(Panel):
     bl_space_type = 'VIEW_3D'
@@ -2725,6 +6907,10 @@ class export_stl_config_panel(Panel):
 
         layout.prop(scene, 'clean_temp_stl_files', text='Remove Temporary STL Files')
         layout.prop(scene, 'export_stl_treat_selected_as', text='Export selected as')
+        layout.prop(scene, 'export_stl_engine', text='Export Engine')
+        layout.prop(scene, 'export_stl_use_cache', text='Reuse Unchanged Exports')
+        if scene.export_stl_use_cache and scene.clean_temp_stl_files:
+            layout.label(text='Removed STL files are exported again next time')
         layout.prop(scene, 'export_stl_directory', text='STL Temp Directory')
         layout.prop(scene, 'export_stl_global_scale', text='Global Scale')
         layout.prop(scene, 'export_stl_axis_forward', text='Forward Axis')
@@ -2748,6 +6934,7 @@ class import_obj_config_panel(Panel):
         col = layout.column(align=True)
 
         layout.prop(scene, 'clean_temp_obj_files', text='Remove Temporary OBJ Files')
+        layout.prop(scene, 'import_obj_engine', text='Import Engine')
         layout.prop(scene, 'import_obj_directory', text='OBJ Temp Directory')
         layout.prop(scene, 'import_obj_global_clamp_size', text='OBJ Global Clamp Size')
         layout.prop(scene, 'import_obj_axis_forward', text='OBJ Axis Forward')
@@ -2775,6 +6962,23 @@ class slicer_config_panel(Panel):
         col = layout.column(align=True)
 
         layout.prop(scene, 'preferred_local_slicer', text='Preferred Local Slicer')
+        layout.prop(scene, 'local_slicer_max_jobs', text='Max Slicer Jobs')
+        layout.prop(scene, 'gcode_cache_enabled', text='Reuse Sliced GCode')
+        if scene.gcode_cache_enabled:
+            layout.prop(scene, 'gcode_cache_directory', text='GCode Cache Directory')
+            layout.prop(scene, 'gcode_cache_max_size', text='GCode Cache Size (MB)')
+        layout.prop(scene, 'job_journal_enabled', text='Resume Interrupted Slicing')
+        if scene.job_journal_enabled:
+            layout.prop(scene, 'job_journal_path', text='Job Journal File')
+        layout.prop(scene, 'gcode_analysis_enabled', text='Analyse Sliced GCode')
+        layout.prop(scene, 'gcode_preview_mode', text='GCode Preview Mode')
+        if 'Toolpaths' in scene.gcode_preview_mode:
+            layout.prop(scene, 'gcode_preview_first_layer', text='Preview First Layer')
+            layout.prop(scene, 'gcode_preview_last_layer', text='Preview Last Layer')
+            layout.prop(scene, 'gcode_preview_layer_budget', text='Preview Edges per Layer')
+        if scene.gcode_analysis_enabled:
+            layout.prop(scene, 'gcode_analysis_filament_diameter', text='Filament Diameter (mm)')
+            layout.prop(scene, 'gcode_analysis_acceleration', text='Acceleration (mm/s^2)')
         if 'Slic3r' in scene.preferred_local_slicer:
             layout.prop(scene, 'slic3r_exec_dir', text='Directory of Executable')
             layout.prop(scene, 'slic3r_exec_name', text='Name of Executable')
@@ -2804,6 +7008,13 @@ class print_server_connection_panel(Panel):
         col = layout.column(align=True)
 
         layout.prop(scene, 'preferred_print_server', text='Prefered Printer Server')
+        layout.prop(scene, 'upload_max_jobs', text='Max Upload Jobs')
+        layout.prop(scene, 'upload_max_jobs_per_host', text='Max Upload Jobs per Host')
+        layout.prop(scene, 'farm_dispatch_uploads', text='Dispatch Uploads to Printer Farm')
+        if scene.farm_dispatch_uploads is True:
+            layout.prop(scene, 'farm_registry_path', text='Farm Registry')
+            layout.prop(scene, 'farm_job_requirements', text='Job Requirements')
+            layout.operator('object.farm_status_button', text='Printer Farm Status')
         if 'OctoPrint' in scene.preferred_print_server:
             layout.prop(scene, 'octoprint_auto_upload_from_slicers', text='Upload GCode from Slicers')
             layout.prop(scene, 'open_browser_after_upload', text='Open Browser After Upload')
@@ -2814,6 +7025,7 @@ class print_server_connection_panel(Panel):
             layout.prop(scene, 'octoprint_api_path', text='POST Directory')
             layout.prop(scene, 'octoprint_save_gcode_dir', text='GCode Directory')
             layout.prop(scene, 'octoprint_save_stl_dir', text='STL Directory')
+            layout.prop(scene, 'octoprint_skip_identical_uploads', text='Skip Identical Uploads')
             layout.prop(scene, 'octoprint_x_api_key', text='X-API Key')
         elif 'Repetier' in scene.preferred_print_server:
             layout.prop(scene, 'repetier_auto_upload_from_slicers', text='Upload GCode from Slicers')
@@ -2887,6 +7099,8 @@ class print_server_slicer_panel(Panel):
             layout.prop(scene, 'octoprint_slice_Profile_ops', text='Slicer Profile Customizations')
             layout.prop(scene, 'octoprint_slice_position_x', text='Slicer X Position')
             layout.prop(scene, 'octoprint_slice_position_y', text='Slicer Y Position')
+            layout.prop(scene, 'octoprint_slice_max_jobs', text='Max Server Slices')
+            layout.prop(scene, 'octoprint_slice_timeout', text='Slice Timeout')
         if 'Repetier' in scene.preferred_print_server:
             layout.label(text="One day maybe")
 
@@ -2905,10 +7119,22 @@ class quick_slicer_tools_buttons_panel(Panel):
         col = layout.column(align=True)
 
         layout.prop(scene, 'export_stl_treat_selected_as', text='Export as Individual Files')
-        layout.operator('object.slic3r_repair_button', text='Slic3r Repair Selected')
+        layout.operator('object.slic3r_repair_button', text='Repair Selected')
+        layout.prop(scene, 'mesh_repair_engine', text='Repair Engine')
+        layout.prop(scene, 'mesh_repair_check_first', text='Repair Only Failed Checks')
+        if scene.mesh_repair_check_first:
+            layout.prop(scene, 'mesh_check_self_intersections', text='Check Intersecting Faces')
+        if 'Native' in scene.mesh_repair_engine:
+            layout.prop(scene, 'mesh_repair_weld_distance', text='Weld Distance')
+            layout.prop(scene, 'mesh_repair_max_hole_edges', text='Max Hole Edges')
+            layout.prop(scene, 'mesh_repair_slic3r_fallback', text='Fall Back to Slic3r')
         layout.prop(scene, 'slic3r_repaired_parent_name', text='Repaired Parent Name')
         layout.prop(scene, 'preferred_local_slicer', text='Preferred Local Slicer')
         layout.operator('object.local_slice_button', text='Slice Selected Locally')
+        for slice_job in Slice_job.queued_jobs + Slice_job.finished_jobs:
+            box = layout.box()
+            for progress in slice_job.return_progress():
+                box.label(text = progress)
         layout.prop(scene, 'slic3r_gcode_directory', text='GCode Save Directory')
         if 'Slic3r' in scene.preferred_local_slicer:
             layout.prop(scene, 'slic3r_preview_gcode', text='Preview GCode')
@@ -2948,6 +7174,7 @@ class webcam_config_panel(Panel):
             layout.prop(scene, 'octoprint_preview_placement', text='Preview Placement')
             layout.prop(scene, 'octoprint_preview_layer', text='Layer to Place Preview')
             layout.prop(scene, 'octoprint_preview_xy_scale', text='XY Scale')
+            layout.prop(scene, 'octoprint_preview_max_size', text='Max Image Size (px)')
         elif 'Repetier' in scene.preferred_print_server:
             layout.prop(scene, 'repetier_target_screen', text='Target Screen Name')
             layout.prop(scene, 'repetier_target_3dview', text='Target 3D View')
@@ -2959,10 +7186,28 @@ class webcam_config_panel(Panel):
             layout.prop(scene, 'repetier_preview_placement', text='Preview Placement')
             layout.prop(scene, 'repetier_preview_layer', text='Layer to Place Preview')
             layout.prop(scene, 'repetier_preview_xy_scale', text='XY Scale')
+            layout.prop(scene, 'repetier_preview_max_size', text='Max Image Size (px)')
         layout.prop(scene, 'button_background_color', text='Button Background Color')
         layout.prop(scene, 'button_text_color', text='Button Text Color')
 
 
+#-------------------------------------------------------------------------
+#   Application handlers
+#-------------------------------------------------------------------------
+@persistent
+def local_slice_load_pre(dummy):
+    # Loading a file drops modal handlers along with the objects queued jobs refer to, fail those
+    #  jobs & clear local_slice_modal.is_running so that jobs queued afterwards start a new runner
+    for slice_job in list(Slice_job.queued_jobs):
+        slice_job.fail(error = 'Blend file loaded before job finished')
+        Slice_job.queued_jobs.remove(slice_job)
+        Slice_job.finished_jobs.insert(0, slice_job)
+    del Slice_job.finished_jobs[Slice_job.max_finished_jobs:]
+    local_slice_modal.is_running = False
+    # Upload batches hold no Blender data & keep going, the next upload starts a new runner for them
+    octoprint_upload_modal.is_running = False
+
+
 #-------------------------------------------------------------------------
 #    Register & un-register configs, note order determines initial layout of panels
 #-------------------------------------------------------------------------
@@ -2978,9 +7223,12 @@ classes = (
 
     slic3r_repair_button,
     local_slice_button,
+    local_slice_modal,
     octoprint_mkdir_button,
     octoprint_upload_stl_button,
+    octoprint_upload_modal,
     curl_test_button,
+    farm_status_button,
     preview_webcam_button,
     stream_webcam_button,
     octoprint_download_file_list_button,
@@ -3003,6 +7251,7 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.utils.register_manual_map(print_shortcuts_manual_map)
+    bpy.app.handlers.load_pre.append(local_slice_load_pre)
 
 
 #-------------------------------------------------------------------------
@@ -3012,6 +7261,9 @@ def unregister():
     for cls in classes:
         bpy.utils.unregister_class(cls)
     bpy.utils.unregister_manual_map(print_shortcuts_manual_map)
+    if local_slice_load_pre in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.remove(local_slice_load_pre)
+    Http_client.close_all()
 
 
 #-------------------------------------------------------------------------
@@ -3046,3 +7298,6 @@ def print_shortcuts_manual_map():
 if __name__ == '__main__':
     __name__ = this_addons_name
     register()
+    # Arguments after '--' run without the user interface, see Command_line
+    if '--' in sys.argv:
+        sys.exit(Command_line(argv = sys.argv[sys.argv.index('--') + 1:]).run())
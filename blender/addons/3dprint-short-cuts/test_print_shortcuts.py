@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+
+#  Checks of 3DPrint Short-Cuts that run without starting Blender
+#  Copyright (C) 2017 S0AndS0
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2
+#  of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+
+# Example of running every check with pytest, or without it
+#   python -m pytest test_print_shortcuts.py
+#   python test_print_shortcuts.py
+
+
+import os
+import sys
+
+import numpy as np
+
+this_script_directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, this_script_directory)
+
+from mock_print_server import load_print_shortcuts
+
+PS = load_print_shortcuts(path = os.path.join(this_script_directory, 'print_shortcuts.py'))
+
+
+# Vertices closer than weld_distance either side of a diagonal cell boundary are welded
+def test_weld_across_cell_boundaries():
+    MR = PS.Mesh_repair(weld_distance = 1.0)
+    vertices, faces = MR.weld(coordinates = np.array([[0.99, 0.45, 0.2], [1.01, 0.55, 0.2], [5.0, 5.0, 5.0]]))
+    assert len(vertices) == 2
+    assert faces[0][0] == faces[0][1]
+
+
+# A chain of vertices closer than weld_distance to their neighbours is not collapsed into one vertex
+def test_weld_does_not_chain():
+    MR = PS.Mesh_repair(weld_distance = 1.0)
+    coordinates = np.array([[0.3 * index, 0.0, 0.0] for index in range(42)])
+    vertices, faces = MR.weld(coordinates = coordinates)
+    assert len(vertices) > 1
+    assert np.abs(vertices[faces.reshape(-1)] - coordinates).max() <= 1.0
+
+
+# Close pairs found via cells are exactly those a comparison of every pair finds
+def test_close_pairs_match_every_pair():
+    MR = PS.Mesh_repair(weld_distance = 0.3)
+    points = np.random.RandomState(1).rand(500, 3) * 5.0 - 2.5
+    distances = np.sqrt(((points[:, None] - points[None]) ** 2).sum(axis = 2))
+    expected = set(zip(*np.nonzero(np.triu(distances <= 0.3, 1))))
+    assert set(map(tuple, MR.return_close_pairs(points = points).tolist())) == expected
+
+
+if __name__ == '__main__':
+    for name, function in sorted(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print('# Passed:', name)